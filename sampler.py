@@ -7,12 +7,32 @@ Ultra-comprehensive noise, natural sound, brainwave, and mixing system
 
 import numpy as np
 import scipy.signal as sps
+import scipy.fft as spfft
+import scipy.ndimage as sps_ndimage
+from scipy.linalg import blas as spblas
 from scipy.io import wavfile
 import soundfile as sf
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from datetime import datetime
 import warnings
 import os  # <-- export_audio için eklendi
+import functools
+import itertools
+import hashlib
+import json
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import contextlib
+import copy
+import struct
+import threading
+import time
+import tracemalloc
 
 warnings.filterwarnings('ignore')
 
@@ -49,13 +69,107 @@ Parametre        | Açıklama                              | Referans Aralık
 SAMPLE_RATE      | Örnekleme frekansı Hz cinsinden       | 8000-192000 Hz     | 44100  | Ses kalitesi ve frekans üst sınırı
 DURATION         | Toplam ses süresi saniye cinsinden    | 1-3600 saniye      | 30     | Üretilen sesin uzunluğu
 STEREO_MODE      | Stereo çıkış modu                     | True/False         | True   | Stereo veya mono çıkış
+STEREO_WIDTH     | Katman stereo genişliği (varsayılan)  | 0.0-1.0            | 0.6    | 0: mono merkez, 1: tamamen dekorele (STEREO_LAYERS)
 MASTER_AMPLITUDE | Ana çıkış ses seviyesi                | 0.0-1.0            | 0.7    | Genel ses yüksekliği
+MASTER_MODE      | Master işleme modu                    | peak / lufs        | peak   | lufs: loudness hedefi + true-peak limiter
+MASTER_TARGET_LUFS | Hedef integrated loudness (LUFS)    | -30 / -10          | -23.0  | Sahneler arası tutarlı algılanan seviye
+MASTER_TRUE_PEAK_DB | Limiter true-peak tavanı (dBTP)    | -3.0 / 0.0         | -1.0   | Aşırı örnekleme tepeleri bu değerin altında
+MASTER_LIMITER_LOOKAHEAD_MS | Limiter ileriye bakış süresi ms | 1-20        | 5.0    | Atak rampası ve akış gecikmesi
+MASTER_LIMITER_RELEASE_MS | Limiter 6 dB toparlanma süresi ms | 20-1000       | 200.0  | Kısa: pompalama, uzun: yavaş geri dönüş
+MASTER_LOUDNESS_TWO_PASS | Akışta iki geçişli loudness     | True/False         | False  | Kesin ölçüm (sabit tohumda önbelleklenir)
+REVERB_MASTER    | Karışıma konvolüsyon reverb'ü         | True/False         | False  | Kuru sahnelere ortam/oda hissi
+REVERB_IR_FILE   | Dürtü yanıtı ses dosyası (IR)         | yol / None         | None   | None: prosedürel sönümlü gürültü IR
+REVERB_DECAY_SECONDS | Prosedürel IR sönüm süresi (RT60) sn | 0.3-10.0      | 2.5    | Oda/salon büyüklüğü
+REVERB_WET       | Master reverb wet oranı               | 0.0-1.0            | 0.25   | 0: kuru, 1: yalnızca reverb
+REVERB_PARTITION | Konvolüsyon parça boyutu (örnek)      | 256-16384          | 4096   | Büyük: az işlem, kaba blok; gecikme her durumda 0
+STREAMING_MODE   | Blok blok akış (streaming) render     | True/False         | False  | Bellek DURATION'dan bağımsız olur
+BLOCK_SIZE       | Akış blok boyutu (frame)              | 4096-65536         | 16384  | Blok başına işlenen örnek sayısı
+STREAM_CALIBRATION_SECONDS | Akış normalizasyon kalibrasyon penceresi sn | 1.0-30.0 | 10.0 | Tepe tahmini için tamponlanan süre
+STREAM_LEVEL_PREPASS | Akışta seviye ön geçişleri          | None/True/False    | None   | None: yalnızca sabit tohumda (önbelleklenir); True: her zaman (~3x); False: tek geçiş
+SCENE_SEED       | Sahne tohum değeri (None: rastgele)   | int / None         | None   | Aynı tohum aynı çıktıyı üretir
+PARALLEL_WORKERS | Paralel katman render işçi sayısı     | 1-64               | 1      | 1: seri, >1: süreç havuzu (ek bellek: işçi × katman uzunluğu)
+RENDER_DTYPE     | Render veri tipi                      | float64 / float32  | float64 | float32: yarı bellek ve bant genişliği
+MULTIRATE_MODE   | Dar bantlı katmanları düşük iç hızda üret | True/False     | False  | Bas katmanlarında sentez ~15x ucuz (MULTIRATE_LAYERS); rastgele gerçekleşme değişir
+MULTIRATE_OVERSAMPLE | İç hız / katman bant üst sınırı oranı | 3.0-8.0        | 4.0    | Büyük: yukarı örnekleme öncesi daha geniş pay
+MULTIRATE_MIN_RATE | En düşük iç örnekleme hızı Hz         | 500-8000           | 1000   | Alt-ses brainwave katmanlarının alt sınırı
+MULTIRATE_MAX_FACTOR | En büyük hız bölme katsayısı        | 2-128              | 64     | sr'yi tam bölen en büyük k seçilir
+LAYER_CACHE      | Katman önbelleği (output/layer_cache) | True/False         | True   | Sabit tohumda aynı katman yeniden üretilmez
+LAYER_CACHE_MAX_MB | Katman önbelleği boyut sınırı MB    | 100-100000         | 2048   | Aşılınca en eski kullanılan silinir
+LOOP_MODE        | Durağan katmanları döngüden üret      | True/False         | False  | 8 saatlik yatak = tek 60 sn render
+LOOP_SECONDS     | Dikişsiz döngü segment uzunluğu sn    | 10-600             | 60.0   | Segment başına render süresi
+LOOP_CROSSFADE_SECONDS | Döngü noktası crossfade süresi sn | 0.1-10.0       | 2.0    | Dairesel olmayan katmanlarda dikiş yumuşatma
+LOOP_VARIATION   | Döngü tekrarları arası yavaş genlik varyasyonu | 0.0-0.5 | 0.15   | Tekrar hissini azaltır
+FFT_WORKERS      | scipy.fft iş parçacığı sayısı         | -1 / 1-64          | -1     | -1: tüm çekirdekler, uzun FFT'ler hızlanır
+SERVER_MODE      | Yerel HTTP akış sunucusunu başlat     | True/False         | False  | Sahneler istek üzerine parça parça akıtılır
+SERVER_HOST      | Sunucu dinleme adresi                 | 127.0.0.1 / 0.0.0.0 | 127.0.0.1 | Yalnızca yerel ya da ağdan erişim
+SERVER_PORT      | Sunucu portu                          | 1024-65535         | 8765   | http://SERVER_HOST:SERVER_PORT/render
+SERVER_CALIBRATION_SECONDS | Sunucu akışı kalibrasyon penceresi sn | 0.1-10.0 | 0.5 | Kısa: ilk ses baytı hızlı gelir
+BATCH_FILE       | Toplu render sahne dosyası (JSONL)    | yol / None         | None   | Ayarlıysa main() sahneleri toplu render eder
+BATCH_WORKERS    | Toplu render eşzamanlı iş sayısı      | 1-64               | 2      | Her iş ayrı süreçte çalışır
+BATCH_OUTPUT_DIR | Toplu render çıktı klasörü            | yol                | output/batch | Ses dosyaları ve manifest.jsonl
+VISUALIZER_MODE  | Görselleştirme çıktısı                | show / png / svg   | show   | png/svg: başsız dosya (sunucu, toplu iş)
+VISUALIZER_WIDTH_PX | Görsel genişliği piksel              | 400-4000           | 1200   | Dalga formu bu kadar min/max sütununa iner
+VISUALIZER_SPECTRUM_BINS | Spektrum frekans noktası sayısı | 256-8192           | 2048   | Frekans çözünürlüğü sr/(2·bins)
+VISUALIZER_MAX_SEGMENTS | Spektrumda ortalanan segment sayısı | 16-1024        | 256    | Uzun render'da süre sabit kalır
+EXPORT_FORMAT    | Çıktı dosya formatı                   | wav / flac / ogg   | wav    | Kayıpsız ya da kayıplı çıktı
+EXPORT_SUBTYPE   | Örnek formatı (bit derinliği)         | PCM_16 / PCM_24 / FLOAT | FLOAT | ogg'de yok sayılır (VORBIS)
+EXPORT_DITHER    | Tamsayı çıktıda TPDF dither           | True/False         | True   | 16/24 bit nicemleme bozulmasını gürültüye çevirir
+EXPORT_FILENAME_TEMPLATE | Dosya adı şablonu (uzantısız)  | {timestamp} {seed} {sr} ... | audio_dsp_output_{timestamp} | output/ altında dosya adı
+PROFILE_MODE     | Aşama bazlı profil kaydı              | True/False         | False  | output/profiles'a JSON ve Chrome trace yazar
+PROFILE_TRACE_MEMORY | Profilde tahsis tepe değeri (tracemalloc) | True/False | True | Daha yavaş, aşama başına bellek görünür
 """
 
 SAMPLE_RATE = 44100
 DURATION = 30
 STEREO_MODE = True
+STEREO_WIDTH = 0.6
 MASTER_AMPLITUDE = 0.7
+MASTER_MODE = "peak"
+MASTER_TARGET_LUFS = -23.0
+MASTER_TRUE_PEAK_DB = -1.0
+MASTER_LIMITER_LOOKAHEAD_MS = 5.0
+MASTER_LIMITER_RELEASE_MS = 200.0
+MASTER_LOUDNESS_TWO_PASS = False
+REVERB_MASTER = False
+REVERB_IR_FILE = None
+REVERB_DECAY_SECONDS = 2.5
+REVERB_WET = 0.25
+REVERB_PARTITION = 4096
+STREAMING_MODE = False
+BLOCK_SIZE = 16384
+STREAM_CALIBRATION_SECONDS = 10.0
+STREAM_LEVEL_PREPASS = None
+SCENE_SEED = None
+PARALLEL_WORKERS = 1
+RENDER_DTYPE = "float64"
+MULTIRATE_MODE = False
+MULTIRATE_OVERSAMPLE = 4.0
+MULTIRATE_MIN_RATE = 1000
+MULTIRATE_MAX_FACTOR = 64
+LAYER_CACHE = True
+LAYER_CACHE_MAX_MB = 2048
+LOOP_MODE = False
+LOOP_SECONDS = 60.0
+LOOP_CROSSFADE_SECONDS = 2.0
+LOOP_VARIATION = 0.15
+FFT_WORKERS = -1
+SERVER_MODE = False
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_CALIBRATION_SECONDS = 0.5
+BATCH_FILE = None
+BATCH_WORKERS = 2
+BATCH_OUTPUT_DIR = os.path.join("output", "batch")
+VISUALIZER_MODE = "show"
+VISUALIZER_WIDTH_PX = 1200
+VISUALIZER_SPECTRUM_BINS = 2048
+VISUALIZER_MAX_SEGMENTS = 256
+EXPORT_FORMAT = "wav"
+EXPORT_SUBTYPE = "FLOAT"
+EXPORT_DITHER = True
+EXPORT_FILENAME_TEMPLATE = "audio_dsp_output_{timestamp}"
+PROFILE_MODE = False
+PROFILE_TRACE_MEMORY = True
 
 """
 NOISE TÜRÜ AKTIVASYON TABLOSU
@@ -454,14 +568,621 @@ CATALOG = {
 # BÖLÜM 3: YARDIMCI FONKSİYONLAR
 # ═══════════════════════════════════════════════════════════════════════════
 
-def normalize_signal(sig, target_amplitude=1.0):
-    """Sinyali normalize et ve clipping önle"""
-    if np.max(np.abs(sig)) > 0:
-        sig = sig / np.max(np.abs(sig)) * target_amplitude
-    return np.clip(sig, -1.0, 1.0)
+# Profil kaydı (PROFILE_MODE): aşama başına duvar süresi, CPU süresi ve tahsis tepe değeri.
+# Kapalıyken profile_stage paylaşılan boş bağlam döndürür, profiled yalnızca bayrağı kontrol eder.
+_profile_spans = []
+_profile_local = threading.local()
+_NO_PROFILE = contextlib.nullcontext()
 
 
-def apply_naturalness(sig, sr, naturalness, nat_params):
+class _ProfileSpan:
+    """Tek aşama kaydı; iç içe aşamalarda tahsis tepe değeri üst aşamaya da yansıtılır"""
+    
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+    
+    def __enter__(self):
+        stack = getattr(_profile_local, "stack", None)
+        if stack is None:
+            stack = _profile_local.stack = []
+        self.base_memory = self.peak_memory = 0
+        if tracemalloc.is_tracing():
+            self.base_memory, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak_memory = max(stack[-1].peak_memory, peak)
+            tracemalloc.reset_peak()
+            self.peak_memory = self.base_memory
+        stack.append(self)
+        self.cpu_start = time.thread_time_ns()
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        cpu = time.thread_time_ns() - self.cpu_start
+        stack = _profile_local.stack
+        stack.pop()
+        if tracemalloc.is_tracing():
+            self.peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].peak_memory = max(stack[-1].peak_memory, self.peak_memory)
+        _profile_spans.append({
+            "name": self.name,
+            "cat": self.category,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "ts": self.start // 1000,
+            "dur": (end - self.start) // 1000,
+            "cpu": cpu // 1000,
+            "alloc_peak_mb": round((self.peak_memory - self.base_memory) / 2**20, 3),
+            "depth": len(stack),
+            "args": self.args
+        })
+        return False
+
+
+def profile_stage(name, category="stage", **args):
+    """Aşama kaydı bağlamı: with profile_stage("bandpass"): ... (PROFILE_MODE kapalıyken maliyetsiz)"""
+    if not PROFILE_MODE:
+        return _NO_PROFILE
+    return _ProfileSpan(name, category, args)
+
+
+def profiled(name, category="stage"):
+    """Fonksiyonun tüm çağrısını tek aşama olarak kaydeden dekoratör"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILE_MODE:
+                return func(*args, **kwargs)
+            with _ProfileSpan(name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def profile_begin():
+    """Yeni profil kaydı başlat (önceki kayıtlar silinir)"""
+    _profile_spans.clear()
+    if PROFILE_TRACE_MEMORY and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def profile_drain():
+    """Biriken aşama kayıtlarını al ve listeyi boşalt (işçi süreçler sonuçlarını böyle döndürür)"""
+    spans = list(_profile_spans)
+    _profile_spans.clear()
+    return spans
+
+
+def profile_summary(spans):
+    """Aşama adına göre toplam: çağrı sayısı, duvar/CPU ms, en yüksek tahsis tepe değeri"""
+    summary = {}
+    for span in spans:
+        entry = summary.setdefault(span["name"], {"cat": span["cat"], "count": 0, "wall_ms": 0.0,
+                                                  "cpu_ms": 0.0, "alloc_peak_mb": 0.0})
+        entry["count"] += 1
+        entry["wall_ms"] += span["dur"] / 1000
+        entry["cpu_ms"] += span["cpu"] / 1000
+        entry["alloc_peak_mb"] = max(entry["alloc_peak_mb"], span["alloc_peak_mb"])
+    return dict(sorted(summary.items(), key=lambda item: -item[1]["wall_ms"]))
+
+
+def profile_end(output_dir=os.path.join("output", "profiles")):
+    """
+    Profil kaydını bitir: JSON özet ve Chrome trace-event dosyası yaz
+    (chrome://tracing, Perfetto ya da speedscope ile açılabilir). Yazılan yolları döndürür.
+    """
+    spans = profile_drain()
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    summary_path = os.path.join(output_dir, f"profile_{stamp}.json")
+    trace_path = os.path.join(output_dir, f"profile_{stamp}.trace.json")
+    
+    summary = profile_summary(spans)
+    with open(summary_path, "w", encoding="utf-8") as out:
+        json.dump({"summary": summary, "spans": spans}, out, indent=2, ensure_ascii=False)
+    
+    origin = min((span["ts"] for span in spans), default=0)
+    events = [{
+        "name": span["name"],
+        "cat": span["cat"],
+        "ph": "X",
+        "ts": span["ts"] - origin,
+        "dur": span["dur"],
+        "pid": span["pid"],
+        "tid": span["tid"],
+        "args": dict(span["args"], cpu_ms=span["cpu"] / 1000, alloc_peak_mb=span["alloc_peak_mb"])
+    } for span in spans]
+    with open(trace_path, "w", encoding="utf-8") as out:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, out)
+    
+    print(f"\n{'='*70}")
+    print(f"PROFİL: {len(spans)} aşama kaydı")
+    print(f"{'Aşama':<32} {'adet':>5} {'duvar ms':>10} {'CPU ms':>10} {'tepe MB':>9}")
+    for name, entry in list(summary.items())[:15]:
+        print(f"{name:<32} {entry['count']:>5} {entry['wall_ms']:>10.1f} {entry['cpu_ms']:>10.1f} "
+              f"{entry['alloc_peak_mb']:>9.1f}")
+    print(f"Özet: {summary_path}")
+    print(f"Trace: {trace_path}")
+    print(f"{'='*70}\n")
+    return summary_path, trace_path
+
+
+def render_dtype():
+    """
+    Sinyal tamponlarının veri tipi (RENDER_DTYPE).
+    Zaman eksenleri ve faz birikimi (cumsum) hassasiyet için her zaman float64 kalır.
+    """
+    return np.dtype(RENDER_DTYPE)
+
+
+def sine_wave(freq, t):
+    """
+    sin(2π·freq·t), render veri tipinde.
+    float32 modunda faz float64'te hesaplanıp tam tura (mod 1) indirgenir,
+    sin() float32'de alınır; saatlik render'da bile faz kayması oluşmaz.
+    """
+    dtype = render_dtype()
+    if dtype == np.float64:
+        return np.sin(2 * np.pi * freq * t)
+    
+    cycles = freq * t
+    np.mod(cycles, 1.0, out=cycles)
+    phase = cycles.astype(dtype)
+    phase *= 2 * np.pi
+    return np.sin(phase, out=phase)
+
+
+@profiled("normalize")
+def normalize_signal(sig, target_amplitude=1.0, out=None):
+    """
+    Sinyali normalize et ve clipping önle (çıktı render veri tipinde).
+    out: sonucun yazılacağı render veri tipinde dizi (sig'in kendisi olabilir: yerinde)
+    """
+    sig = np.asarray(sig, dtype=render_dtype())
+    peak = peak_abs(sig)
+    if out is None:
+        if peak > 0:
+            sig = sig / peak * target_amplitude
+        return np.clip(sig, -1.0, 1.0)
+    
+    if peak > 0:
+        np.multiply(sig, target_amplitude / peak, out=out)
+        if target_amplitude < 1.0 - 1e-9:
+            return out  # |x| ≤ hedef < 1: kırpma gerekmez
+    elif out is not sig:
+        out[...] = sig
+    return np.clip(out, -1.0, 1.0, out=out)
+
+
+# Naturalness iç işlem bloğu: geçici diziler bu boyutta bir kez ayrılır (önbellekte kalır)
+NATURALNESS_BLOCK = 65536
+
+
+@functools.lru_cache(maxsize=32)
+def hann_window(n):
+    """Önbellekli Hann penceresi (salt-okunur)"""
+    window = np.hanning(n)
+    window.flags.writeable = False
+    return window
+
+
+@functools.lru_cache(maxsize=8)
+def sample_ramp(n):
+    """Önbellekli 0..n-1 float64 örnek indeksi (salt-okunur)"""
+    ramp = np.arange(n, dtype=np.float64)
+    ramp.flags.writeable = False
+    return ramp
+
+
+def peak_abs(sig):
+    """max(|sig|), ara dizi ayırmadan"""
+    if len(sig) == 0:
+        return 0.0
+    return max(float(np.max(sig)), -float(np.min(sig)))
+
+
+_AXPY = {np.dtype(np.float64): spblas.daxpy, np.dtype(np.float32): spblas.saxpy}
+
+
+def accumulate_scaled(acc, x, scale):
+    """
+    acc += x * scale: tek geçişte, ara dizi ayırmadan (BLAS axpy).
+    acc bitişik ve x ile aynı veri tipinde/şekildeyse yerinde güncellenir (çok kanallı
+    diziler düzleştirilmiş görünüm üzerinden); aksi halde numpy yolu.
+    """
+    if scale == 0 or len(x) == 0:
+        return acc
+    axpy = _AXPY.get(acc.dtype)
+    if axpy is not None and x.dtype == acc.dtype and x.shape == acc.shape and acc.flags.c_contiguous:
+        axpy(x.reshape(-1), acc.reshape(-1), a=scale)
+    else:
+        acc += x * scale
+    return acc
+
+
+class StagedSignal:
+    """
+    KAZANÇ AŞAMALI SİNYAL (gain staging)
+    ══════════════════════════════════════════════════════════════════════════════
+    Örnekler + ertelenmiş skaler kazanç + tepe değeri. Normalizasyon örneklere
+    dokunmaz, yalnızca kazancı değiştirir; kazanç örneklere zaten dokunan ilk
+    işlemde (naturalness kopyası, karışım toplamı) tek geçişte uygulanır.
+    
+    Alan        | Anlam
+    ──────────────────────────────────────────────────────────────────────────────
+    samples     | Ham örnekler (render veri tipi, kazanç uygulanmamış)
+    gain        | Bekleyen skaler kazanç
+    raw_peak    | max(|samples|), ilk istendiğinde bir kez taranır
+    peak        | Kazanç sonrası tepe (raw_peak · |gain|)
+    """
+    
+    __slots__ = ("samples", "gain", "_raw_peak")
+    
+    def __init__(self, samples, gain=1.0, raw_peak=None):
+        self.samples = np.asarray(samples, dtype=render_dtype())
+        self.gain = float(gain)
+        self._raw_peak = raw_peak
+    
+    @property
+    def raw_peak(self):
+        if self._raw_peak is None:
+            self._raw_peak = peak_abs(self.samples)
+        return self._raw_peak
+    
+    @property
+    def peak(self):
+        return self.raw_peak * abs(self.gain)
+    
+    def scaled(self, factor):
+        """Kazancı çarp (örneklere dokunmaz)"""
+        return StagedSignal(self.samples, self.gain * factor, self._raw_peak)
+    
+    def normalized(self, target_amplitude=1.0):
+        """normalize_signal karşılığı: tepe bir kez taranır, yalnızca kazanç değişir"""
+        peak = self.raw_peak
+        return StagedSignal(self.samples, target_amplitude / peak if peak > 0 else 1.0, peak)
+    
+    def materialize(self, out=None):
+        """
+        Kazancı örneklere uygula (tek geçiş; out=samples ile yerinde).
+        Kazanç sonrası tepe 1'i aşarsa clip uygulanır (normalize_signal ile aynı);
+        kazancı 1 olan sinyal olduğu gibi döner.
+        """
+        if self.gain == 1.0:
+            if out is None or out is self.samples:
+                return self.samples
+            out[...] = self.samples
+            return out
+        out = np.multiply(self.samples, self.gain, out=out)
+        if self.peak > 1.0:
+            np.clip(out, -1.0, 1.0, out=out)
+        return out
+    
+    def accumulate_into(self, acc, weight=1.0):
+        """acc += samples · gain · weight (karışım toplamına katlanmış kazanç)"""
+        return accumulate_scaled(acc, self.samples, self.gain * weight)
+
+
+def as_channels(mono, like):
+    """Mono diziyi like'ın kanal düzenine yayınla ((n,) ya da (n, 1) görünümü; kopya yok)"""
+    return mono[:, None] if like.ndim == 2 else mono
+
+
+def as_staged(sig):
+    """Diziyi (kazanç 1) ya da StagedSignal'i StagedSignal olarak döndür"""
+    return sig if isinstance(sig, StagedSignal) else StagedSignal(sig)
+
+
+def rotation_table(freq, sr, n):
+    """
+    cos/sin(2π·freq·k/sr), k = 0..n-1 tabloları (salt-okunur).
+    sin(θ0 + δk) = sin θ0·cos δk + cos θ0·sin δk: yavaş modülatörler blok başına
+    sin() çağrısı yerine iki çarpma ve bir toplamayla üretilir, θ0 her blokta
+    mutlak örnek konumundan yeniden hesaplandığı için hata birikmez.
+    """
+    angle = sample_ramp(n) * (2 * np.pi * freq / sr)
+    table = np.stack([np.cos(angle), np.sin(angle)])
+    table.flags.writeable = False
+    return table
+
+
+# Osilatör bankası rotasyon tablosu uzunluğu (örnek) ve doğrudan yol parça boyutu
+OSC_TABLE_SIZE = 1024
+OSC_CHUNK = 8192
+
+
+@functools.lru_cache(maxsize=64)
+def oscillator_table(freqs, sr, size, dtype_name):
+    """
+    [cos(ω_k·j); sin(ω_k·j)] (2K × size) rotasyon tablosu, ω_k = 2π·f_k/sr (salt-okunur).
+    rotation_table'ın çok partial'lı hali: OscillatorBank matris çarpımıyla kullanır.
+    """
+    angle = np.outer(np.asarray(freqs, dtype=np.float64) * (2 * np.pi / sr), sample_ramp(size))
+    table = np.concatenate([np.cos(angle), np.sin(angle)]).astype(dtype_name)
+    table.flags.writeable = False
+    return table
+
+
+class OscillatorBank:
+    """
+    OSİLATÖR BANKASI
+    ══════════════════════════════════════════════════════════════════════════════
+    Çok sayıda sinüsü (partial) birlikte ve blok blok üretir. Faz partial başına
+    float64 döngü sayacı olarak taşınır: ardışık render() çağrıları faz süreklidir.
+    
+    Yol       | Ne zaman                         | Maliyet
+    ──────────────────────────────────────────────────────────────────────────────
+    Rotasyon  | Sabit frekans (+ ortak amp_mod)  | Tek matris çarpımı: her OSC_TABLE_SIZE
+              |                                  | bloğunun başlangıç fazları × sabit
+              |                                  | cos/sin tablosu; sin() çağrısı yok,
+              |                                  | 50 partial ≈ birkaç np.sin maliyeti
+    Doğrudan  | freq_mod ya da partial başına    | Partial × örnek sin (parça parça)
+              | amp_mod                          |
+    
+    amp_mod  : (n,) ortak genlik çarpanı ya da (K, n) partial başına
+    freq_mod : (n,) ortak göreli frekans sapması, f_k·(1 + freq_mod) ya da (K, n)
+    Çıkış render veri tipindedir; fazlar float64 hesaplanır.
+    """
+    
+    def __init__(self, sr, freqs, amps=1.0, phases=0.0):
+        self.sr = sr
+        self.freqs = np.atleast_1d(np.asarray(freqs, dtype=np.float64))
+        self.amps = np.broadcast_to(np.asarray(amps, dtype=np.float64), self.freqs.shape).copy()
+        # Başlangıç fazları (radyan) döngü cinsinden saklanır: [0, 1)
+        self.cycles = np.mod(np.broadcast_to(np.asarray(phases, dtype=np.float64), self.freqs.shape) / (2 * np.pi), 1.0)
+        self.step = self.freqs / sr  # örnek başına döngü
+    
+    def _advance(self, n):
+        self.cycles = np.mod(self.cycles + self.step * n, 1.0)
+    
+    def _render_rotation(self, n):
+        """Sabit frekanslı partial'lar: blok başı fazları × rotasyon tablosu (tek gemm)"""
+        dtype = render_dtype()
+        size = OSC_TABLE_SIZE
+        n_blocks = -(-n // size)
+        table = oscillator_table(tuple(self.freqs), self.sr, size, dtype.name)
+        # Her tablo bloğunun başlangıç fazı, mutlak konumdan (hata birikmez)
+        starts = np.mod(self.cycles[None, :] + np.outer(np.arange(n_blocks) * float(size), self.step), 1.0)
+        starts *= 2 * np.pi
+        # sin(θ + ωj) = sin θ·cos ωj + cos θ·sin ωj
+        coefficients = np.concatenate([np.sin(starts) * self.amps, np.cos(starts) * self.amps], axis=1)
+        full = np.empty(n_blocks * size, dtype=dtype)
+        np.matmul(coefficients.astype(dtype, copy=False), table, out=full.reshape(n_blocks, size))
+        return full[:n]
+    
+    def _render_direct(self, n, amp_mod, freq_mod):
+        """Modülasyonlu partial'lar: parça parça faz matrisi (OSC_CHUNK örnek)"""
+        out = np.empty(n, dtype=render_dtype())
+        per_partial_amp = amp_mod is not None and np.ndim(amp_mod) == 2
+        for start in range(0, n, OSC_CHUNK):
+            length = min(OSC_CHUNK, n - start)
+            if freq_mod is None:
+                increments = np.broadcast_to(self.step[:, None], (len(self.step), length))
+            else:
+                chunk_mod = np.asarray(freq_mod)[..., start:start + length]
+                increments = self.step[:, None] * (1.0 + np.atleast_2d(chunk_mod))
+            # Faz float64 birikir ve tam tura indirgenir; sin render veri tipinde alınır (sine_wave gibi)
+            phase = np.cumsum(increments, axis=1)
+            phase -= increments  # dışlayıcı toplam: j. örneğin fazı önceki artışlardan
+            phase += self.cycles[:, None]
+            self.cycles = np.mod(phase[:, -1] + increments[:, -1], 1.0)
+            np.mod(phase, 1.0, out=phase)
+            wave = phase.astype(out.dtype, copy=False)
+            wave *= 2 * np.pi
+            np.sin(wave, out=wave)
+            if per_partial_amp:
+                wave *= amp_mod[:, start:start + length]
+            np.matmul(self.amps.astype(out.dtype), wave, out=out[start:start + length])
+        return out
+    
+    def render(self, n, amp_mod=None, freq_mod=None):
+        """Sonraki n örneği üret (faz sürekli)"""
+        if n <= 0:
+            return np.zeros(0, dtype=render_dtype())
+        if freq_mod is None and np.ndim(amp_mod) < 2:
+            out = self._render_rotation(n)
+            self._advance(n)
+        else:
+            out = self._render_direct(n, amp_mod, freq_mod)
+            amp_mod = amp_mod if np.ndim(amp_mod) < 2 else None
+        if amp_mod is not None:
+            out *= amp_mod
+        return out
+
+
+def render_modulated(carrier, lfo, n):
+    """
+    carrier bankının sonraki n örneği, (1 + lfo) genlik modülasyonuyla.
+    lfo None ise modülasyonsuz; LFO derinliği lfo bankının genliğidir.
+    """
+    if lfo is None:
+        return carrier.render(n)
+    mod = lfo.render(n)
+    mod += 1.0
+    return carrier.render(n, amp_mod=mod)
+
+
+class NaturalnessStage:
+    """
+    apply_naturalness modülasyon aşaması: genlik rastgeleliği, frekans modülasyonu,
+    genlik envelope'u ve granüler doku. Bloklar yerinde işlenir; bloklar arası
+    durum (örnek konumu, normal sayı sayfası) taşınır, geçici diziler bir kez ayrılır.
+    Modülasyonlar float32 tek çarpanda birleştirilip çıkışa bir kez uygulanır.
+    
+    Genlik gürültüsü ve taneler ayrı alt üreteçlerden çekilir ve taneler baştan
+    planlanır: çıktı blok boyutundan bağımsızdır (tek seferlik == akış).
+    """
+    
+    def __init__(self, sr, naturalness, nat_params, n_samples, rng, block_size=NATURALNESS_BLOCK):
+        self.sr = sr
+        self.block_size = block_size
+        self.offset = 0
+        amp_rng, grain_rng = rng.spawn(2)
+        self.amp_rng = amp_rng
+        
+        self.random_gain = float(nat_params["randomness_amount"] * naturalness * 0.1)
+        self.fm_rate = nat_params["freq_mod_rate"]
+        self.fm_gain = nat_params["freq_mod_depth"] * naturalness if self.fm_rate > 0 else 0.0
+        self.env_gain = nat_params["amp_variation_amount"] * naturalness
+        self.env_freq = 0.1 + rng.random() * 0.5
+        # FM fazı Σ c·sin(ωk) kapalı formda: K·(cos(ω/2) − cos(ω(j + ½))), K = c / (2·sin(ω/2));
+        # kümülatif toplam yerine tablo rotasyonu: faz |·| ≤ 2K ile sınırlı, float32 yeter
+        if self.fm_gain > 0:
+            omega = 2 * np.pi * self.fm_rate / sr
+            scale = (2 * np.pi * self.fm_gain / sr) / (2 * np.sin(omega / 2))
+            angle = (sample_ramp(block_size) + 0.5) * omega
+            self.fm_table = (np.stack([np.sin(angle), -np.cos(angle)]) * scale).astype(np.float32)
+            self.fm_base = float(scale * np.cos(omega / 2))
+        # Envelope tablosu kazancıyla önceden ölçeklenir (float32: çarpan float32'de birleştirilir)
+        if self.env_gain > 0:
+            self.env_table = (rotation_table(self.env_freq, sr, block_size) * self.env_gain).astype(np.float32)
+        
+        # Genlik gürültüsü, FM ve envelope tek bir float32 çarpanda birleşir: çıkışa tek çarpma
+        self.factor = np.empty(block_size, dtype=np.float32)
+        self.wobble = np.empty(block_size, dtype=np.float32)
+        self.temp = np.empty(block_size, dtype=np.float32)
+        # Normal sayılar sabit boyutlu sayfalarda üretilir: çekiliş sırası blok bölünmesinden bağımsız
+        self.normals = np.empty(block_size + block_size % 2, dtype=np.float32)
+        self.normal_pos = len(self.normals)
+        
+        # Granüler doku: tüm taneler (en fazla 100) baştan planlanır, pencere ve kazanç önceden uygulanır
+        self.grain_len = int(nat_params["grain_size"] * sr / 1000)
+        self.grain_pos = np.zeros(0, dtype=np.int64)
+        if naturalness > 0.5 and self.grain_len > 0:
+            dtype = render_dtype()
+            n_grains = min(max(1, int(n_samples / (self.grain_len / 2))), 100)
+            self.grain_pos = np.sort(grain_rng.integers(0, max(1, n_samples - self.grain_len), n_grains))
+            self.grains = grain_rng.standard_normal((n_grains, self.grain_len), dtype=dtype)
+            self.grains *= hann_window(self.grain_len).astype(dtype, copy=False)
+            self.grains *= 0.1 * (naturalness - 0.5) * 2 * 0.3
+            self.grain_offsets = np.arange(self.grain_len)
+    
+    def process(self, block, source=None, gain=1.0):
+        """
+        Bloğu (render veri tipinde) yerinde işle ve döndür. source verilirse block'a
+        önce source·gain yazılmış gibi işlenir (kopya ve kazanç modülasyon çarpımında).
+        """
+        # Parçalar mutlak block_size sayfa sınırlarında bölünür: her örnek, bloklar
+        # nasıl gelirse gelsin aynı sayfa başlangıcından aynı işlemlerle hesaplanır
+        start = 0
+        while start < len(block):
+            length = min(len(block) - start, self.block_size - self.offset % self.block_size)
+            self._process_chunk(block[start:start + length],
+                                None if source is None else source[start:start + length], gain)
+            start += length
+        return block
+    
+    def _sine(self, table, freq, n, out):
+        """Tablo ölçeğinde sin(2π·freq·t), bu parçanın mutlak örnek konumlarında (θ0 sayfa başından)"""
+        index = self.offset % self.block_size
+        theta0 = 2 * np.pi * ((freq * (self.offset - index) / self.sr) % 1.0)
+        # Python float katsayılar: NumPy skaleri float32 tabloyu float64'e yükseltirdi
+        np.multiply(table[0, index:index + n], float(np.sin(theta0)), out=out)
+        temp = self.temp[:n]
+        np.multiply(table[1, index:index + n], float(np.cos(theta0)), out=temp)
+        out += temp
+        return out
+    
+    def _refill_normals(self):
+        """
+        Normal sayı sayfasını Box-Muller ile doldur (float32): r = √(−2·ln u1),
+        sayfanın ilk yarısı r·cos(2π·u2), ikinci yarısı r·sin(2π·u2). Ham 64-bit
+        çekiliş ve SIMD log/sin/cos, float32 ziggurat'tan ~3 kat hızlı.
+        """
+        page = self.normals
+        half = len(page) // 2
+        # Düzgün sayılar random(dtype=float32) ile aynı (32 bitlik çekilişin üst 24 biti · 2^-24),
+        # ara dönüşüm olmadan ham bitlerden
+        bits = self.amp_rng.bit_generator.random_raw(half).view(np.uint32)
+        bits >>= 8
+        page[...] = bits
+        page *= 2.0 ** -24
+        radius = self.temp[:half]
+        np.subtract(1.0, page[:half], out=radius)
+        np.log(radius, out=radius)
+        radius *= -2.0
+        np.sqrt(radius, out=radius)
+        angle = page[half:]
+        angle *= 2 * np.pi
+        np.cos(angle, out=page[:half])
+        np.sin(angle, out=angle)
+        page[:half] *= radius
+        page[half:] *= radius
+        self.normal_pos = 0
+    
+    def _draw_normals(self, out, scale=1.0):
+        """out'u sayfadaki sıradaki normal sayılarla (scale ile çarpılmış) doldur"""
+        filled = 0
+        while filled < len(out):
+            if self.normal_pos == len(self.normals):
+                self._refill_normals()
+            take = min(len(out) - filled, len(self.normals) - self.normal_pos)
+            np.multiply(self.normals[self.normal_pos:self.normal_pos + take], scale, out=out[filled:filled + take])
+            self.normal_pos += take
+            filled += take
+        return out
+    
+    def _process_chunk(self, out, source, gain):
+        n = len(out)
+        factor = self.factor[:n]
+        modulated = False
+        
+        # Rastgele genlik varyasyonu: normal dağılım, float32
+        if self.random_gain > 0:
+            self._draw_normals(factor, self.random_gain)
+            factor += 1.0
+            modulated = True
+        else:
+            factor[...] = 1.0
+        
+        # Frekans modülasyonu (pitch wobble): faz kapalı formdan, float32
+        if self.fm_gain > 0:
+            wobble = self._sine(self.fm_table, self.fm_rate, n, self.wobble[:n])
+            wobble += self.fm_base
+            np.sin(wobble, out=wobble)
+            wobble *= 0.01
+            wobble += 1.0
+            factor *= wobble
+            modulated = True
+        
+        # Genlik varyasyon envelope
+        if self.env_gain > 0:
+            envelope = self._sine(self.env_table, self.env_freq, n, self.wobble[:n])
+            envelope += 1.0
+            factor *= envelope
+            modulated = True
+        
+        if source is None:
+            if modulated:
+                out *= factor
+        elif modulated:
+            factor *= gain
+            np.multiply(source, factor, out=out)
+        else:
+            np.multiply(source, gain, out=out)
+        
+        # Granüler doku: bloğa değen taneler tek seferde yerleştirilir (çakışmalar toplanır)
+        if len(self.grain_pos):
+            start = self.offset
+            lo = np.searchsorted(self.grain_pos, start - self.grain_len, side="right")
+            hi = np.searchsorted(self.grain_pos, start + n, side="left")
+            if hi > lo:
+                idx = self.grain_pos[lo:hi, None] - start + self.grain_offsets
+                inside = (idx >= 0) & (idx < n)
+                np.add.at(out, idx[inside], self.grains[lo:hi][inside])
+        
+        self.offset += n
+
+
+@profiled("naturalness")
+def apply_naturalness(sig, sr, naturalness, nat_params, rng=None):
     """
     NATURALNESS PARAMETRELERİNİ UYGULA
     ══════════════════════════════════════════════════════════════════════════════
@@ -472,232 +1193,609 @@ def apply_naturalness(sig, sr, naturalness, nat_params):
     0.5   -> Orta seviye, freq mod küçük, amp vary orta
     0.75  -> Yüksek seviye, freq mod orta, amp vary yüksek, grain eklenir
     1.0   -> Maksimum gerçekçilik, çoklu modülasyon, mikro jitter, granular
+    
+    Sonuç tek bir çıkış dizisinde yerinde üretilir; modülasyon ve tilt
+    NATURALNESS_BLOCK'luk parçalar halinde işlenir (NaturalnessStage).
+    sig StagedSignal olabilir: bekleyen kazanç çıkışa kopyalama geçişinde uygulanır,
+    hedef tepe taşınan tepe değerinden alınır (ayrı normalize geçişi yok).
     """
+    rng = np.random.default_rng(rng)
+    staged = as_staged(sig)
     if naturalness <= 0.0:
-        return sig
+        return staged.materialize()
     
-    result = sig.copy()
+    sig, gain = staged.samples, staged.gain
     n_samples = len(sig)
-    t = np.arange(n_samples) / sr
-    
-    # Rastgele genlik varyasyonu
-    if nat_params["randomness_amount"] > 0:
-        random_amp = 1.0 + (np.random.randn(n_samples) * nat_params["randomness_amount"] * naturalness * 0.1)
-        result *= random_amp
-    
-    # Frekans modülasyonu (pitch wobble)
-    if nat_params["freq_mod_depth"] > 0 and nat_params["freq_mod_rate"] > 0:
-        mod_signal = np.sin(2 * np.pi * nat_params["freq_mod_rate"] * t)
-        freq_shift = mod_signal * nat_params["freq_mod_depth"] * naturalness
-        phase_mod = np.cumsum(freq_shift) / sr
-        result *= (1.0 + 0.01 * np.sin(2 * np.pi * phase_mod))
-    
-    # Genlik varyasyon envelope
-    if nat_params["amp_variation_amount"] > 0:
-        env_freq = 0.1 + np.random.rand() * 0.5
-        envelope = 1.0 + nat_params["amp_variation_amount"] * naturalness * np.sin(2 * np.pi * env_freq * t)
-        result *= envelope
-    
-    # Granüler doku overlay (yüksek naturalness'ta)
-    if naturalness > 0.5 and nat_params["grain_size"] > 0:
-        grain_samples = int(nat_params["grain_size"] * sr / 1000)
-        n_grains = max(1, int(n_samples / (grain_samples / 2)))
-        grain_layer = np.zeros(n_samples)
-        
-        for _ in range(min(n_grains, 100)):
-            pos = np.random.randint(0, max(1, n_samples - grain_samples))
-            grain_env = np.hanning(grain_samples)
-            grain_noise = np.random.randn(grain_samples) * 0.1 * (naturalness - 0.5) * 2
-            grain_layer[pos:pos+grain_samples] += grain_env * grain_noise
-        
-        result += grain_layer * 0.3
+    target_amplitude = staged.peak * 1.1
+    stage = NaturalnessStage(sr, naturalness, nat_params, n_samples, rng)
     
-    # Mikro timing jitter (temporal varyasyon)
+    # Mikro timing jitter (temporal varyasyon): dairesel kaydırma, kopya yerine
+    # modülasyon çıktısı kaydırılmış konuma yazılarak uygulanır
+    shift = 0
     if nat_params["micro_timing_jitter"] > 0 and naturalness > 0.6:
         jitter_amount = nat_params["micro_timing_jitter"] * naturalness / 1000.0
         jitter_samples = int(jitter_amount * sr)
-        if jitter_samples > 0:
-            shift = np.random.randint(-jitter_samples, jitter_samples + 1)
-            result = np.roll(result, shift)
+        if jitter_samples > 0 and n_samples > 0:
+            shift = int(rng.integers(-jitter_samples, jitter_samples + 1)) % n_samples
     
-    # Perlin noise overlay (fraktal doku)
-    if naturalness > 0.7 and nat_params["perlin_octaves"] > 0:
-        perlin_layer = generate_perlin_noise(n_samples, nat_params["perlin_octaves"])
-        result += perlin_layer * 0.05 * (naturalness - 0.7) * 3.33
+    result = np.empty(n_samples, dtype=render_dtype())
+    with profile_stage("naturalness:modulation"):
+        for src, dst, length in ((0, shift, n_samples - shift), (n_samples - shift, 0, shift)):
+            stage.process(result[dst:dst + length], sig[src:src + length], gain)
     
-    # Spektral tilt (frekans dengesi)
+    # Perlin noise overlay (fraktal doku), parça parça: yalnızca parça boyutunda ek bellek
+    if naturalness > 0.7 and nat_params["perlin_octaves"] > 0:
+        with profile_stage("naturalness:perlin"):
+            perlin = FractalNoise(nat_params["perlin_octaves"], rng)
+            perlin_gain = 0.05 * (naturalness - 0.7) * 3.33
+            overlay = np.empty(min(n_samples, NATURALNESS_BLOCK), dtype=render_dtype())
+            for start in range(0, n_samples, NATURALNESS_BLOCK):
+                view = result[start:start + NATURALNESS_BLOCK]
+                chunk = perlin.render(start, len(view), out=overlay[:len(view)])
+                chunk *= perlin_gain
+                view += chunk
+    
+    # Spektral tilt (frekans dengesi), filtre durumu parçalar arasında taşınır
     if nat_params["spectral_tilt"] != 0.0:
-        nyquist = sr / 2
-        tilt_filter = sps.butter(4, [100 / nyquist, 0.95], btype='band', output='sos')
-        tilted = sps.sosfilt(tilt_filter, result)
-        tilt_factor = nat_params["spectral_tilt"] / 12.0 * naturalness
-        result = result * (1 - abs(tilt_factor) * 0.3) + tilted * tilt_factor * 0.3
+        with profile_stage("naturalness:spectral_tilt"):
+            tilt_factor = nat_params["spectral_tilt"] / 12.0 * naturalness
+            tilt = StatefulFilter(spectral_tilt_sos(sr, tilt_factor))
+            for start in range(0, n_samples, NATURALNESS_BLOCK):
+                view = result[start:start + NATURALNESS_BLOCK]
+                view[...] = tilt.process(view)
+    
+    return normalize_signal(result, target_amplitude, out=result)
+
+
+def lattice_values(cells, key, gain=1.0):
+    """
+    Kafes hücre indekslerine karşılık gelen deterministik değerler [-gain, gain).
+    32-bit karma (lowbias32): değer yalnızca (key, hücre) ikilisine bağlıdır,
+    herhangi bir hücre aralığı bağımsız olarak hesaplanabilir.
+    """
+    x = cells.astype(np.uint32) * np.uint32(0x9E3779B9)
+    x ^= np.uint32(key)
+    x ^= x >> np.uint32(16)
+    x *= np.uint32(0x7FEB352D)
+    x ^= x >> np.uint32(15)
+    x *= np.uint32(0x846CA68B)
+    x ^= x >> np.uint32(16)
+    values = x.astype(np.float64)
+    values *= gain * 2.0 ** -31
+    values -= gain
+    return values
+
+
+@functools.lru_cache(maxsize=32)
+def quintic_fade(spacing):
+    """Hücre içi quintic (6t⁵ − 15t⁴ + 10t³) geçiş tablosu, spacing örnek (salt-okunur)"""
+    t = np.arange(spacing) / spacing
+    fade = t * t * t * (t * (t * 6 - 15) + 10)
+    fade.flags.writeable = False
+    return fade
+
+
+# FractalNoise: bu aralığa (örnek) kadarki oktavlar tek matris çarpımında toplanır
+FRACTAL_GEMM_SPAN = 8
+
+
+class FractalNoise:
+    """
+    Kafes tabanlı fraktal (value) noise: herhangi bir [start, start+length) örnek
+    aralığında, bellekte yalnızca o aralık kadar yer kaplayarak değerlendirilir.
+    
+    Oktav k: kafes aralığı base_spacing·2^k örnek, genlik 0.5^k; hücre değerleri
+    tohumdan karma ile türetilir, hücreler arası quintic geçiş yapılır. Çıktı
+    analitik olarak |x| ≤ peak ile sınırlıdır (global normalizasyon gerekmez),
+    aynı tohum ve konum her blok bölünmesinde aynı değeri verir.
+    
+    Aralığı FRACTAL_GEMM_SPAN'e kadar olan ince oktavlar tek matris çarpımında
+    toplanır: span örneklik her hücre için oktavların kafes değer pencereleri yan
+    yana dizilir (satır başına Σ(span/aralık + 1) değer) ve sabit geçiş ağırlıklarıyla
+    (1 − fade, fade) çarpılır. Kaba oktavlar hücre başına ayrı enterpolasyonla eklenir.
+    """
     
-    return normalize_signal(result, np.max(np.abs(sig)) * 1.1)
+    def __init__(self, octaves=4, rng=None, base_spacing=1, peak=0.5):
+        rng = np.random.default_rng(rng)
+        self.keys = [int(key) for key in rng.integers(0, 2**32, octaves)]
+        self.spacings = [base_spacing * 2**octave for octave in range(octaves)]
+        amplitudes = [0.5**octave for octave in range(octaves)]
+        self.gains = [amplitude * peak / sum(amplitudes) for amplitude in amplitudes]
+        
+        fine = [octave for octave, spacing in enumerate(self.spacings) if spacing <= FRACTAL_GEMM_SPAN]
+        self.fine = fine
+        self.span = self.spacings[fine[-1]] if fine else 0
+        if fine:
+            # Ağırlık matrisi: oktav penceresindeki c. değerin hücredeki j. örneğe katkısı
+            rows = []
+            for octave in fine:
+                spacing = self.spacings[octave]
+                fade = quintic_fade(spacing)
+                weights = np.zeros((self.span // spacing + 1, self.span))
+                position = np.arange(self.span)
+                weights[position // spacing, position] = 1.0 - fade[position % spacing]
+                weights[position // spacing + 1, position] += fade[position % spacing]
+                rows.append(weights)
+            self.weights = np.vstack(rows)
+    
+    def _render_fine(self, start, length, out):
+        """İnce oktavların toplamını out'a yaz: hücre pencereleri @ geçiş ağırlıkları (tek GEMM)"""
+        span = self.span
+        first = start // span
+        # En az iki hücre: tek satırlı çarpım GEMV'ye düşer, toplama sırası (son bit) değişir
+        n_cells = max(2, (start + length - 1) // span - first + 1)
+        # Sütun düzeninde: her pencere sütunu kafes değerlerinin adımlı bir kopyasıdır
+        windows = np.empty((n_cells, len(self.weights)), order='F')
+        column = 0
+        for octave in self.fine:
+            per_cell = span // self.spacings[octave]
+            cells = np.arange(first * per_cell, (first + n_cells) * per_cell + 1)
+            values = lattice_values(cells, self.keys[octave], self.gains[octave])
+            for index in range(per_cell + 1):
+                windows[:, column + index] = values[index:index + n_cells * per_cell:per_cell]
+            column += per_cell + 1
+        
+        offset = start - first * span
+        if offset == 0 and length == n_cells * span and out.dtype == np.float64 and out.flags.c_contiguous:
+            np.matmul(windows, self.weights, out=out.reshape(n_cells, span))
+        else:
+            out[...] = (windows @ self.weights).ravel()[offset:offset + length]
+    
+    def render(self, start, length, out=None):
+        """[start, start+length) aralığındaki değerler (render veri tipinde; out verilirse ona yazılır)"""
+        if out is None:
+            out = np.empty(length, dtype=render_dtype())
+        if length == 0:
+            return out
+        if self.fine:
+            self._render_fine(start, length, out)
+        else:
+            out[...] = 0.0
+        
+        # Kaba oktavlar (aralıklar artan sırada: ince oktavlardan sonrakiler)
+        n_fine = len(self.fine)
+        for key, spacing, gain in zip(self.keys[n_fine:], self.spacings[n_fine:], self.gains[n_fine:]):
+            first = start // spacing
+            last = (start + length - 1) // spacing
+            values = lattice_values(np.arange(first, last + 2), key, gain)
+            offset = start - first * spacing
+            # Hücre başına v0 + (v1 − v0)·fade, (hücre, faz) ızgarası düzleştirilir
+            v0 = values[:-1, None]
+            octave = (values[1:, None] - v0) * quintic_fade(spacing)
+            octave += v0
+            out += octave.ravel()[offset:offset + length]
+        
+        return out
+
+
+def generate_perlin_noise(n_samples, octaves=4, rng=None):
+    """Perlin-benzeri fraktal noise (FractalNoise, tepe ≤ 0.5)"""
+    return FractalNoise(octaves, rng).render(0, n_samples)
+
+
+# Filtre tasarım önbelleği kapasitesi (LRU, süreç genelinde)
+FILTER_CACHE_SIZE = 256
+
 
+@functools.lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _design_sos_cached(order, band, btype):
+    return sps.butter(order, list(band), btype=btype, output='sos')
 
-def generate_perlin_noise(n_samples, octaves=4):
-    """Basit Perlin-benzeri fraktal noise üretimi"""
-    result = np.zeros(n_samples)
-    amplitude = 1.0
-    frequency = 1.0
+
+def design_sos(order, band, btype):
+    """
+    Butterworth SOS tasarımı, süreç genelinde LRU önbellekli.
+    band: normalize edilmiş (0-1, Nyquist'e göre) köşe frekansları.
+    Dönen dizi çağrılar arasında paylaşılır, yerinde değiştirilmemelidir.
+    """
+    return _design_sos_cached(int(order), tuple(float(edge) for edge in band), btype)
+
+
+def filter_cache_stats():
+    """Filtre tasarım önbelleği isabet/ıska istatistikleri"""
+    info = _design_sos_cached.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
+
+
+def clear_filter_cache():
+    """Filtre tasarım önbelleğini (ve derlenmiş frekans işlemlerini) sıfırla"""
+    _design_sos_cached.cache_clear()
+    _tilt_sos_cached.cache_clear()
+    _compile_cached.cache_clear()
+
+
+# Band-pass kenarlarının normalize alt sınırı: alt-ses bantları (brainwave boost 0.5-4 Hz)
+# tam hızda da tasarlanır (eski 0.001 sınırı 44100 Hz'de 22 Hz altını tek noktaya sıkıştırıyordu)
+BANDPASS_MIN_NORM = 1e-6
+
+
+def bandpass_sos(sr, freq_range):
+    """Band-pass SOS katsayıları (geçersiz bantta None)"""
+    low, high = freq_range
+    nyquist = sr / 2
     
-    for _ in range(octaves):
-        noise_len = max(2, int(n_samples / frequency))
-        noise = np.random.randn(noise_len)
-        noise_interp = np.interp(
-            np.linspace(0, noise_len - 1, n_samples),
-            np.arange(noise_len),
-            noise
-        )
-        result += noise_interp * amplitude
-        amplitude *= 0.5
-        frequency *= 2.0
+    low_norm = max(BANDPASS_MIN_NORM, min(low / nyquist, 0.999))
+    high_norm = max(BANDPASS_MIN_NORM, min(high / nyquist, 0.999))
+    
+    if low_norm >= high_norm:
+        return None
     
-    return normalize_signal(result, 0.5)
+    return design_sos(4, (low_norm, high_norm), 'band')
 
 
+@functools.lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _tilt_sos_cached(sr, tilt_factor):
+    band = design_sos(4, (100 / (sr / 2), 0.95), 'band')
+    numerator, denominator = sps.sos2tf(band)
+    mixed = (1 - abs(tilt_factor) * 0.3) * denominator + tilt_factor * 0.3 * numerator
+    _, poles, _ = sps.sos2zpk(band)
+    return sps.zpk2sos(np.roots(mixed), poles, mixed[0])
+
+
+def spectral_tilt_sos(sr, tilt_factor):
+    """
+    Spektral tilt karışımı x·(1 − |t|·0.3) + band(x)·t·0.3 tek SOS filtre olarak
+    (band: 100 Hz - 0.95·Nyquist band-pass, payda A, pay B): aynı payda üzerinde
+    pay (1 − |t|·0.3)·A + t·0.3·B. Ayrı filtre çıktısı ve üç karışım geçişi yerine
+    tek sosfilt geçişi; LRU önbellekli, dönen dizi paylaşılır.
+    """
+    return _tilt_sos_cached(int(sr), float(tilt_factor))
+
+
+@profiled("bandpass")
 def apply_bandpass_filter(sig, sr, freq_range):
     """Band-pass filtre uygula"""
-    low, high = freq_range
-    nyquist = sr / 2
+    return StatefulFilter.bandpass(sr, freq_range).process(sig)
+
+
+# Filtre işlem tipi: (filtre derecesi, btype, varsayılan Q)
+FILTER_OPERATIONS = {
+    "boost": (2, 'band', 2.0),
+    "notch": (2, 'bandstop', 5.0),
+    "bandpass": (4, 'band', 1.5)
+}
+
+
+# float32 katsayılarla kutbu birim çembere bu mesafeden yakın SOS filtreler float64'te çalışır
+FLOAT32_POLE_MARGIN = 1e-4
+
+
+class StatefulFilter:
+    """
+    DURUMLU BLOK FİLTRE
+    ══════════════════════════════════════════════════════════════════════════════
+    SOS filtre durumunu (zi) process() çağrıları arasında taşır; parça parça
+    işlenen çıktı, tüm sinyale tek sosfilt çağrısının çıktısıyla örnek örnek aynıdır.
     
-    low_norm = max(0.001, min(low / nyquist, 0.999))
-    high_norm = max(0.001, min(high / nyquist, 0.999))
+    sos           : SOS katsayıları (None ise sinyal olduğu gibi geçer)
+    parallel_gain : verilirse çıktı = giriş + filtrelenmiş * parallel_gain (boost)
     
-    if low_norm >= high_norm:
-        return sig
+    Katsayılar ve durum ilk bloğun veri tipine çevrilir; float32 blok float32'de
+    filtrelenir (float64'e yükseltilmez). Kutbu birim çembere FLOAT32_POLE_MARGIN'den
+    yakın filtreler (alt-ses band-pass) float32'de kararsızlaştığından float64'te
+    filtrelenip blok tipine döndürülür. (n, kanal) bloklar zaman ekseninde,
+    kanal başına ayrı durumla filtrelenir.
+    """
+    
+    def __init__(self, sos, parallel_gain=None):
+        self.sos = sos
+        self.parallel_gain = parallel_gain
+        self.reset()
+    
+    def reset(self):
+        """Filtre durumunu sıfırla (yeni sinyal başlangıcı)"""
+        self.coeffs = None
+        self.zi = None
+    
+    def process(self, block):
+        """Bir bloğu filtrele, durumu bir sonraki blok için sakla"""
+        if self.sos is None or len(block) == 0:
+            return block
+        
+        if self.zi is None:
+            dtype = np.result_type(block.dtype, np.float32)
+            if dtype == np.float32:
+                # Kutuplar bölüm paydalarından (sos2zpk alt-ses paylarında BadCoefficients uyarısı verir)
+                poles = np.concatenate([np.roots(section[3:]) for section in self.sos])
+                if np.abs(poles).max() > 1.0 - FLOAT32_POLE_MARGIN:
+                    dtype = np.dtype(np.float64)
+            self.coeffs = self.sos.astype(dtype)
+            self.zi = np.zeros((self.sos.shape[0], 2) + block.shape[1:], dtype=dtype)
+        
+        filtered, self.zi = sps.sosfilt(self.coeffs, block, axis=0, zi=self.zi)
+        filtered = filtered.astype(np.result_type(block.dtype, np.float32), copy=False)
+        
+        if self.parallel_gain is None:
+            return filtered
+        return block + filtered * self.parallel_gain
+    
+    @classmethod
+    def bandpass(cls, sr, freq_range):
+        """apply_bandpass_filter ile aynı band-pass filtre"""
+        return cls(bandpass_sos(sr, freq_range))
+    
+    @classmethod
+    def from_operation(cls, op, sr):
+        """specific_frequencies boost/notch/bandpass işlemi için filtre (diğer işlemlerde None)"""
+        if op["operation"] not in FILTER_OPERATIONS:
+            return None
+        
+        order, btype, default_q = FILTER_OPERATIONS[op["operation"]]
+        sos = frequency_op_sos(op["freq"], op.get("q_factor", default_q), sr, order, btype)
+        
+        parallel_gain = None
+        if op["operation"] == "boost":
+            parallel_gain = 10 ** (op.get("gain_db", 6.0) / 20.0) - 1.0
+        
+        return cls(sos, parallel_gain)
+
+
+# Olay motoru tek partide en fazla bu kadar (olay x örnek) hücre üretir
+EVENT_BATCH_SAMPLES = 1 << 20
+
+
+def add_events(buffer, sr, onsets, lengths, waveform, params=None):
+    """
+    OLAY SENTEZ MOTORU
+    ══════════════════════════════════════════════════════════════════════════════
+    Transient olayları (damla, çıtırtı, tık...) toplu ve vektörel olarak üretir,
+    scatter-add (np.bincount) ile buffer'a ekler. Olay başına Python döngüsü yoktur.
+    
+    onsets   : olay başlangıçları (buffer içi örnek indeksi)
+    lengths  : olay uzunlukları (örnek), skaler veya olay başına dizi
+    waveform : waveform(t, p) -> (olay, max_len) dalga matrisi
+               t: (1, max_len) zaman satırı (s), p: params dizileri (olay, 1) sütunları
+    params   : olay başına parametre dizileri sözlüğü
     
-    sos = sps.butter(4, [low_norm, high_norm], btype='band', output='sos')
-    return sps.sosfilt(sos, sig)
+    Buffer sonunu aşan kısımlar kesilir. Olaylar başlangıca göre sıralanıp
+    EVENT_BATCH_SAMPLES sınırlı partiler halinde işlenir (bellek sınırlı).
+    """
+    onsets = np.asarray(onsets, dtype=np.int64)
+    if len(onsets) == 0:
+        return buffer
+    
+    lengths = np.broadcast_to(np.asarray(lengths, dtype=np.int64), onsets.shape)
+    params = {name: np.broadcast_to(np.asarray(value), onsets.shape) for name, value in (params or {}).items()}
+    
+    max_len = int(lengths.max())
+    if max_len <= 0:
+        return buffer
+    
+    # Olay dalga matrisi float32 hesaplanır (SIMD sin/exp ~5x hızlı), toplama float64'te yapılır
+    order = np.argsort(onsets, kind='stable')
+    offsets = np.arange(max_len)
+    t = (offsets / sr).astype(np.float32)[None, :]
+    batch = max(1, EVENT_BATCH_SAMPLES // max_len)
+    
+    for i in range(0, len(order), batch):
+        idx = order[i:i+batch]
+        starts = onsets[idx]
+        waves = waveform(t, {name: value[idx, None].astype(np.float32) for name, value in params.items()})
+        
+        positions = starts[:, None] + offsets[None, :]
+        mask = (offsets[None, :] < lengths[idx, None]) & (positions < len(buffer))
+        
+        lo = int(starts[0])
+        hi = min(len(buffer), int(starts[-1]) + max_len)
+        if hi > lo:
+            # Maskeli hücreler sıfır ağırlıkla son geçerli indekse düşer (boolean sıkıştırmadan hızlı)
+            weights = (waves * mask).ravel()
+            indices = (np.minimum(positions, hi - 1) - lo).ravel()
+            buffer[lo:hi] += np.bincount(indices, weights=weights, minlength=hi - lo)
+    
+    return buffer
+
+
+def add_kernel_events(buffer, onsets, kernel, gains=None):
+    """
+    Aynı dalga şekline sahip olayları ekle: seyrek olaylar doğrudan scatter-add,
+    yoğun olaylar darbe dizisi * kernel konvolüsyonu (overlap-add FFT) ile
+    """
+    onsets = np.asarray(onsets, dtype=np.int64)
+    if len(onsets) == 0 or len(kernel) == 0:
+        return buffer
+    
+    if len(onsets) * len(kernel) < 16 * len(buffer):
+        kernel_row = np.asarray(kernel)[None, :]
+        gains = np.ones(len(onsets)) if gains is None else gains
+        return add_events(buffer, 1.0, onsets, len(kernel), lambda t, p: kernel_row * p["gain"], {"gain": gains})
+    
+    impulses = np.bincount(onsets, weights=gains, minlength=len(buffer))[:len(buffer)]
+    buffer += sps.oaconvolve(impulses, kernel)[:len(buffer)]
+    return buffer
+
+
+def crossfade_loop(segment, loop_samples):
+    """
+    DİKİŞSİZ DÖNGÜ (CROSSFADE)
+    ══════════════════════════════════════════════════════════════════════════════
+    segment: loop_samples + crossfade uzunluğunda sinyal.
+    Döngü = segment[:loop_samples], başındaki crossfade bölgesi segmentin devamıyla
+    (segment[loop_samples:]) eşit güçlü (sin/cos) karıştırılır. Böylece döngü sonu ->
+    başı geçişi, segmentteki ardışık iki örnek (loop_samples-1 -> loop_samples) olur;
+    dikiş noktasında süreksizlik oluşmaz.
+    """
+    fade = min(len(segment) - loop_samples, loop_samples)
+    loop = np.array(segment[:loop_samples])
+    if fade <= 0:
+        return loop
+    
+    ramp = (np.arange(fade) + 0.5) / fade * (np.pi / 2)
+    loop[:fade] = segment[:fade] * np.sin(ramp) + segment[loop_samples:loop_samples + fade] * np.cos(ramp)
+    return loop
+
+
+def loop_blocks(loop, n_samples, block_size, variation=0.0, rng=None):
+    """
+    Döngüyü n_samples uzunluğa kadar blok blok döşe.
+    variation > 0: her tekrar sınırında rastgele genlik noktası, aralar doğrusal
+    enterpolasyon (yavaş varyasyon; değerler mutlak konumdan hesaplanır, blok boyundan bağımsız)
+    """
+    rng = np.random.default_rng(rng)
+    loop_len = len(loop)
+    gains = None
+    if variation > 0:
+        n_loops = -(-n_samples // loop_len)
+        gains = 1.0 + variation * rng.uniform(-1.0, 1.0, n_loops + 1)
+    
+    for start, length in block_ranges(n_samples, block_size):
+        block = np.take(loop, np.arange(start, start + length) % loop_len)
+        if gains is not None:
+            position = np.arange(start, start + length) / loop_len
+            block *= np.interp(position, np.arange(len(gains)), gains).astype(block.dtype)
+        yield block
+
+
+def tile_loop(loop, n_samples, variation=0.0, rng=None):
+    """loop_blocks ile aynı döşemeyi tek dizi olarak üret"""
+    tiled = np.empty(n_samples, dtype=loop.dtype)
+    start = 0
+    for block in loop_blocks(loop, n_samples, BLOCK_SIZE, variation, rng):
+        tiled[start:start + len(block)] = block
+        start += len(block)
+    return tiled
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # BÖLÜM 4: GÜRÜLTÜ ÜRETİCİ FONKSİYONLAR
 # ═══════════════════════════════════════════════════════════════════════════
 
-def generate_white_noise(duration, sr, amplitude=0.5):
-    """Beyaz gürültü: düz spektrum, tüm frekanslarda eşit güç"""
-    n_samples = int(duration * sr)
-    noise = np.random.randn(n_samples)
-    return normalize_signal(noise, amplitude)
+# Renk adı -> spektral eğim alpha (güç yoğunluğu ~ 1/f^alpha)
+NOISE_COLOR_ALPHA = {
+    "white": 0.0,
+    "pink": 1.0,
+    "brown": 2.0,
+    "blue": -1.0,
+    "violet": -2.0
+}
 
+# FFT ile dairesel üretilen renkler (tiling'de dikişsiz)
+CIRCULAR_NOISE_TYPES = {"white", "pink", "brown", "blue", "violet"}
 
-def generate_pink_noise(duration, sr, amplitude=0.5):
-    """Pembe gürültü: 1/f spektrum, düşük frekans ağırlıklı"""
-    n_samples = int(duration * sr)
-    white = np.random.randn(n_samples)
+
+def spectral_shape(freqs, alpha):
+    """
+    1/f^alpha güç eğimi için genlik çarpanı f^(-alpha/2).
+    freqs[0] (DC) 1 kabul edilir; alçak frekans ağırlıklı eğimlerde (alpha > 0)
+    DC değeri ilk binin değerini alır.
+    """
+    shape = np.power(freqs, -alpha / 2)
+    if alpha > 0:
+        shape[0] = shape[1]
+    return shape
+
+
+@profiled("noise_spectrum", "synthesis")
+def generate_colored_noises(colors, duration, sr, amplitude=0.5, rng=None, staged=False):
+    """
+    ÇOK RENKLİ SPEKTRAL GÜRÜLTÜ MOTORU
+    ══════════════════════════════════════════════════════════════════════════════
+    Tek beyaz gürültü çekilir ve tek ileri rfft alınır; her renk bu ortak spektrumun
+    spectral_shape ile çarpılıp irfft edilmesiyle elde edilir. Üç renk = bir ileri FFT
+    + üç ucuz çarpma/ters FFT (üç ayrı beyaz gürültü + FFT hattı yerine).
     
-    # FFT tabanlı 1/f şekillendirme
-    fft = np.fft.rfft(white)
-    freqs = np.fft.rfftfreq(n_samples, 1/sr)
-    freqs[0] = 1.0
+    colors : renk adları (white, pink, brown, blue, violet, gray, green) ya da
+             genel 1/f^alpha için float alpha değerleri
+    Dönüş  : {renk: amplitude'a normalize sinyal}
+    staged : True ise {renk: StagedSignal}; normalizasyon kazancı uygulanmadan
+             döner (karışım toplamına katlanır, ayrı ölçekleme geçişi yok)
     
-    pink_filter = 1.0 / np.sqrt(freqs)
-    pink_filter[0] = pink_filter[1]
+    Dönüşümler scipy.fft ile FFT_WORKERS iş parçacığında yapılır.
+    """
+    rng = np.random.default_rng(rng)
+    n_samples = int(duration * sr)
+    white = rng.standard_normal(n_samples, dtype=render_dtype())
     
-    pink_fft = fft * pink_filter
-    pink = np.fft.irfft(pink_fft, n=n_samples)
+    alphas = {color: (NOISE_COLOR_ALPHA["pink"] if color == "gray" else NOISE_COLOR_ALPHA.get(color, color))
+              for color in colors if color not in ("white", "green")}
+    shaped = {}
     
-    return normalize_signal(pink, amplitude)
+    if alphas:
+        spectrum = spfft.rfft(white, workers=FFT_WORKERS)
+        freqs = spfft.rfftfreq(n_samples, 1/sr).astype(white.dtype)
+        freqs[0] = 1.0
+        scratch = np.empty_like(spectrum)
+        
+        for alpha in set(alphas.values()):
+            np.multiply(spectrum, spectral_shape(freqs, alpha).astype(white.dtype, copy=False), out=scratch)
+            shaped[alpha] = spfft.irfft(scratch, n=n_samples, workers=FFT_WORKERS)
+        del spectrum, scratch
+    
+    noises = {}
+    for color in colors:
+        if color == "white":
+            noises[color] = StagedSignal(white).normalized(amplitude)
+        elif color == "green":
+            # 500Hz civarında gaussian boost
+            center_norm = 500 / (sr / 2)
+            green = white
+            if center_norm < 0.999:
+                sos = design_sos(4, (max(0.001, center_norm - 0.3), min(0.999, center_norm + 0.3)), 'band')
+                green = StatefulFilter(sos).process(white)
+            noises[color] = StagedSignal(green).normalized(amplitude)
+        elif color == "gray":
+            # Equal-loudness kontur yaklaşımı (basitleştirilmiş): pembe + band filtre
+            # (filtre doğrusal: ara normalizasyon son normalizasyona katlanır)
+            gray = StatefulFilter(design_sos(2, (0.1, 0.9), 'band')).process(shaped[alphas[color]])
+            noises[color] = StagedSignal(gray).normalized(amplitude)
+        else:
+            noises[color] = StagedSignal(shaped[alphas[color]]).normalized(amplitude)
+    
+    if staged:
+        return noises
+    # Her örnek dizisi son kullanıcısında yerinde ölçeklenir (pink/1.0, white/green aynı diziyi paylaşabilir)
+    staged_noises = list(noises.items())
+    for index, (color, noise) in enumerate(staged_noises):
+        shared = any(other.samples is noise.samples for _, other in staged_noises[index + 1:])
+        noises[color] = noise.materialize() if shared else noise.materialize(out=noise.samples)
+    return noises
+
+
+def generate_white_noise(duration, sr, amplitude=0.5, rng=None):
+    """Beyaz gürültü: düz spektrum, tüm frekanslarda eşit güç"""
+    return generate_colored_noises(["white"], duration, sr, amplitude, rng)["white"]
 
 
-def generate_brown_noise(duration, sr, amplitude=0.5):
+def generate_pink_noise(duration, sr, amplitude=0.5, rng=None):
+    """Pembe gürültü: 1/f spektrum, düşük frekans ağırlıklı"""
+    return generate_colored_noises(["pink"], duration, sr, amplitude, rng)["pink"]
+
+
+def generate_brown_noise(duration, sr, amplitude=0.5, rng=None):
     """Kahverengi gürültü: 1/f² spektrum, çok düşük frekans dominant"""
-    n_samples = int(duration * sr)
-    white = np.random.randn(n_samples)
-    
-    fft = np.fft.rfft(white)
-    freqs = np.fft.rfftfreq(n_samples, 1/sr)
-    freqs[0] = 1.0
-    
-    brown_filter = 1.0 / freqs
-    brown_filter[0] = brown_filter[1]
-    
-    brown_fft = fft * brown_filter
-    brown = np.fft.irfft(brown_fft, n=n_samples)
-    
-    return normalize_signal(brown, amplitude)
+    return generate_colored_noises(["brown"], duration, sr, amplitude, rng)["brown"]
 
 
-def generate_blue_noise(duration, sr, amplitude=0.5):
+def generate_blue_noise(duration, sr, amplitude=0.5, rng=None):
     """Mavi gürültü: f spektrum, yüksek frekans ağırlıklı"""
-    n_samples = int(duration * sr)
-    white = np.random.randn(n_samples)
-    
-    fft = np.fft.rfft(white)
-    freqs = np.fft.rfftfreq(n_samples, 1/sr)
-    freqs[0] = 1.0
-    
-    blue_filter = np.sqrt(freqs)
-    blue_fft = fft * blue_filter
-    blue = np.fft.irfft(blue_fft, n=n_samples)
-    
-    return normalize_signal(blue, amplitude)
+    return generate_colored_noises(["blue"], duration, sr, amplitude, rng)["blue"]
 
 
-def generate_violet_noise(duration, sr, amplitude=0.5):
+def generate_violet_noise(duration, sr, amplitude=0.5, rng=None):
     """Mor gürültü: f² spektrum, ultra yüksek frekans dominant"""
-    n_samples = int(duration * sr)
-    white = np.random.randn(n_samples)
-    
-    fft = np.fft.rfft(white)
-    freqs = np.fft.rfftfreq(n_samples, 1/sr)
-    freqs[0] = 1.0
-    
-    violet_filter = freqs
-    violet_fft = fft * violet_filter
-    violet = np.fft.irfft(violet_fft, n=n_samples)
-    
-    return normalize_signal(violet, amplitude)
+    return generate_colored_noises(["violet"], duration, sr, amplitude, rng)["violet"]
 
 
-def generate_gray_noise(duration, sr, amplitude=0.5):
+def generate_gray_noise(duration, sr, amplitude=0.5, rng=None):
     """Gri gürültü: psiko-akustik düzleştirilmiş, insan algısına düz"""
-    n_samples = int(duration * sr)
-    pink = generate_pink_noise(duration, sr, 1.0)
-    
-    # Equal-loudness kontur yaklaşımı (basitleştirilmiş)
-    nyquist = sr / 2
-    sos = sps.butter(2, [0.1, 0.9], btype='band', output='sos')
-    gray = sps.sosfilt(sos, pink)
-    
-    return normalize_signal(gray, amplitude)
+    return generate_colored_noises(["gray"], duration, sr, amplitude, rng)["gray"]
 
 
-def generate_green_noise(duration, sr, amplitude=0.5):
+def generate_green_noise(duration, sr, amplitude=0.5, rng=None):
     """Yeşil gürültü: 500Hz merkez gaussian boost"""
-    n_samples = int(duration * sr)
-    white = np.random.randn(n_samples)
-    
-    # 500Hz civarında gaussian boost
-    nyquist = sr / 2
-    center_norm = 500 / nyquist
-    
-    if center_norm < 0.999:
-        sos = sps.butter(4, [max(0.001, center_norm - 0.3), min(0.999, center_norm + 0.3)], btype='band', output='sos')
-        green = sps.sosfilt(sos, white)
-        return normalize_signal(green, amplitude)
-    
-    return normalize_signal(white, amplitude)
-
-
-def generate_noise(noise_type, duration, sr, amplitude=0.5):
-    """Ana gürültü üretim fonksiyonu"""
-    generators = {
-        "white": generate_white_noise,
-        "pink": generate_pink_noise,
-        "brown": generate_brown_noise,
-        "blue": generate_blue_noise,
-        "violet": generate_violet_noise,
-        "gray": generate_gray_noise,
-        "green": generate_green_noise
-    }
-    
-    if noise_type in generators:
-        return generators[noise_type](duration, sr, amplitude)
-    else:
-        return generate_white_noise(duration, sr, amplitude)
+    return generate_colored_noises(["green"], duration, sr, amplitude, rng)["green"]
+
+
+def generate_power_law_noise(alpha, duration, sr, amplitude=0.5, rng=None):
+    """Genel 1/f^alpha gürültü (alpha: 0 beyaz, 1 pembe, 2 kahverengi, -1 mavi, -2 mor)"""
+    return generate_colored_noises([float(alpha)], duration, sr, amplitude, rng)[float(alpha)]
+
+
+def generate_noise(noise_type, duration, sr, amplitude=0.5, rng=None):
+    """Ana gürültü üretim fonksiyonu (bilinmeyen türde beyaz gürültü)"""
+    if noise_type not in NOISE_COLOR_ALPHA and noise_type not in ("gray", "green"):
+        noise_type = "white"
+    return generate_colored_noises([noise_type], duration, sr, amplitude, rng)[noise_type]
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -715,12 +1813,26 @@ drop_freq_variance | Damla frekans dağılımı Hz          | 50-500          |
 impact_sharpness   | Damla vuruş keskinliği             | 0.0-1.0         | 0.6   | Transient sertliği
 """
 
-def sound_blog_rain(duration, sr, amplitude=0.5, naturalness=0.7, nat_params=None):
+def rain_drop_params(n_drops, sr, drop_freq_center, drop_freq_variance, impact_sharpness, rng):
+    """Yağmur damlası olay parametreleri: (uzunluklar, dalga fonksiyonu, parametreler)"""
+    freqs = np.clip(drop_freq_center + rng.standard_normal(n_drops) * drop_freq_variance, 400, 2500)
+    lengths = (sr * 0.02 * (1.0 + rng.random(n_drops))).astype(int)
+    gains = rng.random(n_drops)
+    decay_rate = 20 + impact_sharpness * 30
+    
+    def waveform(t, p):
+        return np.sin(2 * np.pi * p["freq"] * t) * np.exp(-t * decay_rate) * p["gain"]
+    
+    return lengths, waveform, {"freq": freqs, "gain": gains}
+
+
+def sound_blog_rain(duration, sr, amplitude=0.5, naturalness=0.7, nat_params=None, rng=None):
+    rng = np.random.default_rng(rng)
     if nat_params is None:
         nat_params = naturalness_params
     
     n_samples = int(duration * sr)
-    rain = np.zeros(n_samples)
+    rain = np.zeros(n_samples, dtype=render_dtype())
     
     # Yağmur parametreleri
     density = 0.7
@@ -728,33 +1840,20 @@ def sound_blog_rain(duration, sr, amplitude=0.5, naturalness=0.7, nat_params=Non
     drop_freq_variance = 300
     impact_sharpness = 0.6
     
-    # Yağmur damlaları oluştur
+    # Yağmur damlaları oluştur (tüm damlalar tek partide)
     n_drops = int(density * duration * 200)
-    
-    for _ in range(n_drops):
-        pos = np.random.randint(0, n_samples)
-        drop_freq = drop_freq_center + np.random.randn() * drop_freq_variance
-        drop_freq = np.clip(drop_freq, 400, 2500)
-        
-        # Damla envelope
-        drop_len = int(sr * 0.02 * (1.0 + np.random.rand()))
-        drop_len = min(drop_len, n_samples - pos)
-        
-        if drop_len > 0:
-            t_drop = np.arange(drop_len) / sr
-            decay = np.exp(-t_drop * (20 + impact_sharpness * 30))
-            drop_tone = np.sin(2 * np.pi * drop_freq * t_drop) * decay
-            rain[pos:pos+drop_len] += drop_tone * np.random.rand()
+    add_events(rain, sr, rng.integers(0, n_samples, n_drops),
+               *rain_drop_params(n_drops, sr, drop_freq_center, drop_freq_variance, impact_sharpness, rng))
     
     # Arka plan gürültü katmanı
-    background = generate_pink_noise(duration, sr, amplitude * 0.3)
+    background = generate_pink_noise(duration, sr, amplitude * 0.3, rng=rng)
     background = apply_bandpass_filter(background, sr, (400, 2500))
     
-    rain = rain + background
-    rain = normalize_signal(rain, amplitude)
+    rain += background
+    rain = StagedSignal(rain).normalized(amplitude)
     
     # Naturalness uygula
-    rain = apply_naturalness(rain, sr, naturalness, nat_params)
+    rain = apply_naturalness(rain, sr, naturalness, nat_params, rng=rng)
     
     return rain
 
@@ -770,12 +1869,13 @@ decay_time         | Gürültü azalma süresi saniye       | 1.0-5.0         |
 rumble_variation   | Gürültü frekans varyasyonu         | 0.0-1.0         | 0.5   | Pitch değişimi
 """
 
-def sound_blog_thunder(duration, sr, amplitude=0.7, naturalness=0.9, nat_params=None):
+def sound_blog_thunder(duration, sr, amplitude=0.7, naturalness=0.9, nat_params=None, rng=None):
+    rng = np.random.default_rng(rng)
     if nat_params is None:
         nat_params = naturalness_params
     
     n_samples = int(duration * sr)
-    thunder = np.zeros(n_samples)
+    thunder = np.zeros(n_samples, dtype=render_dtype())
     
     # Thunder parametreleri
     rumble_freq = 60
@@ -787,7 +1887,7 @@ def sound_blog_thunder(duration, sr, amplitude=0.7, naturalness=0.9, nat_params=
     n_strikes = int(duration / 5) + 1
     
     for _ in range(n_strikes):
-        strike_pos = np.random.randint(0, max(1, n_samples - int(decay_time * sr)))
+        strike_pos = rng.integers(0, max(1, n_samples - int(decay_time * sr)))
         
         # Strike uzunluğu
         strike_len = int(decay_time * sr)
@@ -796,25 +1896,25 @@ def sound_blog_thunder(duration, sr, amplitude=0.7, naturalness=0.9, nat_params=
         t_strike = np.arange(strike_len) / sr
         
         # Frekans modülasyonu
-        freq_mod = rumble_freq * (1.0 + rumble_variation * np.sin(2 * np.pi * 0.5 * t_strike))
-        phase = np.cumsum(freq_mod) / sr
+        freq_mod = rumble_freq * (1.0 + rumble_variation * sine_wave(0.5, t_strike))
+        phase = np.cumsum(freq_mod, dtype=np.float64) / sr
         
         # Exponential decay envelope
         envelope = np.exp(-t_strike / decay_time) * strike_intensity
         
         # Bas ton + gürültü
-        tone = np.sin(2 * np.pi * phase) * envelope
-        noise = np.random.randn(strike_len) * envelope * 0.3
+        tone = sine_wave(1.0, phase) * envelope
+        noise = rng.standard_normal(strike_len, dtype=render_dtype()) * envelope * 0.3
         
         strike_signal = tone + noise
         thunder[strike_pos:strike_pos+strike_len] += strike_signal
     
     # Düşük frekans filtreleme
     thunder = apply_bandpass_filter(thunder, sr, (20, 120))
-    thunder = normalize_signal(thunder, amplitude)
+    thunder = StagedSignal(thunder).normalized(amplitude)
     
     # Naturalness uygula
-    thunder = apply_naturalness(thunder, sr, naturalness, nat_params)
+    thunder = apply_naturalness(thunder, sr, naturalness, nat_params, rng=rng)
     
     return thunder
 
@@ -830,7 +1930,8 @@ freq_sweep_range   | Frekans süpürme aralığı Hz         | 100-800         |
 modulation_depth   | Modülasyon derinliği               | 0.0-1.0         | 0.7   | Pitch dalgalanma
 """
 
-def sound_blog_wind(duration, sr, amplitude=0.6, naturalness=0.6, nat_params=None):
+def sound_blog_wind(duration, sr, amplitude=0.6, naturalness=0.6, nat_params=None, rng=None):
+    rng = np.random.default_rng(rng)
     if nat_params is None:
         nat_params = naturalness_params
     
@@ -843,20 +1944,20 @@ def sound_blog_wind(duration, sr, amplitude=0.6, naturalness=0.6, nat_params=Non
     modulation_depth = 0.7
     
     # Temel gürültü
-    wind = generate_pink_noise(duration, sr, wind_intensity)
+    wind = generate_pink_noise(duration, sr, wind_intensity, rng=rng)
     
     # Frekans bandı
     wind = apply_bandpass_filter(wind, sr, (100, 800))
     
     # Gust modülasyonu (rüzgar patlamaları)
-    gust_lfo = (1.0 + np.sin(2 * np.pi * gust_frequency * t)) / 2.0
+    gust_lfo = (1.0 + sine_wave(gust_frequency, t)) / 2.0
     gust_env = 0.5 + gust_lfo * modulation_depth * 0.5
     
     wind *= gust_env
-    wind = normalize_signal(wind, amplitude)
+    wind = StagedSignal(wind).normalized(amplitude)
     
     # Naturalness uygula
-    wind = apply_naturalness(wind, sr, naturalness, nat_params)
+    wind = apply_naturalness(wind, sr, naturalness, nat_params, rng=rng)
     
     return wind
 
@@ -872,7 +1973,8 @@ foam_amount        | Köpük miktarı                      | 0.0-1.0         | 0
 tide_variation     | Gel-git varyasyonu                 | 0.0-1.0         | 0.3   | Uzun dönemli değişim
 """
 
-def sound_blog_ocean(duration, sr, amplitude=0.7, naturalness=0.8, nat_params=None):
+def sound_blog_ocean(duration, sr, amplitude=0.7, naturalness=0.8, nat_params=None, rng=None):
+    rng = np.random.default_rng(rng)
     if nat_params is None:
         nat_params = naturalness_params
     
@@ -886,30 +1988,30 @@ def sound_blog_ocean(duration, sr, amplitude=0.7, naturalness=0.8, nat_params=No
     tide_variation = 0.3
     
     # Temel dalga gürültüsü
-    ocean = generate_brown_noise(duration, sr, wave_depth)
+    ocean = generate_brown_noise(duration, sr, wave_depth, rng=rng)
     ocean = apply_bandpass_filter(ocean, sr, (30, 500))
     
     # Dalga envelope (ritmik dalgalanma)
-    wave_envelope = (1.0 + np.sin(2 * np.pi * wave_frequency * t)) / 2.0
+    wave_envelope = (1.0 + sine_wave(wave_frequency, t)) / 2.0
     wave_envelope = 0.6 + wave_envelope * 0.4
     
     # Gel-git modulasyonu (çok yavaş)
-    tide_lfo = np.sin(2 * np.pi * 0.02 * t) * tide_variation
+    tide_lfo = sine_wave(0.02, t) * tide_variation
     wave_envelope *= (1.0 + tide_lfo)
     
     ocean *= wave_envelope
     
     # Köpük katmanı (yüksek frekans)
     if foam_amount > 0:
-        foam = generate_white_noise(duration, sr, foam_amount * 0.3)
+        foam = generate_white_noise(duration, sr, foam_amount * 0.3, rng=rng)
         foam = apply_bandpass_filter(foam, sr, (800, 3000))
         foam *= wave_envelope ** 2
         ocean += foam
     
-    ocean = normalize_signal(ocean, amplitude)
+    ocean = StagedSignal(ocean).normalized(amplitude)
     
     # Naturalness uygula
-    ocean = apply_naturalness(ocean, sr, naturalness, nat_params)
+    ocean = apply_naturalness(ocean, sr, naturalness, nat_params, rng=rng)
     
     return ocean
 
@@ -925,52 +2027,47 @@ flame_roar         | Alev uğultusu miktarı              | 0.0-1.0         | 0.
 ember_glow         | Kor parıltı düşük frekans          | 0.0-1.0         | 0.3   | Düşük frekans vurgu
 """
 
-def sound_blog_fire(duration, sr, amplitude=0.6, naturalness=0.75, nat_params=None):
-    if nat_params is None:
-        nat_params = naturalness_params
+def fire_crackle_params(n_crackles, sr, pop_intensity, rng):
+    """Ateş çıtırtısı olay parametreleri: keskin decay'li gürültü patlamaları"""
+    lengths = (sr * (0.01 + rng.random(n_crackles) * 0.05)).astype(int)
+    decays = 30 + rng.random(n_crackles) * 50
     
-    n_samples = int(duration * sr)
-    fire = np.zeros(n_samples)
+    def waveform(t, p):
+        return rng.standard_normal((len(p["decay"]), t.shape[1]), dtype=np.float32) * np.exp(-t * p["decay"]) * pop_intensity
+    
+    return lengths, waveform, {"decay": decays}
+
+
+def sound_blog_fire(duration, sr, amplitude=0.6, naturalness=0.75, nat_params=None, rng=None):
+    rng = np.random.default_rng(rng)
+    if nat_params is None:
+        nat_params = naturalness_params
+    
+    n_samples = int(duration * sr)
+    fire = np.zeros(n_samples, dtype=render_dtype())
     
     # Fire parametreleri
     crackle_density = 0.6
     pop_intensity = 0.7
     flame_roar = 0.4
     
-    # Crackle/pop olayları
+    # Crackle/pop olayları (tüm çıtırtılar tek partide)
     n_crackles = int(crackle_density * duration * 30)
-    
-    for _ in range(n_crackles):
-        pos = np.random.randint(0, n_samples)
-        
-        # Crackle uzunluğu
-        crackle_len = int(sr * (0.01 + np.random.rand() * 0.05))
-        crackle_len = min(crackle_len, n_samples - pos)
-        
-        if crackle_len > 0:
-            t_crackle = np.arange(crackle_len) / sr
-            
-            # Keskin decay
-            envelope = np.exp(-t_crackle * (30 + np.random.rand() * 50))
-            
-            # Yüksek frekans burst
-            freq = 1500 + np.random.rand() * 3000
-            crackle = np.random.randn(crackle_len) * envelope * pop_intensity
-            
-            fire[pos:pos+crackle_len] += crackle
+    add_events(fire, sr, rng.integers(0, n_samples, n_crackles),
+               *fire_crackle_params(n_crackles, sr, pop_intensity, rng))
     
     # Alev uğultusu arka planı
     if flame_roar > 0:
-        roar = generate_pink_noise(duration, sr, flame_roar * 0.5)
+        roar = generate_pink_noise(duration, sr, flame_roar * 0.5, rng=rng)
         roar = apply_bandpass_filter(roar, sr, (200, 2000))
         fire += roar
     
     # Yüksek frekans filtreleme
     fire = apply_bandpass_filter(fire, sr, (800, 5000))
-    fire = normalize_signal(fire, amplitude)
+    fire = StagedSignal(fire).normalized(amplitude)
     
     # Naturalness uygula
-    fire = apply_naturalness(fire, sr, naturalness, nat_params)
+    fire = apply_naturalness(fire, sr, naturalness, nat_params, rng=rng)
     
     return fire
 
@@ -986,12 +2083,13 @@ pitch_center       | Ton merkez frekansı Hz             | 3000-8000       | 500
 pitch_variation    | Ton varyasyonu Hz                  | 100-1000        | 500   | Cırcır arası fark
 """
 
-def sound_blog_crickets(duration, sr, amplitude=0.5, naturalness=0.85, nat_params=None):
+def sound_blog_crickets(duration, sr, amplitude=0.5, naturalness=0.85, nat_params=None, rng=None):
+    rng = np.random.default_rng(rng)
     if nat_params is None:
         nat_params = naturalness_params
     
     n_samples = int(duration * sr)
-    crickets = np.zeros(n_samples)
+    crickets = np.zeros(n_samples, dtype=render_dtype())
     
     # Cricket parametreleri
     chirp_rate = 3.0
@@ -999,28 +2097,24 @@ def sound_blog_crickets(duration, sr, amplitude=0.5, naturalness=0.85, nat_param
     pitch_center = 5000
     pitch_variation = 500
     
-    # Her cırcır böceği için
+    # Her cırcır böceği için: aynı chirp tonu darbe dizisiyle konvolüsyon
+    chirp_len = int(0.05 * sr)
+    t_chirp = np.arange(chirp_len) / sr
+    envelope = np.sin(np.pi * t_chirp / (chirp_len / sr)) ** 2
+    
     for _ in range(cricket_count):
-        cricket_pitch = pitch_center + (np.random.rand() - 0.5) * pitch_variation * 2
-        chirp_period = sr / chirp_rate * (0.8 + np.random.rand() * 0.4)
+        cricket_pitch = pitch_center + (rng.random() - 0.5) * pitch_variation * 2
+        chirp_period = sr / chirp_rate * (0.8 + rng.random() * 0.4)
         
-        n_chirps = int(duration * chirp_rate * (0.8 + np.random.rand() * 0.4))
-        
-        for _ in range(n_chirps):
-            chirp_pos = np.random.randint(0, max(1, n_samples - int(chirp_period)))
-            chirp_len = int(0.05 * sr)
-            chirp_len = min(chirp_len, n_samples - chirp_pos)
-            
-            if chirp_len > 0:
-                t_chirp = np.arange(chirp_len) / sr
-                envelope = np.sin(np.pi * t_chirp / (chirp_len / sr)) ** 2
-                chirp_tone = np.sin(2 * np.pi * cricket_pitch * t_chirp) * envelope
-                crickets[chirp_pos:chirp_pos+chirp_len] += chirp_tone * 0.3
+        n_chirps = int(duration * chirp_rate * (0.8 + rng.random() * 0.4))
+        chirp_pos = rng.integers(0, max(1, n_samples - int(chirp_period)), n_chirps)
+        chirp_tone = sine_wave(cricket_pitch, t_chirp) * envelope * 0.3
+        add_kernel_events(crickets, chirp_pos, chirp_tone)
     
-    crickets = normalize_signal(crickets, amplitude)
+    crickets = StagedSignal(crickets).normalized(amplitude)
     
     # Naturalness uygula
-    crickets = apply_naturalness(crickets, sr, naturalness, nat_params)
+    crickets = apply_naturalness(crickets, sr, naturalness, nat_params, rng=rng)
     
     return crickets
 
@@ -1036,12 +2130,20 @@ vibration_amount   | Titreşim miktarı                   | 0.0-1.0         | 0.
 road_noise         | Yol gürültüsü seviyesi             | 0.0-1.0         | 0.3   | Arka plan yol sesi
 """
 
-def sound_blog_car(duration, sr, amplitude=0.6, naturalness=0.5, nat_params=None):
+def car_engine_banks(sr, base_freq, harmonic_count, vibration_amount):
+    """Motor harmonikleri (1/h genlikli) ve vibrasyon LFO'su için osilatör bankaları"""
+    harmonics = np.arange(1, harmonic_count + 1)
+    engine = OscillatorBank(sr, base_freq * harmonics, 1.0 / harmonics)
+    vibration = OscillatorBank(sr, 5.0, vibration_amount * 0.1) if vibration_amount > 0 else None
+    return engine, vibration
+
+
+def sound_blog_car(duration, sr, amplitude=0.6, naturalness=0.5, nat_params=None, rng=None):
+    rng = np.random.default_rng(rng)
     if nat_params is None:
         nat_params = naturalness_params
     
     n_samples = int(duration * sr)
-    t = np.arange(n_samples) / sr
     
     # Car parametreleri
     engine_rpm = 1500
@@ -1052,31 +2154,21 @@ def sound_blog_car(duration, sr, amplitude=0.6, naturalness=0.5, nat_params=None
     # Motor temel frekansı (RPM'den Hz'e)
     base_freq = engine_rpm / 60.0
     
-    car = np.zeros(n_samples)
-    
-    # Harmonikler
-    for h in range(1, harmonic_count + 1):
-        harmonic_freq = base_freq * h
-        harmonic_amp = 1.0 / h
-        car += np.sin(2 * np.pi * harmonic_freq * t) * harmonic_amp
-    
-    # Vibrasyon modülasyonu
-    if vibration_amount > 0:
-        vib_lfo = np.sin(2 * np.pi * 5.0 * t) * vibration_amount * 0.1
-        car *= (1.0 + vib_lfo)
+    # Harmonikler (tek osilatör bankası) ve vibrasyon modülasyonu
+    car = render_modulated(*car_engine_banks(sr, base_freq, harmonic_count, vibration_amount), n_samples)
     
     # Yol gürültüsü
     if road_noise > 0:
-        road = generate_pink_noise(duration, sr, road_noise * 0.4)
+        road = generate_pink_noise(duration, sr, road_noise * 0.4, rng=rng)
         road = apply_bandpass_filter(road, sr, (100, 500))
         car += road
     
     # Frekans bandı
     car = apply_bandpass_filter(car, sr, (80, 400))
-    car = normalize_signal(car, amplitude)
+    car = StagedSignal(car).normalized(amplitude)
     
     # Naturalness uygula
-    car = apply_naturalness(car, sr, naturalness, nat_params)
+    car = apply_naturalness(car, sr, naturalness, nat_params, rng=rng)
     
     return car
 
@@ -1092,12 +2184,21 @@ mechanical_clank   | Mekanik şakırtı miktarı            | 0.0-1.0         |
 speed_variation    | Hız varyasyonu                     | 0.0-0.3         | 0.1   | Tempo değişimi
 """
 
-def sound_blog_train(duration, sr, amplitude=0.7, naturalness=0.6, nat_params=None):
+def train_click_params(n_clicks, sr, mechanical_clank, rng):
+    """Tren tekerlek tıkı olay parametreleri: metalik gürültü vuruşları"""
+    def waveform(t, p):
+        return rng.standard_normal((len(p["gain"]), t.shape[1]), dtype=np.float32) * np.exp(-t * 40) * p["gain"]
+    
+    return int(0.05 * sr), waveform, {"gain": np.full(n_clicks, mechanical_clank)}
+
+
+def sound_blog_train(duration, sr, amplitude=0.7, naturalness=0.6, nat_params=None, rng=None):
+    rng = np.random.default_rng(rng)
     if nat_params is None:
         nat_params = naturalness_params
     
     n_samples = int(duration * sr)
-    train = np.zeros(n_samples)
+    train = np.zeros(n_samples, dtype=render_dtype())
     
     # Train parametreleri
     wheel_rhythm = 2.5
@@ -1108,30 +2209,20 @@ def sound_blog_train(duration, sr, amplitude=0.7, naturalness=0.6, nat_params=No
     click_period = sr / wheel_rhythm
     n_clicks = int(duration * wheel_rhythm)
     
-    for i in range(n_clicks):
-        click_pos = int(i * click_period)
-        if click_pos < n_samples:
-            click_len = int(0.05 * sr)
-            click_len = min(click_len, n_samples - click_pos)
-            
-            if click_len > 0:
-                t_click = np.arange(click_len) / sr
-                envelope = np.exp(-t_click * 40)
-                
-                # Metalik ses
-                click = np.random.randn(click_len) * envelope * mechanical_clank
-                train[click_pos:click_pos+click_len] += click
+    click_pos = (np.arange(n_clicks) * click_period).astype(int)
+    click_pos = click_pos[click_pos < n_samples]
+    add_events(train, sr, click_pos, *train_click_params(len(click_pos), sr, mechanical_clank, rng))
     
     # Ray uğultusu (düşük frekans sürekli)
     if rail_rumble > 0:
-        rumble = generate_brown_noise(duration, sr, rail_rumble * 0.6)
+        rumble = generate_brown_noise(duration, sr, rail_rumble * 0.6, rng=rng)
         rumble = apply_bandpass_filter(rumble, sr, (60, 300))
         train += rumble
     
-    train = normalize_signal(train, amplitude)
+    train = StagedSignal(train).normalized(amplitude)
     
     # Naturalness uygula
-    train = apply_naturalness(train, sr, naturalness, nat_params)
+    train = apply_naturalness(train, sr, naturalness, nat_params, rng=rng)
     
     return train
 
@@ -1147,12 +2238,31 @@ dust_noise         | Toz gürültü seviyesi               | 0.0-1.0         | 0
 warmth_amount      | Analog sıcaklık miktarı            | 0.0-1.0         | 0.6   | Düşük frekans vurgu
 """
 
-def sound_blog_vinyl(duration, sr, amplitude=0.4, naturalness=0.7, nat_params=None):
+def vinyl_crackle_params(n_crackles, sr, rng):
+    """Vinil küçük çıtırtı olay parametreleri"""
+    lengths = (sr * 0.002 * (1 + rng.random(n_crackles))).astype(int)
+    
+    def waveform(t, p):
+        return rng.standard_normal((len(p["gain"]), t.shape[1]), dtype=np.float32) * p["gain"]
+    
+    return lengths, waveform, {"gain": np.full(n_crackles, 0.3)}
+
+
+def vinyl_pop_params(n_pops, sr, rng):
+    """Vinil büyük pop olay parametreleri"""
+    def waveform(t, p):
+        return rng.standard_normal((len(p["gain"]), t.shape[1]), dtype=np.float32) * np.exp(-t * 100) * p["gain"]
+    
+    return int(sr * 0.01), waveform, {"gain": np.full(n_pops, 2.0)}
+
+
+def sound_blog_vinyl(duration, sr, amplitude=0.4, naturalness=0.7, nat_params=None, rng=None):
+    rng = np.random.default_rng(rng)
     if nat_params is None:
         nat_params = naturalness_params
     
     n_samples = int(duration * sr)
-    vinyl = np.zeros(n_samples)
+    vinyl = np.zeros(n_samples, dtype=render_dtype())
     
     # Vinyl parametreleri
     crackle_density = 0.5
@@ -1161,41 +2271,23 @@ def sound_blog_vinyl(duration, sr, amplitude=0.4, naturalness=0.7, nat_params=No
     
     # Küçük crackle'lar (sürekli)
     n_crackles = int(crackle_density * duration * 100)
-    
-    for _ in range(n_crackles):
-        pos = np.random.randint(0, n_samples)
-        crackle_len = int(sr * 0.002 * (1 + np.random.rand()))
-        crackle_len = min(crackle_len, n_samples - pos)
-        
-        if crackle_len > 0:
-            crackle = np.random.randn(crackle_len) * 0.3
-            vinyl[pos:pos+crackle_len] += crackle
+    add_events(vinyl, sr, rng.integers(0, n_samples, n_crackles), *vinyl_crackle_params(n_crackles, sr, rng))
     
     # Büyük pop'lar (seyrek)
     n_pops = int(pop_frequency * duration)
-    
-    for _ in range(n_pops):
-        pos = np.random.randint(0, n_samples)
-        pop_len = int(sr * 0.01)
-        pop_len = min(pop_len, n_samples - pos)
-        
-        if pop_len > 0:
-            t_pop = np.arange(pop_len) / sr
-            envelope = np.exp(-t_pop * 100)
-            pop = np.random.randn(pop_len) * envelope * 2.0
-            vinyl[pos:pos+pop_len] += pop
+    add_events(vinyl, sr, rng.integers(0, n_samples, n_pops), *vinyl_pop_params(n_pops, sr, rng))
     
     # Toz gürültüsü (sürekli düşük seviye)
     if dust_noise > 0:
-        dust = generate_pink_noise(duration, sr, dust_noise * 0.2)
+        dust = generate_pink_noise(duration, sr, dust_noise * 0.2, rng=rng)
         vinyl += dust
     
     # Frekans bandı
     vinyl = apply_bandpass_filter(vinyl, sr, (200, 4000))
-    vinyl = normalize_signal(vinyl, amplitude)
+    vinyl = StagedSignal(vinyl).normalized(amplitude)
     
     # Naturalness uygula
-    vinyl = apply_naturalness(vinyl, sr, naturalness, nat_params)
+    vinyl = apply_naturalness(vinyl, sr, naturalness, nat_params, rng=rng)
     
     return vinyl
 
@@ -1215,33 +2307,33 @@ beat_frequency     | Binaural beat frekansı Hz          | 0.0-4.0         | 1.5
 mode               | Mod: tone veya boost               | tone/boost      | tone  | Ton üret veya filtre
 """
 
-def brainwave_blog_delta(duration, sr, amplitude=0.3, mode="tone"):
+def brainwave_banks(sr, center_frequency, mod_rate, modulation_depth):
+    """Beyin dalgası taşıyıcısı ve genlik LFO'su için osilatör bankaları"""
+    lfo = OscillatorBank(sr, mod_rate, modulation_depth) if modulation_depth > 0 else None
+    return OscillatorBank(sr, center_frequency), lfo
+
+
+def brainwave_blog_delta(duration, sr, amplitude=0.3, mode="tone", rng=None):
+    rng = np.random.default_rng(rng)
     n_samples = int(duration * sr)
-    t = np.arange(n_samples) / sr
     
     center_frequency = 2.0
     modulation_depth = 0.3
     beat_frequency = 1.5
     
     if mode == "tone":
-        # Saf delta ton üretimi
-        delta = np.sin(2 * np.pi * center_frequency * t)
-        
-        # Hafif modülasyon
-        if modulation_depth > 0:
-            mod = np.sin(2 * np.pi * 0.1 * t) * modulation_depth
-            delta *= (1.0 + mod)
-        
-        delta = normalize_signal(delta, amplitude)
+        # Saf delta ton üretimi (hafif genlik modülasyonuyla)
+        delta = render_modulated(*brainwave_banks(sr, center_frequency, 0.1, modulation_depth), n_samples)
+        delta = normalize_signal(delta, amplitude, out=delta)
         return delta
     
     elif mode == "boost":
         # Delta bandını boost et (mevcut sinyale uygulanır)
-        noise = generate_pink_noise(duration, sr, amplitude)
+        noise = generate_pink_noise(duration, sr, amplitude, rng=rng)
         delta_filtered = apply_bandpass_filter(noise, sr, (0.5, 4.0))
         return delta_filtered
     
-    return np.zeros(n_samples)
+    return np.zeros(n_samples, dtype=render_dtype())
 
 
 """
@@ -1255,29 +2347,25 @@ beat_frequency     | Binaural beat frekansı Hz          | 0.0-4.0         | 2.0
 mode               | Mod: tone veya boost               | tone/boost      | tone  | Ton üret veya filtre
 """
 
-def brainwave_blog_theta(duration, sr, amplitude=0.3, mode="tone"):
+def brainwave_blog_theta(duration, sr, amplitude=0.3, mode="tone", rng=None):
+    rng = np.random.default_rng(rng)
     n_samples = int(duration * sr)
-    t = np.arange(n_samples) / sr
     
     center_frequency = 6.0
     modulation_depth = 0.3
     
     if mode == "tone":
-        theta = np.sin(2 * np.pi * center_frequency * t)
+        theta = render_modulated(*brainwave_banks(sr, center_frequency, 0.15, modulation_depth), n_samples)
         
-        if modulation_depth > 0:
-            mod = np.sin(2 * np.pi * 0.15 * t) * modulation_depth
-            theta *= (1.0 + mod)
-        
-        theta = normalize_signal(theta, amplitude)
+        theta = normalize_signal(theta, amplitude, out=theta)
         return theta
     
     elif mode == "boost":
-        noise = generate_pink_noise(duration, sr, amplitude)
+        noise = generate_pink_noise(duration, sr, amplitude, rng=rng)
         theta_filtered = apply_bandpass_filter(noise, sr, (4.0, 8.0))
         return theta_filtered
     
-    return np.zeros(n_samples)
+    return np.zeros(n_samples, dtype=render_dtype())
 
 
 """
@@ -1291,29 +2379,25 @@ beat_frequency     | Binaural beat frekansı Hz          | 0.0-4.0         | 2.5
 mode               | Mod: tone veya boost               | tone/boost      | tone  | Ton üret veya filtre
 """
 
-def brainwave_blog_alpha(duration, sr, amplitude=0.4, mode="tone"):
+def brainwave_blog_alpha(duration, sr, amplitude=0.4, mode="tone", rng=None):
+    rng = np.random.default_rng(rng)
     n_samples = int(duration * sr)
-    t = np.arange(n_samples) / sr
     
     center_frequency = 10.0
     modulation_depth = 0.3
     
     if mode == "tone":
-        alpha = np.sin(2 * np.pi * center_frequency * t)
+        alpha = render_modulated(*brainwave_banks(sr, center_frequency, 0.2, modulation_depth), n_samples)
         
-        if modulation_depth > 0:
-            mod = np.sin(2 * np.pi * 0.2 * t) * modulation_depth
-            alpha *= (1.0 + mod)
-        
-        alpha = normalize_signal(alpha, amplitude)
+        alpha = normalize_signal(alpha, amplitude, out=alpha)
         return alpha
     
     elif mode == "boost":
-        noise = generate_pink_noise(duration, sr, amplitude)
+        noise = generate_pink_noise(duration, sr, amplitude, rng=rng)
         alpha_filtered = apply_bandpass_filter(noise, sr, (8.0, 13.0))
         return alpha_filtered
     
-    return np.zeros(n_samples)
+    return np.zeros(n_samples, dtype=render_dtype())
 
 
 """
@@ -1327,29 +2411,25 @@ beat_frequency     | Binaural beat frekansı Hz          | 0.0-4.0         | 3.0
 mode               | Mod: tone veya boost               | tone/boost      | tone  | Ton üret veya filtre
 """
 
-def brainwave_blog_beta(duration, sr, amplitude=0.3, mode="tone"):
+def brainwave_blog_beta(duration, sr, amplitude=0.3, mode="tone", rng=None):
+    rng = np.random.default_rng(rng)
     n_samples = int(duration * sr)
-    t = np.arange(n_samples) / sr
     
     center_frequency = 20.0
     modulation_depth = 0.3
     
     if mode == "tone":
-        beta = np.sin(2 * np.pi * center_frequency * t)
+        beta = render_modulated(*brainwave_banks(sr, center_frequency, 0.25, modulation_depth), n_samples)
         
-        if modulation_depth > 0:
-            mod = np.sin(2 * np.pi * 0.25 * t) * modulation_depth
-            beta *= (1.0 + mod)
-        
-        beta = normalize_signal(beta, amplitude)
+        beta = normalize_signal(beta, amplitude, out=beta)
         return beta
     
     elif mode == "boost":
-        noise = generate_pink_noise(duration, sr, amplitude)
+        noise = generate_pink_noise(duration, sr, amplitude, rng=rng)
         beta_filtered = apply_bandpass_filter(noise, sr, (13.0, 30.0))
         return beta_filtered
     
-    return np.zeros(n_samples)
+    return np.zeros(n_samples, dtype=render_dtype())
 
 
 """
@@ -1363,331 +2443,3587 @@ beat_frequency     | Binaural beat frekansı Hz          | 0.0-4.0         | 3.5
 mode               | Mod: tone veya boost               | tone/boost      | tone  | Ton üret veya filtre
 """
 
-def brainwave_blog_gamma(duration, sr, amplitude=0.2, mode="tone"):
+def brainwave_blog_gamma(duration, sr, amplitude=0.2, mode="tone", rng=None):
+    rng = np.random.default_rng(rng)
     n_samples = int(duration * sr)
-    t = np.arange(n_samples) / sr
     
     center_frequency = 40.0
     modulation_depth = 0.3
     
     if mode == "tone":
-        gamma = np.sin(2 * np.pi * center_frequency * t)
+        gamma = render_modulated(*brainwave_banks(sr, center_frequency, 0.3, modulation_depth), n_samples)
         
-        if modulation_depth > 0:
-            mod = np.sin(2 * np.pi * 0.3 * t) * modulation_depth
-            gamma *= (1.0 + mod)
-        
-        gamma = normalize_signal(gamma, amplitude)
+        gamma = normalize_signal(gamma, amplitude, out=gamma)
         return gamma
     
     elif mode == "boost":
-        noise = generate_pink_noise(duration, sr, amplitude)
+        noise = generate_pink_noise(duration, sr, amplitude, rng=rng)
         gamma_filtered = apply_bandpass_filter(noise, sr, (30.0, 100.0))
         return gamma_filtered
     
-    return np.zeros(n_samples)
+    return np.zeros(n_samples, dtype=render_dtype())
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # BÖLÜM 7: FREKANS İŞLEMLERİ
 # ═══════════════════════════════════════════════════════════════════════════
 
+def frequency_op_sos(freq, q_factor, sr, order, btype):
+    """Frekans işlemi için Q tabanlı SOS katsayıları (geçersiz frekansta None)"""
+    nyquist = sr / 2
+    freq_norm = freq / nyquist
+    
+    if not 0.001 < freq_norm < 0.999:
+        return None
+    
+    bandwidth = freq_norm / q_factor
+    low_freq = max(0.001, freq_norm - bandwidth / 2)
+    high_freq = min(0.999, freq_norm + bandwidth / 2)
+    
+    return design_sos(order, (low_freq, high_freq), btype)
+
+
+def operation_sos(op, sr):
+    """
+    Tek filtre işleminin SOS bölümleri (geçersiz frekansta None).
+    boost'un paralel yapısı (x + g·B(x)) tek transfer fonksiyonuna katlanır:
+    H = (a + g·b) / a; kutuplar B'ninkilerdir, sıfırlar a + g·b'nin kökleridir.
+    """
+    order, btype, default_q = FILTER_OPERATIONS[op["operation"]]
+    sos = frequency_op_sos(op["freq"], op.get("q_factor", default_q), sr, order, btype)
+    if sos is None or op["operation"] != "boost":
+        return sos
+    
+    gain = 10 ** (op.get("gain_db", 6.0) / 20.0) - 1.0
+    b, a = sps.sos2tf(sos)
+    _, poles, _ = sps.sos2zpk(sos)
+    numerator = a + gain * b
+    return sps.zpk2sos(np.roots(numerator), poles, numerator[0] / a[0])
+
+
+class CompiledEQ:
+    """
+    DERLENMİŞ FREKANS İŞLEMLERİ
+    ══════════════════════════════════════════════════════════════════════════════
+    specific_frequencies listesi sample rate başına bir kez derlenir:
+    
+    Bileşen   | İçerik                                   | Maliyet
+    ──────────────────────────────────────────────────────────────────────────────
+    sos       | Tüm boost/notch/bandpass bölümleri tek   | Tek sosfilt geçişi
+              | kaskatta (LTI: sıra sonucu değiştirmez)  | (işlem başına değil)
+    tones     | synth_tone/additive partial'ları         | Tek osilatör bankası
+    
+    Bir tonun ardından gelen filtreler, tonun genlik ve fazına o frekanstaki
+    kararlı durum yanıtı (|H|, ∠H) olarak katlanır: ton filtreden geçirilmez,
+    yalnızca filtrenin açılış geçici yanıtı (ilk birkaç ms) farklılaşır.
+    """
+    
+    def __init__(self, operations, sr):
+        sections = []
+        tones = []  # (frekans, genlik, ardından gelen filtre bölümleri başlangıcı)
+        for op in operations:
+            if op["operation"] in FILTER_OPERATIONS:
+                sos = operation_sos(op, sr)
+                if sos is not None:
+                    sections.append(sos)
+            elif op["operation"] in TONE_OPERATIONS:
+                tones.append((op["freq"], op.get("amplitude", TONE_OPERATIONS[op["operation"]]), len(sections)))
+        
+        self.sr = sr
+        self.sos = np.concatenate(sections) if sections else None
+        self.freqs = np.array([freq for freq, _, _ in tones], dtype=np.float64)
+        self.amps = np.empty(len(tones))
+        self.phases = np.empty(len(tones))
+        for i, (freq, amplitude, first) in enumerate(tones):
+            response = 1.0
+            if first < len(sections):
+                _, h = sps.sosfreqz(np.concatenate(sections[first:]), worN=[freq], fs=sr)
+                response = h[0]
+            self.amps[i] = amplitude * abs(response)
+            self.phases[i] = np.angle(response)
+        for array in (self.freqs, self.amps, self.phases):
+            array.flags.writeable = False
+        if self.sos is not None:
+            self.sos.flags.writeable = False
+    
+    def filter(self):
+        """Kaskat için yeni durumlu filtre (sos yoksa None)"""
+        return StatefulFilter(self.sos) if self.sos is not None else None
+    
+    def oscillators(self):
+        """Ton partial'ları için yeni osilatör bankası (ton yoksa None)"""
+        return OscillatorBank(self.sr, self.freqs, self.amps, self.phases) if len(self.freqs) else None
+
+
+def _operations_key(operations):
+    """İşlem listesinin önbellek anahtarı (sözlükler hashlenebilir değil)"""
+    return tuple(tuple(sorted(op.items())) for op in operations)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_cached(key, sr):
+    return CompiledEQ([dict(op) for op in key], sr)
+
+
+def compile_frequency_operations(operations, sr):
+    """specific_frequencies → CompiledEQ, (işlemler, sr) başına LRU önbellekli (paylaşılır)"""
+    return _compile_cached(_operations_key(operations), sr)
+
+
 def apply_frequency_operations(signal_input, sr, operations):
     """
     Spesifik frekans işlemlerini uygula
     operations: specific_frequencies listesi
     """
-    signal_output = signal_input.copy()
-    
-    for op in operations:
-        freq = op["freq"]
-        operation = op["operation"]
-        
-        if operation == "boost":
-            q_factor = op.get("q_factor", 2.0)
-            gain_db = op.get("gain_db", 6.0)
-            
-            nyquist = sr / 2
-            freq_norm = freq / nyquist
-            
-            if 0.001 < freq_norm < 0.999:
-                bandwidth = freq_norm / q_factor
-                low_freq = max(0.001, freq_norm - bandwidth / 2)
-                high_freq = min(0.999, freq_norm + bandwidth / 2)
-                
-                sos = sps.butter(2, [low_freq, high_freq], btype='band', output='sos')
-                boosted = sps.sosfilt(sos, signal_output)
-                
-                gain_linear = 10 ** (gain_db / 20.0)
-                signal_output = signal_output + boosted * (gain_linear - 1.0)
-        
-        elif operation == "notch":
-            q_factor = op.get("q_factor", 5.0)
-            gain_db = op.get("gain_db", -20.0)
-            
-            nyquist = sr / 2
-            freq_norm = freq / nyquist
-            
-            if 0.001 < freq_norm < 0.999:
-                bandwidth = freq_norm / q_factor
-                low_freq = max(0.001, freq_norm - bandwidth / 2)
-                high_freq = min(0.999, freq_norm + bandwidth / 2)
-                
-                sos = sps.butter(2, [low_freq, high_freq], btype='bandstop', output='sos')
-                signal_output = sps.sosfilt(sos, signal_output)
-        
-        elif operation == "bandpass":
-            q_factor = op.get("q_factor", 1.5)
-            
-            nyquist = sr / 2
-            freq_norm = freq / nyquist
-            
-            if 0.001 < freq_norm < 0.999:
-                bandwidth = freq_norm / q_factor
-                low_freq = max(0.001, freq_norm - bandwidth / 2)
-                high_freq = min(0.999, freq_norm + bandwidth / 2)
-                
-                sos = sps.butter(4, [low_freq, high_freq], btype='band', output='sos')
-                signal_output = sps.sosfilt(sos, signal_output)
-        
-        elif operation == "synth_tone":
-            tone_amplitude = op.get("amplitude", 0.1)
-            t = np.arange(len(signal_output)) / sr
-            tone = np.sin(2 * np.pi * freq * t) * tone_amplitude
-            signal_output += tone
-        
-        elif operation == "additive":
-            add_amplitude = op.get("amplitude", 0.05)
-            t = np.arange(len(signal_output)) / sr
-            additive = np.sin(2 * np.pi * freq * t) * add_amplitude
-            signal_output += additive
-    
-    return normalize_signal(signal_output, np.max(np.abs(signal_input)))
+    # Filtre yeni dizi döndürür; girişin kopyası yalnızca filtre yoksa gerekir
+    has_filter = compile_frequency_operations(operations, sr).sos is not None
+    source = signal_input if has_filter else signal_input.copy()
+    signal_output = frequency_operations_inplace(source, sr, operations)
+    return normalize_signal(signal_output, peak_abs(signal_input), out=signal_output)
 
 
-# ═══════════════════════════════════════════════════════════════════════════
-# BÖLÜM 8: KARIŞTIRMA SİSTEMİ (MIX BLOG)
-# ═══════════════════════════════════════════════════════════════════════════
+# Ton ekleyen işlemler ve varsayılan genlikleri
+TONE_OPERATIONS = {"synth_tone": 0.1, "additive": 0.05}
+
 
-def mix_blogs(duration, sr, mix_config, noise_mix_config, brainwave_cfg, nat_params):
+@profiled("frequency_ops")
+def frequency_operations_inplace(signal_output, sr, operations):
     """
-    Tüm aktif blogları karıştır ve final sinyali oluştur
+    apply_frequency_operations çekirdeği: kopya ve normalizasyon olmadan.
+    İşlem listesi tek SOS kaskatına ve tek osilatör bankasına derlenir (CompiledEQ):
+    işlem sayısından bağımsız olarak bir filtre geçişi ve bir ton toplaması yapılır.
+    Filtre yeni dizi döndürür; filtre yoksa tonlar signal_output'a yerinde eklenir.
+    Sonucu zaten normalize edilecek karışımlar (mix_blogs) bunu doğrudan kullanır.
     """
-    mixed_signal = np.zeros(int(duration * sr))
-    
-    print("=" * 70)
-    print("MIX BLOG BAŞLATILIYOR")
-    print("=" * 70)
-    
-    # Natural sounds karıştır
-    if ENABLE_NATURAL_SOUNDS:
-        for sound_name, config in noise_mix_config.items():
-            if config["enabled"]:
-                print(f"Üretiliyor: {sound_name} (weight={config['weight']:.2f}, naturalness={config['naturalness']:.2f})")
-                
-                if sound_name == "rain":
-                    blog_signal = sound_blog_rain(duration, sr, config['weight'], config['naturalness'], nat_params)
-                elif sound_name == "thunder":
-                    blog_signal = sound_blog_thunder(duration, sr, config['weight'], config['naturalness'], nat_params)
-                elif sound_name == "wind":
-                    blog_signal = sound_blog_wind(duration, sr, config['weight'], config['naturalness'], nat_params)
-                elif sound_name == "ocean":
-                    blog_signal = sound_blog_ocean(duration, sr, config['weight'], config['naturalness'], nat_params)
-                elif sound_name == "fire":
-                    blog_signal = sound_blog_fire(duration, sr, config['weight'], config['naturalness'], nat_params)
-                elif sound_name == "crickets":
-                    blog_signal = sound_blog_crickets(duration, sr, config['weight'], config['naturalness'], nat_params)
-                elif sound_name == "car":
-                    blog_signal = sound_blog_car(duration, sr, config['weight'], config['naturalness'], nat_params)
-                elif sound_name == "train":
-                    blog_signal = sound_blog_train(duration, sr, config['weight'], config['naturalness'], nat_params)
-                elif sound_name == "vinyl":
-                    blog_signal = sound_blog_vinyl(duration, sr, config['weight'], config['naturalness'], nat_params)
-                else:
-                    continue
-                
-                # Frekans bandı uygula
-                blog_signal = apply_bandpass_filter(blog_signal, sr, config['freq_range'])
-                
-                mixed_signal += blog_signal * config['weight']
-    
-    # Technical noise ekle
-    if ENABLE_NOISE_GENERATOR:
-        for noise_type, enabled in noise_types.items():
-            if enabled:
-                print(f"Üretiliyor: {noise_type} noise (amplitude=0.3)")
-                noise_signal = generate_noise(noise_type, duration, sr, 0.3)
-                mixed_signal += noise_signal * 0.2
-    
-    # Brainwave ekle
-    for wave_name, config in brainwave_cfg.items():
-        if config["enabled"]:
-            print(f"Üretiliyor: {wave_name} brainwave (freq={config['center_freq']}Hz, amp={config['amplitude']:.2f})")
-            
-            if wave_name == "delta":
-                wave_signal = brainwave_blog_delta(duration, sr, config['amplitude'], config['mode'])
-            elif wave_name == "theta":
-                wave_signal = brainwave_blog_theta(duration, sr, config['amplitude'], config['mode'])
-            elif wave_name == "alpha":
-                wave_signal = brainwave_blog_alpha(duration, sr, config['amplitude'], config['mode'])
-            elif wave_name == "beta":
-                wave_signal = brainwave_blog_beta(duration, sr, config['amplitude'], config['mode'])
-            elif wave_name == "gamma":
-                wave_signal = brainwave_blog_gamma(duration, sr, config['amplitude'], config['mode'])
-            else:
-                continue
-            
-            mixed_signal += wave_signal
+    eq = compile_frequency_operations(operations, sr)
     
-    # Frekans işlemleri uygula
-    if ENABLE_FREQUENCY_FILTERS and len(specific_frequencies) > 0:
-        print(f"Frekans işlemleri uygulanıyor: {len(specific_frequencies)} işlem")
-        mixed_signal = apply_frequency_operations(mixed_signal, sr, specific_frequencies)
+    eq_filter = eq.filter()
+    if eq_filter is not None:
+        with profile_stage("frequency_op:eq", sections=len(eq.sos)):
+            signal_output = eq_filter.process(signal_output)
     
-    # Final normalizasyon
-    mixed_signal = normalize_signal(mixed_signal, MASTER_AMPLITUDE)
-    
-    print("=" * 70)
-    print(f"MIX TAMAMLANDI: {duration}s, {sr}Hz")
-    print("=" * 70)
+    oscillators = eq.oscillators()
+    if oscillators is not None:
+        with profile_stage("frequency_op:oscillator_bank", partials=len(eq.freqs)):
+            signal_output += as_channels(oscillators.render(len(signal_output)), signal_output)
     
-    return mixed_signal
+    return signal_output
 
 
 # ═══════════════════════════════════════════════════════════════════════════
-# BÖLÜM 9: GÖRSELLEŞTİRME
+# BÖLÜM 8: REVERB (BÖLÜMLENMİŞ FFT KONVOLÜSYONU)
 # ═══════════════════════════════════════════════════════════════════════════
 
-def visualize_signal(signal_data, sr, title="Audio Signal"):
-    """Dalga formu ve spektrum görselleştirme"""
-    if not ENABLE_VISUALIZER:
-        return
-    
-    fig, axes = plt.subplots(2, 1, figsize=(8, 4))
-    
-    # Dalga formu
-    time_axis = np.arange(len(signal_data)) / sr
-    sample_points = min(len(signal_data), sr * 5)
-    
-    axes[0].plot(time_axis[:sample_points], signal_data[:sample_points], linewidth=0.5)
-    axes[0].set_title(f"{title} - Dalga Formu")
-    axes[0].set_xlabel("Zaman (s)")
-    axes[0].set_ylabel("Genlik")
-    axes[0].grid(True, alpha=0.3)
-    
-    # Spektrum
-    fft_data = np.fft.rfft(signal_data)
-    fft_freqs = np.fft.rfftfreq(len(signal_data), 1/sr)
-    fft_magnitude = np.abs(fft_data)
-    
-    axes[1].plot(fft_freqs, 20 * np.log10(fft_magnitude + 1e-10), linewidth=0.5)
-    axes[1].set_title(f"{title} - Frekans Spektrumu")
-    axes[1].set_xlabel("Frekans (Hz)")
-    axes[1].set_ylabel("Güç (dB)")
-    axes[1].set_xlim([20, sr/2])
-    axes[1].grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    plt.show()
+"""
+KONVOLÜSYON REVERB
+══════════════════════════════════════════════════════════════════════════════
+Dürtü yanıtı (IR) REVERB_PARTITION örneklik eşit parçalara bölünür; her parçanın
+spektrumu bir kez hesaplanır. Giriş aynı boyutta parçalar halinde overlap-save
+ile dönüştürülür ve frekans alanı gecikme hattında (FDL) parça spektrumlarıyla
+çarpılıp toplanır:
 
+  Y_j = Σ_p H_p · X_(j-p)      p = 0..P-1, P = ⌈len(IR) / parça⌉
 
-# ═══════════════════════════════════════════════════════════════════════════
-# BÖLÜM 10: DOSYA ÇIKTISI
-# ═══════════════════════════════════════════════════════════════════════════
+Özellik           | Değer
+──────────────────────────────────────────────────────────────────────────────
+Gecikme           | 0 örnek: eksik son parça sıfırla tamamlanıp hesaplanır,
+                  | sonraki blokta tamamlanınca yeniden hesaplanır (nedensel)
+Blok başına FFT   | Parça başına bir rfft + bir irfft (IR uzunluğundan bağımsız)
+Spektral çarpım   | Parça başına P karmaşık çarpım-toplam (örnek başına ≈ P)
+Bellek            | P × (parça + 1) karmaşık spektrum (IR ve FDL), sinyalden bağımsız
+Sonuç             | Tam doğrusal konvolüsyonla aynı (yuvarlama hatası düzeyinde)
 
-def export_audio(sig, sr, stereo=True):
-    """WAV dosyası olarak output klasörüne kaydet, dosya ismi timestamp'e göre"""
-    if not ENABLE_FILE_EXPORT:
-        return
-    
-    # Sadece output klasörü
-    output_dir = "output"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Dosya ismini timestamp ile oluştur
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"audio_dsp_output_{timestamp}.wav"
-    filepath = os.path.join(output_dir, filename)
-    
-    # Stereo çıkış oluştur
-    if stereo and sig.ndim == 1:
-        stereo_signal = np.stack([sig, sig], axis=1)
-    elif not stereo and sig.ndim == 2:
-        stereo_signal = np.mean(sig, axis=1)
+IR kaynağı: REVERB_IR_FILE (ses dosyası; mono'ya indirilir, sr'ye yeniden
+örneklenir) ya da REVERB_DECAY_SECONDS sürede -60 dB'e sönen prosedürel gürültü.
+IR birim enerjiye ölçeklenir; çıkış = (1 - wet)·kuru + wet·reverb.
+
+Kullanım yeri      | Ayar                         | Uygulama
+──────────────────────────────────────────────────────────────────────────────
+Master             | REVERB_MASTER                | Frekans işlemlerinden sonra,
+                   |                              | master normalizasyon/limiter önce
+Katman             | REVERB_LAYERS {anahtar: wet} | Katman stem'ine (önbelleğe girer)
+"""
+
+# Reverb uygulanan katmanlar: katman anahtarı → wet oranı (örn. {"natural:rain": 0.3})
+REVERB_LAYERS = {}
+
+# Prosedürel IR gürültü tohumu (aynı oda her render'da aynı)
+REVERB_IR_SEED = 1
+
+
+def reverb_spec(target, wet=None):
+    """
+    Reverb ayarları (picklable; katman ve loudness önbellek anahtarlarına girer).
+    target: "master" ya da katman anahtarı; kapalıysa None.
+    """
+    if target == "master":
+        if not REVERB_MASTER:
+            return None
+        wet = REVERB_WET if wet is None else wet
+    elif target in REVERB_LAYERS:
+        wet = REVERB_LAYERS[target]
     else:
-        stereo_signal = sig
-    
-    # Normalize ve float32'ye dönüştür
-    stereo_signal = np.clip(stereo_signal, -1.0, 1.0).astype(np.float32)
-    
-    # Kaydet
-    sf.write(filepath, stereo_signal, sr)
+        return None
+    return {"ir": REVERB_IR_FILE, "decay": REVERB_DECAY_SECONDS, "wet": wet, "partition": REVERB_PARTITION}
+
+
+@functools.lru_cache(maxsize=8)
+def reverb_ir(source, decay, sr):
+    """
+    Birim enerjili dürtü yanıtı (float64, salt-okunur).
+    source: IR ses dosyası yolu ya da None (prosedürel sönümlü gürültü)
+    """
+    if source is not None:
+        ir, file_sr = sf.read(source, dtype="float64", always_2d=True)
+        ir = ir.mean(axis=1)
+        if file_sr != sr:
+            ratio = np.gcd(int(file_sr), int(sr))
+            ir = sps.resample_poly(ir, int(sr) // ratio, int(file_sr) // ratio)
+    else:
+        n = max(1, int(decay * sr))
+        rng = np.random.default_rng(REVERB_IR_SEED)
+        # RT60: decay saniyede -60 dB (ln(1000) ≈ 6.91)
+        envelope = np.exp(-np.log(1000.0) * sample_ramp(n) / (decay * sr))
+        ir = rng.standard_normal(n) * envelope
+    
+    energy = np.sqrt(np.sum(ir ** 2))
+    if energy > 0:
+        ir = ir / energy
+    ir.flags.writeable = False
+    return ir
+
+
+class PartitionedConvolver:
+    """
+    Eşit bölümlenmiş overlap-save FFT konvolüsyonu, durumu bloklar arasında taşır.
+    process() her uzunlukta blok kabul eder ve aynı uzunlukta (gecikmesiz) çıktı
+    döndürür; parça parça işlenen çıktı tüm sinyalin konvolüsyonuyla aynıdır.
+    """
     
-    print(f"\n{'='*70}")
-    print(f"SES DOSYASI KAYDEDILDI: {filepath}")
-    print(f"Format: {'Stereo' if stereo else 'Mono'}, {sr}Hz, {len(sig)/sr:.2f}s")
-    print(f"{'='*70}\n")
+    def __init__(self, ir, partition=None):
+        self.partition = int(partition or REVERB_PARTITION)
+        self.ir = np.asarray(ir, dtype=np.float64)
+        self.reset()
+    
+    def reset(self):
+        """Gecikme hattını ve bekleyen girişi sıfırla (yeni sinyal başlangıcı)"""
+        self.spectra = None  # IR parça spektrumları, ilk blokta blok veri tipinde
+        self.history = None  # son P-1 tam giriş parçasının spektrumu (eskiden yeniye)
+        self.previous = None  # son tam giriş parçası (overlap-save örtüşmesi)
+        self.pending = None  # tamamlanmamış parçanın örnekleri (çıktısı verildi)
+        self.channels = None  # çok kanallı girişte kanal başına motorlar
+    
+    def _prepare(self, dtype):
+        size = self.partition
+        n_parts = max(1, -(-len(self.ir) // size))
+        parts = np.zeros(n_parts * size, dtype=dtype)
+        parts[:len(self.ir)] = self.ir
+        padded = np.zeros((n_parts, 2 * size), dtype=dtype)
+        padded[:, :size] = parts.reshape(n_parts, size)
+        self.spectra = spfft.rfft(padded, axis=1, workers=FFT_WORKERS)
+        self.history = np.zeros((n_parts - 1, size + 1), dtype=self.spectra.dtype)
+        self.previous = np.zeros(size, dtype=dtype)
+        self.pending = np.zeros(0, dtype=dtype)
+    
+    def process(self, block):
+        """Bir bloğu konvolüsyonla, durumu bir sonraki blok için sakla ((n, kanal): kanal başına motor)"""
+        if block.ndim == 2:
+            if self.channels is None:
+                self.channels = [PartitionedConvolver(self.ir, self.partition) for _ in range(block.shape[1])]
+            return np.column_stack([convolver.process(np.ascontiguousarray(block[:, channel]))
+                                    for channel, convolver in enumerate(self.channels)])
+        if self.spectra is None:
+            self._prepare(np.result_type(block.dtype, np.float32))
+        size = self.partition
+        n_parts = len(self.spectra)
+        
+        skip = len(self.pending)
+        data = np.concatenate([self.pending, block.astype(self.previous.dtype, copy=False)])
+        n_full = len(data) // size
+        n_chunks = -(-len(data) // size)
+        if n_chunks == 0:
+            return np.zeros(0, dtype=self.previous.dtype)
+        
+        # Overlap-save çerçeveleri: [önceki parça | parça], son eksik parça sıfırla tamamlanır
+        sequence = np.zeros((n_chunks + 1) * size, dtype=data.dtype)
+        sequence[:size] = self.previous
+        sequence[size:size + len(data)] = data
+        frames = np.lib.stride_tricks.sliding_window_view(sequence, 2 * size)[::size]
+        inputs = spfft.rfft(frames, axis=1, workers=FFT_WORKERS)
+        
+        # Frekans alanı gecikme hattı: Y_j = Σ_p H_p · X_(j-p)
+        line = np.concatenate([self.history, inputs])
+        output = self.spectra[0] * inputs
+        for p in range(1, n_parts):
+            output += self.spectra[p] * line[n_parts - 1 - p:n_parts - 1 - p + n_chunks]
+        result = spfft.irfft(output, n=2 * size, axis=1, workers=FFT_WORKERS)[:, size:].reshape(-1)
+        
+        # Yalnızca tam parçalar gecikme hattına girer; eksik parça sonraki blokta yeniden hesaplanır
+        if n_full > 0:
+            committed = np.concatenate([self.history, inputs[:n_full]])
+            self.history = committed[len(committed) - (n_parts - 1):]
+            self.previous = data[(n_full - 1) * size:n_full * size].copy()
+        self.pending = data[n_full * size:].copy()
+        return result[skip:skip + len(block)].astype(self.previous.dtype, copy=False)
+
+
+def reverb_convolver(spec, sr):
+    """Reverb ayarları için yeni konvolüsyon motoru"""
+    return PartitionedConvolver(reverb_ir(spec["ir"], spec["decay"], sr), spec["partition"])
+
+
+def mix_wet(dry, wet_signal, wet, out=None):
+    """(1 - wet)·kuru + wet·reverb (out verilirse yerinde)"""
+    if out is None:
+        out = np.empty_like(wet_signal)
+    np.multiply(dry, 1.0 - wet, out=out)
+    accumulate_scaled(out, wet_signal, wet)
+    return out
+
+
+@profiled("reverb")
+def apply_reverb(sig, sr, spec):
+    """
+    Sinyale konvolüsyon reverb'ü uygula (spec None ise sinyal olduğu gibi döner).
+    Sinyal BLOCK_SIZE bloklarıyla işlenir; ara bellek sinyal uzunluğundan bağımsızdır.
+    """
+    if spec is None:
+        return sig
+    out = np.empty(sig.shape, dtype=render_dtype())
+    convolver = reverb_convolver(spec, sr)
+    for start, length in block_ranges(len(sig), BLOCK_SIZE):
+        segment = sig[start:start + length]
+        mix_wet(segment, convolver.process(segment), spec["wet"], out=out[start:start + length])
+    return out
+
+
+def stream_reverb(blocks, sr, spec):
+    """apply_reverb akış versiyonu (spec None ise bloklar olduğu gibi geçer)"""
+    if spec is None:
+        yield from blocks
+        return
+    convolver = reverb_convolver(spec, sr)
+    for block in blocks:
+        yield mix_wet(block, convolver.process(block), spec["wet"])
+
 
 # ═══════════════════════════════════════════════════════════════════════════
-# BÖLÜM 11: ANA PROGRAM
+# BÖLÜM 9: MASTER İŞLEMCİ (LOUDNESS VE TRUE-PEAK LİMİTER)
 # ═══════════════════════════════════════════════════════════════════════════
 
-def main():
-    """Ana üretim fonksiyonu"""
-    print("\n" + "=" * 70)
-    print("ADVANCED AUDIO DSP & AI-ASSISTED SOUND GENERATOR")
-    print("=" * 70)
-    print(f"Yapılandırma:")
-    print(f"  - Süre: {DURATION}s")
-    print(f"  - Örnekleme Hızı: {SAMPLE_RATE}Hz")
-    print(f"  - Stereo: {STEREO_MODE}")
-    print(f"  - Master Amplitude: {MASTER_AMPLITUDE}")
-    print(f"  - Noise Generator: {ENABLE_NOISE_GENERATOR}")
-    print(f"  - Natural Sounds: {ENABLE_NATURAL_SOUNDS}")
-    print(f"  - Mixing System: {ENABLE_MIXING_SYSTEM}")
-    print(f"  - Frequency Filters: {ENABLE_FREQUENCY_FILTERS}")
-    print(f"  - Visualizer: {ENABLE_VISUALIZER}")
-    print(f"  - File Export: {ENABLE_FILE_EXPORT}")
-    print("=" * 70 + "\n")
-    
-    # Ana karışık sinyal üret
-    if ENABLE_MIXING_SYSTEM:
-        final_signal = mix_blogs(
-            DURATION,
-            SAMPLE_RATE,
-            mix_blog_config,
-            noise_mix,
-            brainwave_config,
-            naturalness_params
-        )
+"""
+MASTER İŞLEMCİ
+══════════════════════════════════════════════════════════════════════════════
+MASTER_MODE="lufs" iken master bus tepe normalizasyonu yerine:
+  1. K-ağırlıklı (ITU-R BS.1770) integrated loudness ölçülür (400 ms bloklar,
+     %75 örtüşme, -70 LUFS mutlak ve -10 LU göreli kapı)
+  2. MASTER_TARGET_LUFS'a ulaştıran tek skaler kazanç uygulanır
+  3. Look-ahead true-peak limiter (4x aşırı örnekleme) tepeyi
+     MASTER_TRUE_PEAK_DB altında tutar
+Her aşama blok blok çalışır; gecikme look-ahead kadardır (~5 ms).
+
+Mod                | Loudness ölçümü                     | Gecikme
+──────────────────────────────────────────────────────────────────────────────
+Tek seferlik       | Tüm sinyal (kesin)                  | —
+Akış, tek geçiş    | İlk kalibrasyon penceresi (tahmin)  | Kalibrasyon + look-ahead
+Akış, iki geçiş    | Ön geçiş ya da loudness önbelleği   | Look-ahead
+(MASTER_LOUDNESS_TWO_PASS)
+
+Loudness mono master üzerinde ölçülür; stereo çıkışta iki (neredeyse aynı)
+kanalın enerjisi toplandığı için +3.01 dB (10·log10 2) eklenir.
+"""
+
+LOUDNESS_BLOCK_SECONDS = 0.4
+LOUDNESS_HOP_SECONDS = 0.1
+LOUDNESS_ABSOLUTE_GATE = -70.0
+LOUDNESS_RELATIVE_GATE = -10.0
+TRUE_PEAK_OVERSAMPLE = 4
+TRUE_PEAK_TAPS = 48
+LOUDNESS_CACHE_DIR = os.path.join("output", "loudness_cache")
+
+
+@functools.lru_cache(maxsize=16)
+def k_weighting_sos(sr):
+    """
+    BS.1770 K-ağırlık filtresi (yüksek raf + RLB yüksek geçiren) SOS katsayıları.
+    48 kHz referans tasarımı bilineer dönüşümle her örnekleme hızına taşınır.
+    """
+    # 1. aşama: ~1.68 kHz üstü +4 dB raf (kafa etkisi)
+    k = np.tan(np.pi * 1681.974450955533 / sr)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = [(vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0,
+             1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+    
+    # 2. aşama: ~38 Hz yüksek geçiren (RLB)
+    k = np.tan(np.pi * 38.13547087602444 / sr)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    highpass = [1.0, -2.0, 1.0, 1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+    
+    sos = np.array([shelf, highpass])
+    sos.flags.writeable = False
+    return sos
+
+
+def gated_loudness(hop_energies, hop_samples):
+    """
+    100 ms adım enerjilerinden (K-ağırlıklı kare toplamları) integrated loudness (LUFS).
+    400 ms'den kısa sinyaller tek blok olarak ölçülür; sessizlikte -inf.
+    """
+    energies = np.asarray(hop_energies, dtype=np.float64)
+    per_block = int(round(LOUDNESS_BLOCK_SECONDS / LOUDNESS_HOP_SECONDS))
+    if len(energies) == 0:
+        return float("-inf")
+    if len(energies) < per_block:
+        blocks = np.array([energies.sum() / (len(energies) * hop_samples)])
     else:
-        # Sadece tek bir test sinyali üret
-        print("Mix sistemi devre dışı, test sinyali üretiliyor...")
-        final_signal = generate_pink_noise(DURATION, SAMPLE_RATE, MASTER_AMPLITUDE)
+        window = np.lib.stride_tricks.sliding_window_view(energies, per_block)
+        blocks = window.sum(axis=1) / (per_block * hop_samples)
+    
+    with np.errstate(divide="ignore"):
+        levels = -0.691 + 10 * np.log10(blocks)
+    gated = blocks[levels > LOUDNESS_ABSOLUTE_GATE]
+    if len(gated) == 0:
+        return float("-inf")
+    relative_gate = -0.691 + 10 * np.log10(gated.mean()) + LOUDNESS_RELATIVE_GATE
+    gated = blocks[(levels > LOUDNESS_ABSOLUTE_GATE) & (levels > relative_gate)]
+    return float(-0.691 + 10 * np.log10(gated.mean()))
+
+
+class LoudnessMeter:
+    """
+    Blok blok integrated loudness ölçer (ITU-R BS.1770 / EBU R128).
+    (n, kanal) bloklarda kanal enerjileri toplanır (L/R ağırlığı 1).
+    K-ağırlık filtresinin durumu ve yarım kalan 100 ms adım bloklar arasında taşınır;
+    bellek yalnızca adım başına bir sayıdır (saatlik akışta ~36000 değer).
+    """
     
-    # Stereo dönüşümü
-    if STEREO_MODE:
-        print("\nStereo sinyal oluşturuluyor...")
+    def __init__(self, sr):
+        self.filter = StatefulFilter(k_weighting_sos(sr))
+        self.hop = max(1, int(round(LOUDNESS_HOP_SECONDS * sr)))
+        self.energies = []
+        self.partial = 0.0
+        self.partial_len = 0
+    
+    def process(self, block):
+        weighted = self.filter.process(np.asarray(block, dtype=np.float64))
+        weighted *= weighted
+        if weighted.ndim == 2:
+            weighted = weighted.sum(axis=1)
         
-        # Hafif stereo genişlik için sağ kanalı biraz kaydır
-        left_channel = final_signal
-        right_channel = np.roll(final_signal, int(SAMPLE_RATE * 0.001))  # 1ms shift
+        # Önceki bloktan kalan adımı tamamla
+        start = 0
+        if self.partial_len > 0:
+            start = min(self.hop - self.partial_len, len(weighted))
+            self.partial += float(weighted[:start].sum())
+            self.partial_len += start
+            if self.partial_len == self.hop:
+                self.energies.append(self.partial)
+                self.partial, self.partial_len = 0.0, 0
         
-        # Stereo matris
-        stereo_signal = np.stack([left_channel, right_channel], axis=1)
-        output_signal = stereo_signal
-    else:
-        output_signal = final_signal
-    
-    # Görselleştirme
-    if ENABLE_VISUALIZER:
-        print("\nGörselleştirme oluşturuluyor...")
-        visualize_signal(final_signal, SAMPLE_RATE, "Final Mixed Output")
+        n_full = (len(weighted) - start) // self.hop
+        if n_full > 0:
+            end = start + n_full * self.hop
+            self.energies.extend(weighted[start:end].reshape(n_full, self.hop).sum(axis=1).tolist())
+            start = end
+        if start < len(weighted):
+            self.partial += float(weighted[start:].sum())
+            self.partial_len += len(weighted) - start
+    
+    def integrated(self):
+        """Şu ana kadarki integrated loudness (LUFS); sonda yarım kalan adım dahil edilmez"""
+        energies = self.energies
+        if not energies and self.partial_len > 0:
+            return gated_loudness([self.partial], self.partial_len)
+        return gated_loudness(energies, self.hop)
+
+
+def measure_loudness(sig, sr, block_size=NATURALNESS_BLOCK):
+    """Bellekteki sinyalin (mono ya da (n, kanal)) integrated loudness'ı (LUFS), parça parça ölçülür"""
+    meter = LoudnessMeter(sr)
+    for start in range(0, len(sig), block_size):
+        meter.process(sig[start:start + block_size])
+    return meter.integrated()
+
+
+def master_channels(channels=None):
+    """Çıkış kanal sayısı (None: STEREO_MODE'a göre 2 ya da 1)"""
+    if channels is None:
+        return 2 if STEREO_MODE else 1
+    return channels
+
+
+def loudness_gain(integrated, target_lufs=None, channels=1):
+    """
+    Ölçülen loudness'ı (LUFS) hedefe taşıyan doğrusal kazanç; sessizlikte 1.
+    channels: mono ölçümün çoğaltılacağı çıkış kanal sayısı (gerçek stereo ölçümde 1)
+    """
+    if target_lufs is None:
+        target_lufs = MASTER_TARGET_LUFS
+    if not np.isfinite(integrated):
+        return 1.0
+    output_lufs = integrated + 10 * np.log10(channels)
+    return float(10 ** ((target_lufs - output_lufs) / 20))
+
+
+@functools.lru_cache(maxsize=1)
+def true_peak_phases():
+    """4x aşırı örnekleme interpolatörünün çok fazlı FIR katsayıları (faz, tap)"""
+    h = sps.firwin(TRUE_PEAK_TAPS, 1.0 / TRUE_PEAK_OVERSAMPLE) * TRUE_PEAK_OVERSAMPLE
+    phases = np.ascontiguousarray(h.reshape(-1, TRUE_PEAK_OVERSAMPLE).T)
+    phases.flags.writeable = False
+    return phases
+
+
+class TruePeakLimiter:
+    """
+    LOOK-AHEAD TRUE-PEAK LİMİTER
+    ══════════════════════════════════════════════════════════════════════════════
+    Örnek başına gereken zayıflatma (dB) 4x interpolasyonla bulunan true-peak'ten
+    hesaplanır. Zayıflatma ileriye bakan kayan maksimumla tepeden önce devreye
+    girer, release doğrusal dB hızıyla (kümülatif maksimum) geri döner ve
+    look-ahead uzunluğunda hareketli ortalamayla yumuşatılır. Ortalama penceresi
+    kayan maksimum penceresinin içinde kaldığı için her tepe tavanın altında kalır.
+    
+    process() çıktısı girdiden `latency` örnek geride kalır (ilk bloklar kısa
+    döner); flush() kalan örnekleri verir. Toplam çıktı uzunluğu girdiye eşittir.
+    (n, kanal) bloklarda zayıflatma kanalların en yükseğinden bulunur ve tüm
+    kanallara aynı uygulanır (bağlı limiter: stereo görüntü kaymaz).
+    Zayıflatma gerekmeyen bloklar log/üs hesabı yapılmadan geçer.
+    """
+    
+    def __init__(self, sr, ceiling_db=None, lookahead_ms=None, release_ms=None):
+        ceiling_db = MASTER_TRUE_PEAK_DB if ceiling_db is None else ceiling_db
+        lookahead_ms = MASTER_LIMITER_LOOKAHEAD_MS if lookahead_ms is None else lookahead_ms
+        release_ms = MASTER_LIMITER_RELEASE_MS if release_ms is None else release_ms
+        
+        self.ceiling = 10 ** (ceiling_db / 20)
+        self.phases = true_peak_phases()
+        # İnterpolatörün grup gecikmesi (giriş örneği): tepe, zarfta bu kadar geç görünür
+        interp_delay = int(np.ceil((TRUE_PEAK_TAPS - 1) / 2 / TRUE_PEAK_OVERSAMPLE))
+        self.attack = max(1, int(sr * lookahead_ms / 1000))
+        self.latency = self.attack + interp_delay
+        # Release: 6 dB'lik toparlanma release_ms sürer
+        self.release_db = 6.0 / max(1.0, sr * release_ms / 1000)
+        
+        self.history = None  # interpolatör geçmişi, held: gecikme tamponu (ilk blokta şekillenir)
+        self.held = None
+        self.held_atten = np.zeros(0)
+        self.release_state = 0.0
+        self.smooth_tail = None  # ilk çıktıya dek: akış başı zaten zayıflatılmış başlar
+    
+    def _attenuation(self, x):
+        """Örnek başına gereken zayıflatma (dB, ≥ 0): max(|x|, 4x interpolasyon tepeleri)"""
+        extended = np.concatenate([self.history, x])
+        self.history = extended[len(extended) - len(self.history):]
+        peak = np.abs(x)
+        # Kanal başına (satır görünümleri): mono sinyal tek satırdır
+        columns = extended.T if x.ndim == 2 else extended[None]
+        column_peaks = peak.T if x.ndim == 2 else peak[None]
+        for taps in self.phases:
+            for column, column_peak in zip(columns, column_peaks):
+                np.maximum(column_peak, np.abs(np.convolve(column, taps, mode="valid")), out=column_peak)
+        if x.ndim == 2:
+            peak = peak.max(axis=1, initial=0.0)
+        if float(peak.max(initial=0.0)) <= self.ceiling:
+            return np.zeros(len(x))
+        np.maximum(peak, self.ceiling, out=peak)
+        return 20 * np.log10(peak / self.ceiling)
+    
+    def process(self, block, gain=1.0):
+        """Bloğu (önce gain ile ölçekleyip) işle; hazır olan gecikmeli çıktıyı döndür"""
+        x = np.multiply(block, gain, dtype=np.float64)
+        if self.held is None:
+            self.history = np.zeros((self.phases.shape[1] - 1,) + x.shape[1:])
+            self.held = np.zeros((0,) + x.shape[1:])
+        samples = np.concatenate([self.held, x])
+        atten = np.concatenate([self.held_atten, self._attenuation(x)])
+        n_out = len(samples) - self.latency
+        if n_out <= 0:
+            self.held, self.held_atten = samples, atten
+            return np.zeros((0,) + x.shape[1:], dtype=render_dtype())
+        
+        if not atten.any() and self.release_state == 0.0 and (self.smooth_tail is None or not self.smooth_tail.any()):
+            out = samples[:n_out]
+            self.smooth_tail = np.zeros(self.attack - 1)
+        else:
+            # İleriye bakan kayan maksimum: [n, n + latency]
+            window = self.latency + 1
+            ahead = sps_ndimage.maximum_filter1d(atten, window, origin=-(window // 2))[:n_out]
+            # Doğrusal dB release: r[n] = max_k (ahead[k] - rate·(n-k)), önceki durum dahil
+            ramp = self.release_db * np.arange(n_out)
+            released = np.maximum.accumulate(ahead + ramp) - ramp
+            np.maximum(released, self.release_state - self.release_db - ramp, out=released)
+            self.release_state = float(released[-1])
+            # attack uzunluğunda hareketli ortalama (atak rampası); pencere, interpolatör
+            # gecikmesi kadar kısa tutulur: her ortalama terimi tepenin zarftaki yerini kapsar
+            n = self.attack
+            if self.smooth_tail is None:
+                self.smooth_tail = np.full(n - 1, released[0])
+            smoothed = np.concatenate([self.smooth_tail, released])
+            sums = np.cumsum(smoothed)
+            sums[n:] -= sums[:-n].copy()
+            self.smooth_tail = smoothed[len(smoothed) - (n - 1):]
+            out = samples[:n_out] * as_channels(10 ** (-sums[n - 1:] / (20 * n)), samples)
+        
+        self.held, self.held_atten = samples[n_out:], atten[n_out:]
+        return out.astype(render_dtype(), copy=False)
+    
+    def flush(self):
+        """Tutulan son `latency` örneği ver (look-ahead sessizlikle doldurulur)"""
+        if self.held is None:
+            return np.zeros(0, dtype=render_dtype())
+        return self.process(np.zeros((self.latency,) + self.held.shape[1:]))
+
+
+def master_process(sig, sr, channels=1, integrated=None, out=None, block_size=NATURALNESS_BLOCK):
+    """
+    Bellekteki karışıma (mono ya da (n, kanal)) LUFS kazancı + true-peak limiter uygula.
+    integrated: önceden ölçülmüş loudness (None: sinyalden ölçülür).
+    channels: mono karışımın çoğaltılacağı çıkış kanal sayısı (çok kanallı karışımda yok sayılır)
+    out: çıkış dizisi (sig'in kendisi olabilir: çıktı girdinin gerisinde kaldığı için yerinde güvenli)
+    """
+    if integrated is None:
+        integrated = measure_loudness(sig, sr, block_size)
+    # Çok kanallı karışımda ölçüm kanal enerjilerini zaten toplar
+    gain = loudness_gain(integrated, MASTER_TARGET_LUFS, 1 if sig.ndim == 2 else channels)
+    print(f"Master: {integrated:.1f} LUFS ölçüldü, kazanç {20 * np.log10(gain):+.1f} dB, "
+          f"hedef {MASTER_TARGET_LUFS} LUFS / {MASTER_TRUE_PEAK_DB} dBTP")
+    
+    if out is None:
+        out = np.empty(sig.shape, dtype=render_dtype())
+    limiter = TruePeakLimiter(sr)
+    written = 0
+    for start in range(0, len(sig), block_size):
+        chunk = limiter.process(sig[start:start + block_size], gain)
+        out[written:written + len(chunk)] = chunk
+        written += len(chunk)
+    tail = limiter.flush()[:len(out) - written]
+    out[written:written + len(tail)] = tail
+    return out
+
+
+def stream_master(blocks, sr, channels=1, integrated=None, calib_samples=None):
+    """
+    master_process akış versiyonu. integrated verilmezse loudness ilk kalibrasyon
+    penceresinden tahmin edilir (pencere tamponlanır, sonra sabit kazanç).
+    Boş bloklar yayınlanmaz; toplam örnek sayısı girdiyle aynıdır.
+    """
+    blocks = iter(blocks)
+    pending = []
+    if integrated is None:
+        meter = LoudnessMeter(sr)
+        buffered = 0
+        calib_samples = calibration_samples(sr) if calib_samples is None else calib_samples
+        for block in blocks:
+            pending.append(block)
+            meter.process(block)
+            buffered += len(block)
+            if buffered >= calib_samples:
+                break
+        integrated = meter.integrated()
+    
+    limiter = TruePeakLimiter(sr)
+    gain = None
+    for block in itertools.chain(pending, blocks):
+        if gain is None:
+            # Çok kanallı bloklarda ölçüm kanal enerjilerini zaten toplar
+            gain = loudness_gain(integrated, MASTER_TARGET_LUFS, 1 if block.ndim == 2 else channels)
+        out = limiter.process(block, gain)
+        if len(out) > 0:
+            yield out
+    pending = None
+    tail = limiter.flush()
+    if len(tail) > 0:
+        yield tail
+
+
+def stream_peak_master(blocks, sr, peak=None):
+    """
+    Tepe modu master akışı (normalize_signal(MASTER_AMPLITUDE) karşılığı).
+    peak: ön geçişte ölçülen tam akış tepesi; verilirse kazanç kesindir, verilmezse
+    kalibrasyon penceresinden tahmin edilir ve tahminin aşıldığı tepeler kırpma yerine
+    MASTER_AMPLITUDE tavanlı true-peak limiter ile sınırlanır.
+    """
+    blocks = stream_normalize(blocks, MASTER_AMPLITUDE, calibration_samples(sr), peak=peak)
+    if peak is not None:
+        yield from blocks
+        return
+    
+    limiter = TruePeakLimiter(sr, ceiling_db=20 * np.log10(max(MASTER_AMPLITUDE, 1e-6)))
+    for block in blocks:
+        out = limiter.process(block)
+        if len(out) > 0:
+            yield out
+    tail = limiter.flush()
+    if len(tail) > 0:
+        yield tail
+
+
+def loudness_cache_key(layers, duration, sr, scene_seed, operations, reverb=None, placements=None, stream=None):
+    """
+    Akış karışımının loudness/seviye ölçümü anahtarı (katmanlar, frekans işlemleri, master
+    reverb, stereo yerleşimler, iç hız bölenleri, akış ayarları, süre, sr, tohum, kod sürümü).
+    stream: ölçülen örnekleri etkileyen akış ayarları (blok boyu, kalibrasyon, seviye planı)
+    """
+    payload = {
+        "layers": layers,
+        "operations": operations,
+        "reverb": reverb,
+        "placements": placements,
+        "stream": stream,
+        "rate_factors": [multirate_factor(layer, sr) for layer in layers],
+        "duration": duration,
+        "sr": sr,
+        "seed": scene_seed,
+        "dtype": RENDER_DTYPE,
+        "version": code_version()
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def loudness_cache_load(key):
+    """Önbellekteki integrated loudness (LUFS) ya da None"""
+    try:
+        with open(os.path.join(LOUDNESS_CACHE_DIR, f"{key}.json"), encoding="utf-8") as source:
+            return float(json.load(source)["integrated_lufs"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def loudness_cache_store(key, integrated):
+    """Ölçümü önbelleğe yaz (geçici dosya + os.replace)"""
+    os.makedirs(LOUDNESS_CACHE_DIR, exist_ok=True)
+    path = os.path.join(LOUDNESS_CACHE_DIR, f"{key}.json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        json.dump({"integrated_lufs": integrated}, out)
+    os.replace(tmp_path, path)
+
+
+def level_cache_load(key):
+    """Önbellekteki akış seviyeleri (katman tepeleri, master tepesi ya da None) veya None"""
+    try:
+        with open(os.path.join(LOUDNESS_CACHE_DIR, f"{key}.levels.json"), encoding="utf-8") as source:
+            record = json.load(source)
+        master_peak = record["master_peak"]
+        return [float(peak) for peak in record["layer_peaks"]], None if master_peak is None else float(master_peak)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def level_cache_store(key, layer_peaks, master_peak):
+    """Seviye ölçümünü önbelleğe yaz (geçici dosya + os.replace)"""
+    os.makedirs(LOUDNESS_CACHE_DIR, exist_ok=True)
+    path = os.path.join(LOUDNESS_CACHE_DIR, f"{key}.levels.json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        json.dump({"layer_peaks": layer_peaks, "master_peak": master_peak}, out)
+    os.replace(tmp_path, path)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BÖLÜM 10: KARIŞTIRMA SİSTEMİ (MIX BLOG)
+# ═══════════════════════════════════════════════════════════════════════════
+
+NATURAL_BLOGS = {
+    "rain": sound_blog_rain,
+    "thunder": sound_blog_thunder,
+    "wind": sound_blog_wind,
+    "ocean": sound_blog_ocean,
+    "fire": sound_blog_fire,
+    "crickets": sound_blog_crickets,
+    "car": sound_blog_car,
+    "train": sound_blog_train,
+    "vinyl": sound_blog_vinyl
+}
+
+BRAINWAVE_BLOGS = {
+    "delta": brainwave_blog_delta,
+    "theta": brainwave_blog_theta,
+    "alpha": brainwave_blog_alpha,
+    "beta": brainwave_blog_beta,
+    "gamma": brainwave_blog_gamma
+}
+
+# Döngü modunda tekrarlanabilen durağan/periyodik katmanlar
+LOOP_LAYERS = {"natural:wind", "natural:ocean", "noise:spectrum"}
+
+"""
+STEREO YERLEŞİM
+══════════════════════════════════════════════════════════════════════════════
+Stereo çıkışta her katman mono üretilir ve (n, 2) karışıma yerleştirilir:
+
+  L = √2·cos θ · (m·x + s·D(x))      θ = (pan + 1)·π/4
+  R = √2·sin θ · (m·x − s·D(x))      m = cos(width·π/4), s = sin(width·π/4)
+
+D: katmana özel rastgele fazlı, düz genlikli kısa FIR (DECORRELATOR_SECONDS),
+   PartitionedConvolver ile blok blok (gecikmesiz). Mono toplamda (L + R)
+   dekorele kısım sönümlenir; merkezdeki katman her kanalda eski ikili mono
+   seviyesindedir.
+
+Parametre | Açıklama                        | Aralık   | Varsayılan
+──────────────────────────────────────────────────────────────────────────────
+pan       | Sol (-1) … merkez (0) … sağ (1) | -1 / 1   | 0.0
+width     | 0: mono, 1: tamamen dekorele    | 0 / 1    | STEREO_WIDTH (brainwave: 0)
+"""
+
+# Katman stereo yerleşimi: katman anahtarı → {"pan": ..., "width": ...} (belirtilmeyenler varsayılan)
+STEREO_LAYERS = {}
+
+# Dekorelatör FIR uzunluğu (sn) ve konvolüsyon parça boyutu
+DECORRELATOR_SECONDS = 0.01
+DECORRELATOR_PARTITION = 1024
+
+
+def stereo_spec(layer):
+    """Katmanın pan/genişlik ayarları (STEREO_LAYERS üzerine varsayılanlar)"""
+    spec = {"pan": 0.0, "width": 0.0 if layer["kind"] == "brainwave" else STEREO_WIDTH}
+    spec.update(STEREO_LAYERS.get(layer["key"], {}))
+    return spec
+
+
+@functools.lru_cache(maxsize=32)
+def decorrelation_fir(layer_key, sr):
+    """
+    Katmana özel dekorelasyon FIR'ı (salt-okunur): birim genlikli, rastgele fazlı
+    spektrumun ters FFT'si; enerjisi 1, fazı katman anahtarından tohumlanır.
+    """
+    n = max(2, int(DECORRELATOR_SECONDS * sr))
+    rng = np.random.default_rng(zlib.crc32(layer_key.encode("utf-8")))
+    phase = rng.uniform(-np.pi, np.pi, n // 2 + 1)
+    phase[0] = 0.0
+    if n % 2 == 0:
+        phase[-1] = 0.0
+    fir = spfft.irfft(np.exp(1j * phase), n=n)
+    fir.flags.writeable = False
+    return fir
+
+
+class StereoPlacer:
+    """
+    Mono katmanı (n, 2) karışıma pan ve genişlikle ekler (ağırlık dahil).
+    Dekorelatör durumu add_into() çağrıları arasında taşınır: akışta blok blok
+    eklenen sonuç tek seferlik eklemeyle aynıdır.
+    """
+    
+    def __init__(self, layer, sr):
+        spec = stereo_spec(layer)
+        theta = (np.clip(spec["pan"], -1.0, 1.0) + 1.0) * np.pi / 4
+        pan_gains = np.sqrt(2.0) * np.array([np.cos(theta), np.sin(theta)])
+        width = np.clip(spec["width"], 0.0, 1.0) * np.pi / 4
+        self.direct = layer["weight"] * np.cos(width) * pan_gains
+        self.side = layer["weight"] * np.sin(width) * pan_gains * np.array([1.0, -1.0])
+        self.decorrelator = None
+        if width > 0:
+            self.decorrelator = PartitionedConvolver(decorrelation_fir(layer["key"], sr), DECORRELATOR_PARTITION)
+    
+    def add_into(self, mixed, stem):
+        """stem'i (n,) mixed'e (n, 2) ekle; uzun stem'ler BLOCK_SIZE dilimlerle işlenir"""
+        direct = self.direct.astype(mixed.dtype)
+        side = self.side.astype(mixed.dtype)
+        for start, length in block_ranges(len(stem), BLOCK_SIZE):
+            segment = stem[start:start + length]
+            target = mixed[start:start + length]
+            target += segment[:, None] * direct
+            if self.decorrelator is not None:
+                target += self.decorrelator.process(segment)[:, None] * side
+        return mixed
+
+
+def mix_stem(mixed, stem, layer, sr):
+    """Katman stem'ini ağırlığıyla karışıma ekle ((n, 2) karışımda stereo yerleşimle)"""
+    if mixed.ndim == 2:
+        with profile_stage("stereo", layer=layer["key"]):
+            return StereoPlacer(layer, sr).add_into(mixed, stem)
+    return accumulate_scaled(mixed, stem, layer["weight"])
+
+
+"""
+ÇOK HIZLI (MULTIRATE) RENDER
+══════════════════════════════════════════════════════════════════════════════
+Dar bantlı katmanlar SAMPLE_RATE yerine bantlarına yetecek bir iç hızda
+(sr / k) sentezlenip filtrelenir, karışıma polifaz FIR ile k katı yukarı
+örneklenerek (resample_poly, akışta PolyphaseUpsampler) girer.
+
+  iç hız = sr / k      k: sr'yi bölen, MULTIRATE_MAX_FACTOR'dan büyük olmayan en büyük
+                       tamsayı; iç hız ≥ MULTIRATE_OVERSAMPLE · bant üstü ve ≥ MULTIRATE_MIN_RATE
+
+Katman          | Bant kaynağı               | Örnek (44100 Hz)
+──────────────────────────────────────────────────────────────────────────────
+natural         | katman freq_range (son BP) | thunder 50-500 → k=21 (2100 Hz), car 80-400 → k=25
+brainwave boost | CATALOG freq_range         | delta 0.5-4 → k=42 (MULTIRATE_LAYERS'a eklenirse)
+brainwave tone  | — (osilatör bankası zaten ucuz) | k=1
+noise           | — (geniş bant)             | k=1
+
+Yalnızca MULTIRATE_LAYERS'taki katmanlar iç hızda üretilir; bunlarda seviye tam hızla
+ortalamada ~0.7 dB içindedir (rastgele gerçekleşme farklı olduğundan tek tek tohumlar
+değişir). Katman bandı dışındaki içeriği normalizasyona katan bloglar tam hızda kalır:
+tren (geniş bantlı tıklar, +17 dB), okyanus (800-3000 Hz köpük), vinil (çıtırtılar,
+~+0.5-2 dB) ve brainwave boost (pembe gürültü tepe normalizasyonu tüm banda göre, +3 dB).
+Alt-ses bant geçiren filtreler iç hızda daha iyi koşullanır (tam hızda da
+BANDPASS_MIN_NORM sayesinde doğru tasarlanır).
+"""
+
+# İç hızda üretilebilen katmanlar (bant dışı içeriği normalizasyondan önce süzülenler)
+MULTIRATE_LAYERS = {"natural:rain", "natural:thunder", "natural:wind", "natural:fire", "natural:car"}
+
+
+def layer_band(layer):
+    """Katmanın karışıma ulaşan frekans bandı (Hz); geniş bantlı katmanlarda None"""
+    if layer["kind"] == "natural":
+        return tuple(layer["freq_range"])
+    if layer["kind"] == "brainwave":
+        return CATALOG[layer["name"]]["freq_range"]
+    return None
+
+
+def multirate_factor(layer, sr):
+    """Katmanın iç hız böleni k (1: tam hızda üretilir)"""
+    band = layer_band(layer)
+    if not MULTIRATE_MODE or band is None or layer["key"] not in MULTIRATE_LAYERS:
+        return 1
+    if layer["kind"] == "brainwave" and layer["mode"] != "boost":
+        return 1
+    min_rate = max(MULTIRATE_OVERSAMPLE * band[1], MULTIRATE_MIN_RATE)
+    for factor in range(min(MULTIRATE_MAX_FACTOR, sr), 1, -1):
+        if sr % factor == 0 and sr // factor >= min_rate:
+            return factor
+    return 1
+
+
+@functools.lru_cache(maxsize=16)
+def upsample_taps(factor):
+    """resample_poly(x, factor, 1) ile aynı polifaz FIR (Kaiser β=5, 10 giriş örneği yarı uzunluk)"""
+    half = 10 * factor
+    taps = sps.firwin(2 * half + 1, 1.0 / factor, window=('kaiser', 5.0)) * factor
+    taps.flags.writeable = False
+    return taps
+
+
+@profiled("upsample")
+def upsample_stem(stem, factor, n_samples):
+    """İç hızdaki stem'i factor katı yukarı örnekle, n_samples'a kırp/sıfırla doldur"""
+    if factor == 1:
+        return stem
+    upsampled = sps.resample_poly(stem, factor, 1)[:n_samples]
+    result = np.zeros(n_samples, dtype=render_dtype())
+    result[:len(upsampled)] = upsampled
+    return result
+
+
+class PolyphaseUpsampler:
+    """
+    resample_poly(x, factor, 1)'in blok durumlu, nedensel versiyonu.
+    Son ceil((L-1)/factor) giriş örneği process() çağrıları arasında taşınır;
+    çıktı sıfır fazlı sonuca göre L//2 örnek gecikmelidir (stream_upsample telafi eder).
+    """
+    
+    def __init__(self, factor):
+        self.factor = factor
+        self.taps = upsample_taps(factor)
+        self.delay = len(self.taps) // 2
+        self.history = np.zeros(-(-(len(self.taps) - 1) // factor))
+    
+    def process(self, block):
+        """len(block) giriş örneği → len(block)·factor çıkış örneği"""
+        extended = np.concatenate((self.history, block))
+        start = len(self.history) * self.factor
+        output = sps.upfirdn(self.taps, extended, self.factor)[start:start + len(block) * self.factor]
+        self.history = extended[len(extended) - len(self.history):]
+        return output
+
+
+def stream_upsample(blocks, factor, n_samples, block_size):
+    """
+    upsample_stem akış versiyonu: iç hızdaki blokları yukarı örnekle ve
+    block_ranges(n_samples, block_size) boylarında yeniden blokla (tek seferlikle aynı).
+    """
+    if factor == 1:
+        yield from blocks
+        return
+    
+    upsampler = PolyphaseUpsampler(factor)
+    # Sıfır fazlı hizalama: ilk delay çıkış atılır, sonda delay kadar sıfır girişle boşaltılır
+    flush = np.zeros(-(-upsampler.delay // factor))
+    skip = upsampler.delay
+    lengths = (length for _, length in block_ranges(n_samples, block_size))
+    target = next(lengths, None)
+    buffer = np.zeros(0)
+    
+    for block in itertools.chain(blocks, [flush]):
+        output = upsampler.process(block)
+        dropped = min(skip, len(output))
+        skip -= dropped
+        buffer = np.concatenate((buffer, output[dropped:]))
+        while target is not None and len(buffer) >= target:
+            yield buffer[:target].astype(render_dtype())
+            buffer = buffer[target:]
+            target = next(lengths, None)
+    
+    # İç hız uzunluğu n_samples / factor'a tam bölünmüyorsa kalan sıfır
+    while target is not None:
+        tail = np.zeros(target, dtype=render_dtype())
+        tail[:len(buffer)] = buffer[:target]
+        buffer = buffer[target:]
+        yield tail
+        target = next(lengths, None)
+
+
+def resolve_scene_seed(scene_seed=None):
+    """Sahne tohumunu belirle (None: SCENE_SEED, o da None ise rastgele)"""
+    if scene_seed is not None:
+        return scene_seed
+    if SCENE_SEED is not None:
+        return SCENE_SEED
+    return int(np.random.SeedSequence().entropy % (2 ** 63))
+
+
+def layer_seed(scene_seed, layer_key):
+    """
+    Sahne tohumundan katmana özel SeedSequence türet.
+    Her katman kendi np.random.Generator akışını alır; katman eklemek/çıkarmak
+    diğer katmanların sesini değiştirmez. SeedSequence picklable'dır (süreç havuzu).
+    """
+    return np.random.SeedSequence([scene_seed, zlib.crc32(layer_key.encode("utf-8"))])
+
+
+def loop_spec(layer_key):
+    """Katmanın döngü ayarları (LOOP_MODE kapalıysa ya da katman döngülenemiyorsa None)"""
+    if not LOOP_MODE or layer_key not in LOOP_LAYERS:
+        return None
+    return {"seconds": LOOP_SECONDS, "crossfade": LOOP_CROSSFADE_SECONDS, "variation": LOOP_VARIATION}
+
+
+def collect_layers(noise_mix_config, brainwave_cfg, nat_params, noise_type_cfg=None):
+    """
+    Aktif katmanları render işleri olarak topla.
+    Her iş: {"key", "kind", "name", "weight", "loop", ...} — süreçlere gönderilebilir (picklable).
+    noise_type_cfg: noise türü aktivasyonları (None: noise_types)
+    """
+    if noise_type_cfg is None:
+        noise_type_cfg = noise_types
+    layers = []
+    
+    # Natural sounds
+    if ENABLE_NATURAL_SOUNDS:
+        for sound_name, config in noise_mix_config.items():
+            if config["enabled"] and sound_name in NATURAL_BLOGS:
+                print(f"Üretiliyor: {sound_name} (weight={config['weight']:.2f}, naturalness={config['naturalness']:.2f})")
+                layers.append({
+                    "key": f"natural:{sound_name}",
+                    "kind": "natural",
+                    "name": sound_name,
+                    "weight": config["weight"],
+                    "naturalness": config["naturalness"],
+                    "freq_range": config["freq_range"],
+                    "nat_params": nat_params,
+                    "loop": loop_spec(f"natural:{sound_name}"),
+                    "reverb": reverb_spec(f"natural:{sound_name}")
+                })
+    
+    # Technical noise: tüm renkler tek iş, ortak beyaz gürültü ve tek FFT
+    # (her renk yalnızca kendi spektral şekline bağlıdır; renk eklemek diğerlerini değiştirmez)
+    if ENABLE_NOISE_GENERATOR:
+        enabled_types = [noise_type for noise_type, enabled in noise_type_cfg.items() if enabled]
+        for noise_type in enabled_types:
+            print(f"Üretiliyor: {noise_type} noise (amplitude=0.3)")
+        if enabled_types:
+            layers.append({"key": "noise:spectrum", "kind": "noise", "names": enabled_types, "weight": 0.2,
+                           "loop": loop_spec("noise:spectrum"), "reverb": reverb_spec("noise:spectrum")})
+    
+    # Brainwave
+    for wave_name, config in brainwave_cfg.items():
+        if config["enabled"] and wave_name in BRAINWAVE_BLOGS:
+            print(f"Üretiliyor: {wave_name} brainwave (freq={config['center_freq']}Hz, amp={config['amplitude']:.2f})")
+            layers.append({
+                "key": f"brainwave:{wave_name}",
+                "kind": "brainwave",
+                "name": wave_name,
+                "weight": 1.0,
+                "amplitude": config["amplitude"],
+                "mode": config["mode"],
+                "loop": None,
+                "reverb": reverb_spec(f"brainwave:{wave_name}")
+            })
+    
+    return layers
+
+
+# Katman önbelleği: içerik adresli .npy stem'ler (salt-okunur memmap olarak açılır)
+LAYER_CACHE_DIR = os.path.join("output", "layer_cache")
+
+
+# Kod özetinin başladığı yer: BÖLÜM 1 (kontrol paneli) ayar düzenlemeleri önbelleği geçersiz kılmaz;
+# stem'i etkileyen ayarlar (dtype, iç hız, döngü, reverb, katman parametreleri) zaten anahtardadır
+CODE_VERSION_MARKER = "# BÖLÜM 2: KATALOG".encode("utf-8")
+
+
+@functools.lru_cache(maxsize=1)
+def code_version():
+    """Sentez kodu özeti (BÖLÜM 2'den itibaren); kod değişince eski önbellek kayıtları kendiliğinden geçersiz olur"""
+    with open(os.path.abspath(__file__), "rb") as source:
+        code = source.read()
+    return hashlib.sha256(code[max(0, code.find(CODE_VERSION_MARKER)):]).hexdigest()[:16]
+
+
+def layer_cache_key(layer, duration, sr, scene_seed):
+    """
+    Katmanın kanonik özeti: blog adı ve parametreleri, naturalness_params, sr,
+    süre, sahne tohumu, render veri tipi, iç hız böleni ve kod sürümü (sıralı anahtarlı JSON -> sha256)
+    """
+    payload = {
+        "layer": layer,
+        "duration": duration,
+        "sr": sr,
+        "seed": scene_seed,
+        "dtype": RENDER_DTYPE,
+        "rate_factor": multirate_factor(layer, sr),
+        "version": code_version()
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _layer_cache_path(key):
+    return os.path.join(LAYER_CACHE_DIR, f"{key}.npy")
+
+
+@profiled("cache_load", "cache")
+def layer_cache_load(key):
+    """Önbellekteki stem'i memmap olarak aç (yoksa None); erişim zamanı LRU için güncellenir"""
+    path = _layer_cache_path(key)
+    try:
+        stem = np.load(path, mmap_mode="r")
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    return stem
+
+
+@profiled("cache_store", "cache")
+def layer_cache_store(key, stem):
+    """Stem'i önbelleğe yaz (geçici dosya + os.replace: eşzamanlı işçilerde yarım dosya oluşmaz)"""
+    os.makedirs(LAYER_CACHE_DIR, exist_ok=True)
+    path = _layer_cache_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as out:
+        np.save(out, stem)
+    os.replace(tmp_path, path)
+
+
+def _layer_cache_entries():
+    """(son erişim, boyut, yol) listesi"""
+    if not os.path.isdir(LAYER_CACHE_DIR):
+        return []
+    entries = []
+    for entry in os.scandir(LAYER_CACHE_DIR):
+        if entry.name.endswith(".npy"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return entries
+
+
+def evict_layer_cache(max_mb=None):
+    """En uzun süredir kullanılmayan stem'leri toplam boyut sınırın altına inene dek sil"""
+    max_bytes = (LAYER_CACHE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+    entries = sorted(_layer_cache_entries())
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+    
+    return removed
+
+
+def layer_cache_stats():
+    """Katman önbelleği dosya sayısı ve toplam boyutu (MB)"""
+    entries = _layer_cache_entries()
+    return {"files": len(entries), "size_mb": sum(size for _, size, _ in entries) / (1024 * 1024)}
+
+
+def _render_stem(layer, duration, sr, rng):
+    """Katmanın blog/noise/brainwave fonksiyonunu çağır"""
+    if layer["kind"] == "natural":
+        with profile_stage(f"synthesis:{layer['name']}", "synthesis"):
+            blog_signal = NATURAL_BLOGS[layer["name"]](duration, sr, layer["weight"], layer["naturalness"], layer["nat_params"], rng=rng)
+        # Frekans bandı uygula
+        return apply_bandpass_filter(blog_signal, sr, layer["freq_range"])
+    
+    if layer["kind"] == "noise":
+        # Renk kazançları doğrudan toplama katlanır: her örnek bir kez okunur
+        noises = generate_colored_noises(layer["names"], duration, sr, 0.3, rng=rng, staged=True)
+        stem = np.zeros(int(duration * sr), dtype=render_dtype())
+        for name in layer["names"]:
+            noises[name].accumulate_into(stem)
+        return stem
+    
+    with profile_stage(f"synthesis:{layer['name']}", "synthesis"):
+        return BRAINWAVE_BLOGS[layer["name"]](duration, sr, layer["amplitude"], layer["mode"], rng=rng)
+
+
+def is_circular(layer):
+    """FFT ile dairesel üretilen katman: döngü segmenti kendiliğinden dikişsizdir"""
+    return layer["kind"] == "noise" and all(name in CIRCULAR_NOISE_TYPES for name in layer["names"])
+
+
+def uses_loop(layer, duration):
+    """Katman bu süre için döngüden mi üretilecek"""
+    return layer.get("loop") is not None and duration >= layer["loop"]["seconds"]
+
+
+def render_loop(layer, sr, rng):
+    """
+    Katmanın LOOP_SECONDS uzunluğunda dikişsiz döngü segmentini üret.
+    Dairesel (FFT) katmanlar doğrudan döngü uzunluğunda üretilir; diğerleri
+    crossfade payıyla üretilip crossfade_loop ile kapatılır.
+    """
+    spec = layer["loop"]
+    loop_samples = int(spec["seconds"] * sr)
+    if is_circular(layer):
+        return _render_stem(layer, loop_samples / sr, sr, rng)
+    
+    fade_samples = min(int(spec["crossfade"] * sr), loop_samples)
+    segment = _render_stem(layer, (loop_samples + fade_samples) / sr, sr, rng)
+    return crossfade_loop(segment, loop_samples)
+
+
+def render_layer(layer, duration, sr, seed, cache_key=None):
+    """
+    Tek bir katmanı (ağırlıksız) üret; seed (SeedSequence/int) ile tekrarlanabilir.
+    Döngü ayarlı katmanlar tek segmentten döşenir (uses_loop).
+    Dar bantlı katmanlar sr / multirate_factor iç hızında üretilip yukarı örneklenir.
+    cache_key verilirse üretilen stem katman önbelleğine yazılır.
+    """
+    rng = np.random.default_rng(seed)
+    factor = multirate_factor(layer, sr)
+    inner_sr = sr // factor
+    
+    with profile_stage(f"layer:{layer['key']}", "layer", duration=duration, sr=sr, rate_factor=factor):
+        if uses_loop(layer, duration):
+            print(f"Döngü: {layer['key']} ({layer['loop']['seconds']}s segment)")
+            loop = render_loop(layer, inner_sr, rng)
+            stem = tile_loop(loop, int(duration * inner_sr), layer["loop"]["variation"], rng)
+        else:
+            stem = _render_stem(layer, duration, inner_sr, rng)
+        stem = upsample_stem(stem, factor, int(duration * sr))
+        stem = apply_reverb(stem, sr, layer.get("reverb"))
+    
+    if cache_key is not None:
+        layer_cache_store(cache_key, stem)
+    
+    return stem
+
+
+def _init_render_worker(render_dtype_name, profile=False):
+    """İşçi süreç başlatıcı: ana süreçteki RENDER_DTYPE ve PROFILE_MODE'u devral (spawn başlangıcında da)"""
+    global RENDER_DTYPE, PROFILE_MODE
+    RENDER_DTYPE = render_dtype_name
+    PROFILE_MODE = profile
+    if profile:
+        profile_begin()
+
+
+def _render_layer_shared(shm_name, shape, row, layer, duration, sr, seed, cache_key):
+    """
+    İşçi süreç: katmanı doğrudan paylaşılan bellekteki satırına yaz (geri pickle yok).
+    Profil açıksa işçideki aşama kayıtları döndürülür.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        rows = np.ndarray(shape, dtype=render_dtype(), buffer=shm.buf)
+        rows[row] = render_layer(layer, duration, sr, seed, cache_key)
+        del rows
+    finally:
+        shm.close()
+    return profile_drain()
+
+
+def render_layers_parallel(mixed_signal, layers, duration, sr, seeds, workers, stems=None, cache_keys=None):
+    """
+    Katmanları süreç havuzunda üret ve mixed_signal'e ağırlıklı ekle ((n, 2) karışımda
+    stereo yerleşimle). Paylaşılan bellekte işçi başına bir satır vardır: katmanlar
+    sabit sırada karışıma eklenir, eklenen katmanın satırı sıradaki işe verilir.
+    Sonuç işçi sayısından bağımsız olarak seri render ile bit bit aynıdır; tepe ek
+    bellek katman sayısından bağımsız, işçi sayısı × katman uzunluğudur.
+    stems: önbellekten gelen hazır katmanlar (None olanlar üretilir)
+    cache_keys: üretilen katmanların yazılacağı önbellek anahtarları
+    """
+    n_samples = len(mixed_signal)
+    dtype = render_dtype()
+    stems = list(stems) if stems is not None else [None] * len(layers)
+    cache_keys = cache_keys if cache_keys is not None else [None] * len(layers)
+    pending = iter([index for index, stem in enumerate(stems) if stem is None])
+    n_slots = max(1, min(workers, sum(stem is None for stem in stems)))
+    shape = (n_slots, n_samples)
+    
+    shm = shared_memory.SharedMemory(create=True, size=max(1, n_slots * n_samples * dtype.itemsize))
+    try:
+        rows = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        with ProcessPoolExecutor(max_workers=n_slots,
+                                 initializer=_init_render_worker, initargs=(RENDER_DTYPE, PROFILE_MODE)) as pool:
+            free = list(range(n_slots))
+            running = {}  # katman indeksi → (future, satır)
+            
+            def submit_next():
+                index = next(pending, None)
+                if index is not None:
+                    row = free.pop()
+                    running[index] = (pool.submit(_render_layer_shared, shm.name, shape, row, layers[index],
+                                                  duration, sr, seeds[index], cache_keys[index]), row)
+            
+            for _ in range(n_slots):
+                submit_next()
+            # Sıradaki katman bitince eklenir (toplama sırası seri render ile aynı), satırı boşalır
+            for index, layer in enumerate(layers):
+                if stems[index] is not None:
+                    mix_stem(mixed_signal, stems[index], layer, sr)
+                    continue
+                future, row = running.pop(index)
+                _profile_spans.extend(future.result())
+                mix_stem(mixed_signal, rows[row], layer, sr)
+                free.append(row)
+                submit_next()
+        del rows
+    finally:
+        shm.close()
+        shm.unlink()
+    
+    return mixed_signal
+
+
+@profiled("mix_blogs", "pipeline")
+def mix_blogs(duration, sr, mix_config, noise_mix_config, brainwave_cfg, nat_params, scene_seed=None, workers=None,
+              noise_type_cfg=None, channels=None):
+    """
+    Tüm aktif blogları karıştır ve final sinyali oluştur.
+    scene_seed: sahne tohumu (None: SCENE_SEED, o da None ise rastgele)
+    workers: paralel işçi sayısı (None: PARALLEL_WORKERS)
+    noise_type_cfg: noise türü aktivasyonları (None: noise_types)
+    channels: çıkış kanal sayısı (None: STEREO_MODE'a göre); 2 ise katmanlar
+              stereo yerleşimle (n, 2) karışıma eklenir (STEREO_LAYERS)
+    
+    LAYER_CACHE açıksa ve tohum sabitse (scene_seed ya da SCENE_SEED) her katman
+    üretilmeden önce katman önbelleğinde aranır; rastgele tohumlu sahneler
+    tekrarlanamayacağı için önbelleğe yazılmaz.
+    """
+    use_cache = LAYER_CACHE and (scene_seed is not None or SCENE_SEED is not None)
+    scene_seed = resolve_scene_seed(scene_seed)
+    if workers is None:
+        workers = PARALLEL_WORKERS
+    channels = master_channels(channels)
+    
+    # Stereo: önceden ayrılmış, serpiştirilmiş (n, 2) karışım; katmanlar mono üretilir
+    n_samples = int(duration * sr)
+    mixed_signal = np.zeros((n_samples, 2) if channels == 2 else n_samples, dtype=render_dtype())
+    
+    print("=" * 70)
+    print(f"MIX BLOG BAŞLATILIYOR (seed={scene_seed}, workers={workers}, dtype={render_dtype()})")
+    print("=" * 70)
+    
+    layers = collect_layers(noise_mix_config, brainwave_cfg, nat_params, noise_type_cfg)
+    seeds = [layer_seed(scene_seed, layer["key"]) for layer in layers]
+    cache_keys = [None] * len(layers)
+    stems = [None] * len(layers)
+    
+    if use_cache:
+        cache_keys = [layer_cache_key(layer, duration, sr, scene_seed) for layer in layers]
+        stems = [layer_cache_load(key) for key in cache_keys]
+        for layer, stem in zip(layers, stems):
+            if stem is not None:
+                print(f"Önbellekten: {layer['key']}")
+    
+    n_pending = sum(stem is None for stem in stems)
+    if workers > 1 and n_pending > 1:
+        render_layers_parallel(mixed_signal, layers, duration, sr, seeds, workers, stems, cache_keys)
+    else:
+        for layer, seed, stem, key in zip(layers, seeds, stems, cache_keys):
+            if stem is None:
+                stem = render_layer(layer, duration, sr, seed, key)
+            mix_stem(mixed_signal, stem, layer, sr)
+    
+    if use_cache and n_pending > 0:
+        evict_layer_cache()
+    
+    # Frekans işlemleri uygula (ara normalizasyon yok: ölçek final normalizasyonda belirlenir)
+    if ENABLE_FREQUENCY_FILTERS and len(specific_frequencies) > 0:
+        print(f"Frekans işlemleri uygulanıyor: {len(specific_frequencies)} işlem")
+        mixed_signal = frequency_operations_inplace(mixed_signal, sr, specific_frequencies)
+    
+    # Master reverb (frekans işlemlerinden sonra, master işlemeden önce)
+    master_reverb = reverb_spec("master")
+    if master_reverb is not None:
+        print(f"Reverb uygulanıyor: wet={master_reverb['wet']:.2f}")
+        mixed_signal = apply_reverb(mixed_signal, sr, master_reverb)
+    
+    # Final master: LUFS kazancı + true-peak limiter ya da tepe normalizasyonu
+    # (tek tepe taraması + yerinde tek ölçekleme); ikisi de yerinde
+    if MASTER_MODE == "lufs":
+        with profile_stage("master"):
+            mixed_signal = master_process(mixed_signal, sr, channels, out=mixed_signal)
+    else:
+        mixed_signal = normalize_signal(mixed_signal, MASTER_AMPLITUDE, out=mixed_signal)
+    
+    print("=" * 70)
+    print(f"MIX TAMAMLANDI: {duration}s, {sr}Hz")
+    print("=" * 70)
+    
+    return mixed_signal
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BÖLÜM 11: AKIŞ (STREAMING) RENDER
+# ═══════════════════════════════════════════════════════════════════════════
+
+"""
+AKIŞ RENDER SİSTEMİ
+══════════════════════════════════════════════════════════════════════════════
+Tüm katmanlar sabit boyutlu blokların (BLOCK_SIZE frame) üreticisi (generator)
+olarak çalışır; bellek kullanımı DURATION'dan bağımsızdır.
+
+- Filtreler blok sınırlarında durumlarını (zi) taşır, tek seferlik sonuçla aynıdır
+- Olay tabanlı bloglar (yağmur, ateş...) kuyruklarını sonraki bloğa devreder
+- Normalizasyon, ilk STREAM_CALIBRATION_SECONDS saniyelik tampondaki tepeye göre
+  sabit bir kazanç hesaplar (DURATION bu süreden kısaysa tek seferlikle aynıdır);
+  ara aşamalar kırpmaz, taşma yalnızca master aşamasında sınırlanır
+- Varsayılan tek geçiştir: tepe tahmini aşılırsa master true-peak limiter ile
+  MASTER_AMPLITUDE altında tutulur (seyrek olaylı katmanlarda ilk pencere sessiz
+  kalabilir; seviye tahmini onlarca dB sapabilir)
+- Seviye ön geçişlerinde (STREAM_LEVEL_PREPASS; None iken yalnızca sabit tohumda,
+  ölçümler önbelleğe yazıldığı için bir kez) kalibrasyon tahmini yalnızca katman içi
+  ara aşamalarda kalır: ilk ön geçiş katman çıkışlarının, ikincisi master girişinin
+  tam tepesini ölçer ve son geçiş tek seferlikle aynı seviyelerle üretilir
+- Pembe/kahverengi gürültü FFT yerine durumlu IIR filtrelerle şekillendirilir
+"""
+
+# Paul Kellet / J.O. Smith pembe gürültü IIR yaklaşımı (-3 dB/oktav)
+PINK_IIR_B = np.array([0.049922035, -0.095993537, 0.050612699, -0.004408786])
+PINK_IIR_A = np.array([1.0, -2.494956002, 2.017265875, -0.522189400])
+
+# Kahverengi gürültü sızıntılı integratör köşe frekansı (DC kaymasını önler)
+BROWN_LEAK_HZ = 1.0
+
+
+def block_ranges(n_samples, block_size):
+    """(başlangıç, uzunluk) blok aralıkları"""
+    for start in range(0, n_samples, block_size):
+        yield start, min(block_size, n_samples - start)
+
+
+# İş parçacığına özel akış ayarları (HTTP sunucusu her istekte kendi penceresini kullanır)
+_stream_local = threading.local()
+
+
+def calibration_samples(sr):
+    """Akış normalizasyonu kalibrasyon penceresi (örnek)"""
+    seconds = getattr(_stream_local, "calibration_seconds", None)
+    if seconds is None:
+        seconds = STREAM_CALIBRATION_SECONDS
+    return max(1, int(seconds * sr))
+
+
+def level_prepass_enabled(seed_fixed):
+    """
+    Akış seviye ön geçişleri yapılsın mı (sunucu isteği kendi ayarını kullanır).
+    STREAM_LEVEL_PREPASS None ise yalnızca sabit tohumda: ölçümler önbelleğe yazılır,
+    ~3x render maliyeti sahne başına bir kez ödenir; rastgele tohumda tek geçiş.
+    """
+    enabled = getattr(_stream_local, "level_prepass", None)
+    if enabled is None:
+        enabled = STREAM_LEVEL_PREPASS
+    return seed_fixed if enabled is None else enabled
+
+
+class StreamLevels:
+    """
+    AKIŞ SEVİYE PLANI
+    ══════════════════════════════════════════════════════════════════════════════
+    Ölçülü normalizasyon düğümlerinin (katman çıkışları) tam akış tepeleri.
+    Düğümler her geçişte aynı sırayla başlar; sıra numarası düğümün kimliğidir.
+    
+    Geçiş   | peaks  | Düğüm davranışı
+    ──────────────────────────────────────────────────────────────────────────────
+    Ölçüm   | None   | Kalibrasyon kazancıyla çalışır, giriş tepesini kaydeder
+    Uygulama| liste  | Kayıtlı tepeden kesin kazanç (kalibrasyon tamponu yok)
+    
+    Ölçülü düğümlerin girişinde başka ölçülü düğüm yoktur: ara aşamalar her geçişte
+    aynı (deterministik) kalibrasyon kazancını bulur, kayıtlı tepe son geçişte de geçerlidir.
+    """
+    
+    def __init__(self, peaks=None):
+        self.peaks = peaks
+        self.measured = []
+        self.cursor = 0
+    
+    def node(self):
+        """Sıradaki düğüm: (kayıtlı tepe ya da None, ölçüm kaydı ya da None)"""
+        if self.peaks is None:
+            record = [0.0]
+            self.measured.append(record)
+            return None, record
+        peak = self.peaks[self.cursor] if self.cursor < len(self.peaks) else None
+        self.cursor += 1
+        return peak, None
+    
+    def measured_peaks(self):
+        return [record[0] for record in self.measured]
+
+
+def stream_in_levels(blocks, levels):
+    """Akışı, her blok çekilirken iş parçacığının seviye planı levels olacak şekilde sür"""
+    blocks = iter(blocks)
+    while True:
+        _stream_local.levels = levels
+        try:
+            block = next(blocks)
+        except StopIteration:
+            return
+        finally:
+            _stream_local.levels = None
+        yield block
+
+
+def stream_normalize(blocks, target_amplitude, calib_samples, measured=False, peak=None):
+    """
+    Akışı sabit kazançla normalize et (clip yok: taşma master aşamasında sınırlanır).
+    Kazanç kalibrasyon penceresindeki tepeden tahmin edilir.
+    measured: katman çıkışı; seviye planı altında tam akış tepesi ölçülür/kullanılır
+    peak: bilinen tam akış tepesi (kalibrasyon atlanır)
+    """
+    blocks = iter(blocks)
+    record = None
+    levels = getattr(_stream_local, "levels", None) if measured else None
+    if peak is None and levels is not None:
+        peak, record = levels.node()
+    
+    pending = []
+    if peak is None:
+        buffered = 0
+        for block in blocks:
+            pending.append(block)
+            buffered += len(block)
+            if buffered >= calib_samples:
+                break
+        peak = max((peak_abs(block) for block in pending), default=0.0)
+    gain = target_amplitude / peak if peak > 0 else 1.0
+    
+    # Tampon, zincir onu tükettiğinde serbest kalır
+    blocks, pending = itertools.chain(pending, blocks), None
+    for block in blocks:
+        if record is not None:
+            record[0] = max(record[0], peak_abs(block))
+        yield block * gain
+
+
+def stream_filter(blocks, stateful_filter):
+    """StatefulFilter'ı blok blok uygula (durum bloklar arasında taşınır)"""
+    for block in blocks:
+        yield stateful_filter.process(block)
+
+
+def stream_sosfilt(blocks, sos):
+    """SOS filtresini blok blok uygula"""
+    return stream_filter(blocks, StatefulFilter(sos))
+
+
+def stream_bandpass(blocks, sr, freq_range):
+    """apply_bandpass_filter akış versiyonu"""
+    return stream_filter(blocks, StatefulFilter.bandpass(sr, freq_range))
+
+
+def stream_timed(blocks, sr, func):
+    """Her bloğa mutlak zaman ekseniyle func(block, t) uygula"""
+    start = 0
+    for block in blocks:
+        t = (start + np.arange(len(block))) / sr
+        yield func(block, t)
+        start += len(block)
+
+
+def stream_sum(*streams):
+    """Hizalı blok akışlarını topla"""
+    for blocks in zip(*streams):
+        yield sum(blocks[1:], blocks[0])
+
+
+def stream_advance(blocks, shift):
+    """np.roll(x, -shift) akış versiyonu: ilk shift örnek sona taşınır, blok boyları korunur"""
+    if shift <= 0:
+        yield from blocks
+        return
+    
+    head = []
+    need_head = shift
+    buffer = np.zeros(0)
+    lengths = []
+    
+    for block in blocks:
+        lengths.append(len(block))
+        if need_head > 0:
+            head.append(block[:need_head])
+            need_head -= len(head[-1])
+            block = block[len(head[-1]):]
+        buffer = np.concatenate([buffer, block])
+        while lengths and len(buffer) >= lengths[0]:
+            length = lengths.pop(0)
+            yield buffer[:length]
+            buffer = buffer[length:]
+    
+    buffer = np.concatenate([buffer] + head)
+    for length in lengths:
+        yield buffer[:length]
+        buffer = buffer[length:]
+
+
+class EventScheduler:
+    """
+    Toplam olay sayısını koruyarak olay başlangıçlarını bloklara dağıtır.
+    Tek seferlik render'daki [0, onset_limit) aralığında düzgün dağılımla aynıdır.
+    """
+    
+    def __init__(self, n_events, onset_limit, rng):
+        self.rng = rng
+        self.remaining = n_events
+        self.onset_limit = max(1, onset_limit)
+        self.cursor = 0
+    
+    def onsets(self, start, length):
+        """[start, start+length) aralığına düşen olay başlangıçları"""
+        end = min(start + length, self.onset_limit)
+        span = end - self.cursor
+        if span <= 0 or self.remaining <= 0:
+            return np.zeros(0, dtype=int)
+        
+        count = self.rng.binomial(self.remaining, span / (self.onset_limit - self.cursor))
+        onsets = self.cursor + self.rng.integers(0, span, count)
+        self.remaining -= count
+        self.cursor = end
+        return onsets
+
+
+def stream_events(n_samples, block_size, max_len, render):
+    """
+    Olay tabanlı blok üreticisi.
+    render(buffer, start, length): başlangıcı bloğa düşen olayları buffer'a ekler;
+    buffer bloktan max_len uzundur, taşan kuyruk sonraki bloğa devredilir.
+    """
+    carry = np.zeros(max_len)
+    for start, length in block_ranges(n_samples, block_size):
+        buffer = np.zeros(length + max_len)
+        buffer[:max_len] += carry
+        render(buffer, start, length)
+        carry = buffer[length:].copy()
+        yield buffer[:length]
+
+
+def stream_perlin_noise(n_samples, sr, octaves=4, block_size=BLOCK_SIZE, rng=None):
+    """Perlin-benzeri fraktal noise blok üreticisi (blok başına O(blok) bellek)"""
+    perlin = FractalNoise(octaves, rng)
+    return (perlin.render(start, length) for start, length in block_ranges(n_samples, block_size))
+
+
+def stream_naturalness(blocks, sr, naturalness, nat_params, n_samples, target_amplitude, block_size=BLOCK_SIZE, rng=None):
+    """
+    apply_naturalness akış versiyonu.
+    target_amplitude: girişin tepe değeri (tek seferlikteki max(|sig|)), çıkış 1.1 katına normalize edilir.
+    Mikro jitter akışta yalnızca ileri yönde dairesel kaydırma olarak uygulanır.
+    Çıkış katmanın son normalizasyonudur (seviye planında ölçülür); naturalness 0 iken
+    giriş target_amplitude tepesine yeniden ölçeklenir.
+    """
+    rng = np.random.default_rng(rng)
+    if naturalness <= 0.0:
+        return stream_normalize(blocks, target_amplitude, calibration_samples(sr), measured=True)
+    
+    result = _naturalness_modulation_blocks(blocks, sr, naturalness, nat_params, n_samples, rng)
+    
+    # Mikro timing jitter (temporal varyasyon)
+    if nat_params["micro_timing_jitter"] > 0 and naturalness > 0.6:
+        jitter_amount = nat_params["micro_timing_jitter"] * naturalness / 1000.0
+        jitter_samples = int(jitter_amount * sr)
+        if jitter_samples > 0:
+            shift = rng.integers(-jitter_samples, jitter_samples + 1)
+            result = stream_advance(result, abs(shift))
+    
+    # Perlin noise overlay (fraktal doku)
+    if naturalness > 0.7 and nat_params["perlin_octaves"] > 0:
+        perlin = stream_perlin_noise(n_samples, sr, nat_params["perlin_octaves"], block_size, rng=rng)
+        perlin_gain = 0.05 * (naturalness - 0.7) * 3.33
+        result = (block + perlin_block * perlin_gain for block, perlin_block in zip(result, perlin))
+    
+    # Spektral tilt (frekans dengesi)
+    if nat_params["spectral_tilt"] != 0.0:
+        tilt_factor = nat_params["spectral_tilt"] / 12.0 * naturalness
+        result = _tilt_blocks(result, spectral_tilt_sos(sr, tilt_factor))
+    
+    return stream_normalize(result, target_amplitude * 1.1, calibration_samples(sr), measured=True)
+
+
+def _naturalness_modulation_blocks(blocks, sr, naturalness, nat_params, n_samples, rng):
+    """Genlik/frekans modülasyonu, envelope ve granüler doku (NaturalnessStage, blok durumlu)"""
+    stage = NaturalnessStage(sr, naturalness, nat_params, n_samples, rng)
+    for block in blocks:
+        yield stage.process(np.array(block, dtype=render_dtype()))
+
+
+def _tilt_blocks(blocks, tilt_filter):
+    """Spektral tilt karışımı (spectral_tilt_sos), filtre durumu bloklar arasında taşınır"""
+    tilt = StatefulFilter(tilt_filter)
+    for block in blocks:
+        yield tilt.process(block)
+
+
+# ─── Gürültü akışları ─────────────────────────────────────────────────────
+
+def _white_blocks(n_samples, block_size, rng):
+    for _, length in block_ranges(n_samples, block_size):
+        yield rng.standard_normal(length, dtype=render_dtype())
+
+
+def _pink_shape(white_blocks, sr):
+    """IIR 1/f yaklaşımı"""
+    zi = np.zeros(len(PINK_IIR_A) - 1)
+    for white in white_blocks:
+        # Kutuplar birim çembere yakın: filtre durumu float64'te tutulur
+        pink, zi = sps.lfilter(PINK_IIR_B, PINK_IIR_A, white, zi=zi)
+        yield pink.astype(white.dtype, copy=False)
+
+
+def _brown_shape(white_blocks, sr):
+    """Sızıntılı integratör 1/f²"""
+    leak = 1.0 - 2 * np.pi * BROWN_LEAK_HZ / sr
+    zi = np.zeros(1)
+    for white in white_blocks:
+        brown, zi = sps.lfilter([1.0], [1.0, -leak], white, zi=zi)
+        yield brown.astype(white.dtype, copy=False)
+
+
+def _difference_blocks(blocks):
+    """Birinci fark (+6 dB/oktav eğim), önceki örnek bloklar arasında taşınır"""
+    previous = 0.0
+    for block in blocks:
+        diff = np.diff(block, prepend=previous)
+        if len(block) > 0:
+            previous = block[-1]
+        yield diff
+
+
+def _gray_shape(white_blocks, sr):
+    """Pembe gürültü + equal-loudness yaklaşımı band filtre"""
+    return stream_sosfilt(_pink_shape(white_blocks, sr), design_sos(2, (0.1, 0.9), 'band'))
+
+
+def _green_shape(white_blocks, sr):
+    """500Hz merkezli band"""
+    center_norm = 500 / (sr / 2)
+    if center_norm >= 0.999:
+        return white_blocks
+    sos = design_sos(4, (max(0.001, center_norm - 0.3), min(0.999, center_norm + 0.3)), 'band')
+    return stream_sosfilt(white_blocks, sos)
+
+
+# Renk adı: beyaz blok akışını o renge çeviren şekillendirici (white_blocks, sr) -> bloklar
+STREAM_NOISE_SHAPERS = {
+    "white": lambda white_blocks, sr: white_blocks,
+    "pink": _pink_shape,
+    "brown": _brown_shape,
+    "blue": lambda white_blocks, sr: _difference_blocks(_pink_shape(white_blocks, sr)),    # pembenin farkı, f
+    "violet": lambda white_blocks, sr: _difference_blocks(white_blocks),                   # beyazın farkı, f²
+    "gray": _gray_shape,
+    "green": _green_shape
+}
+
+
+def stream_noise_spectrum(colors, duration, sr, amplitude=0.5, block_size=BLOCK_SIZE, rng=None, measured=False):
+    """
+    generate_colored_noises akış versiyonu: tüm renkler tek beyaz gürültü akışını
+    paylaşır (itertools.tee), her renk ayrı normalize edilip toplanır.
+    Bilinmeyen renkler beyaz gürültü olarak üretilir.
+    measured: renkler katman çıkışıdır (seviye planında ölçülür)
+    """
+    rng = np.random.default_rng(rng)
+    n_samples = int(duration * sr)
+    whites = itertools.tee(_white_blocks(n_samples, block_size, rng), len(colors))
+    streams = [
+        stream_normalize(STREAM_NOISE_SHAPERS.get(color, STREAM_NOISE_SHAPERS["white"])(white_blocks, sr),
+                         amplitude, calibration_samples(sr), measured)
+        for color, white_blocks in zip(colors, whites)
+    ]
+    return stream_sum(*streams)
+
+
+def stream_white_noise(duration, sr, amplitude=0.5, block_size=BLOCK_SIZE, rng=None):
+    """Beyaz gürültü blok üreticisi"""
+    return stream_noise_spectrum(["white"], duration, sr, amplitude, block_size, rng=rng)
+
+
+def stream_pink_noise(duration, sr, amplitude=0.5, block_size=BLOCK_SIZE, rng=None):
+    """Pembe gürültü blok üreticisi (IIR 1/f yaklaşımı)"""
+    return stream_noise_spectrum(["pink"], duration, sr, amplitude, block_size, rng=rng)
+
+
+def stream_brown_noise(duration, sr, amplitude=0.5, block_size=BLOCK_SIZE, rng=None):
+    """Kahverengi gürültü blok üreticisi (sızıntılı integratör 1/f²)"""
+    return stream_noise_spectrum(["brown"], duration, sr, amplitude, block_size, rng=rng)
+
+
+def stream_blue_noise(duration, sr, amplitude=0.5, block_size=BLOCK_SIZE, rng=None):
+    """Mavi gürültü blok üreticisi (pembe gürültünün farkı, f)"""
+    return stream_noise_spectrum(["blue"], duration, sr, amplitude, block_size, rng=rng)
+
+
+def stream_violet_noise(duration, sr, amplitude=0.5, block_size=BLOCK_SIZE, rng=None):
+    """Mor gürültü blok üreticisi (beyaz gürültünün farkı, f²)"""
+    return stream_noise_spectrum(["violet"], duration, sr, amplitude, block_size, rng=rng)
+
+
+def stream_gray_noise(duration, sr, amplitude=0.5, block_size=BLOCK_SIZE, rng=None):
+    """Gri gürültü blok üreticisi"""
+    return stream_noise_spectrum(["gray"], duration, sr, amplitude, block_size, rng=rng)
+
+
+def stream_green_noise(duration, sr, amplitude=0.5, block_size=BLOCK_SIZE, rng=None):
+    """Yeşil gürültü blok üreticisi"""
+    return stream_noise_spectrum(["green"], duration, sr, amplitude, block_size, rng=rng)
+
+
+def stream_noise(noise_type, duration, sr, amplitude=0.5, block_size=BLOCK_SIZE, rng=None):
+    """generate_noise akış versiyonu"""
+    return stream_noise_spectrum([noise_type], duration, sr, amplitude, block_size, rng=rng)
+
+
+# ─── Ses blog akışları ────────────────────────────────────────────────────
+
+def stream_blog_rain(duration, sr, amplitude=0.5, naturalness=0.7, nat_params=None, block_size=BLOCK_SIZE, rng=None):
+    """sound_blog_rain akış versiyonu"""
+    rng = np.random.default_rng(rng)
+    if nat_params is None:
+        nat_params = naturalness_params
+    
+    n_samples = int(duration * sr)
+    
+    density = 0.7
+    drop_freq_center = 1200
+    drop_freq_variance = 300
+    impact_sharpness = 0.6
+    
+    drops = EventScheduler(int(density * duration * 200), n_samples, rng)
+    
+    def render(buffer, start, length):
+        onsets = drops.onsets(start, length) - start
+        add_events(buffer, sr, onsets,
+                   *rain_drop_params(len(onsets), sr, drop_freq_center, drop_freq_variance, impact_sharpness, rng))
+    
+    rain = stream_events(n_samples, block_size, int(sr * 0.04), render)
+    
+    background = stream_pink_noise(duration, sr, amplitude * 0.3, block_size, rng=rng)
+    background = stream_bandpass(background, sr, (400, 2500))
+    
+    rain = stream_normalize(stream_sum(rain, background), amplitude, calibration_samples(sr))
+    return stream_naturalness(rain, sr, naturalness, nat_params, n_samples, amplitude, block_size, rng=rng)
+
+
+def stream_blog_thunder(duration, sr, amplitude=0.7, naturalness=0.9, nat_params=None, block_size=BLOCK_SIZE, rng=None):
+    """sound_blog_thunder akış versiyonu"""
+    rng = np.random.default_rng(rng)
+    if nat_params is None:
+        nat_params = naturalness_params
+    
+    n_samples = int(duration * sr)
+    
+    rumble_freq = 60
+    strike_intensity = 0.8
+    decay_time = 2.5
+    rumble_variation = 0.5
+    
+    strike_len = int(decay_time * sr)
+    strikes = EventScheduler(int(duration / 5) + 1, n_samples - strike_len, rng)
+    
+    t_strike = np.arange(strike_len) / sr
+    freq_mod = rumble_freq * (1.0 + rumble_variation * sine_wave(0.5, t_strike))
+    phase = np.cumsum(freq_mod, dtype=np.float64) / sr
+    envelope = np.exp(-t_strike / decay_time) * strike_intensity
+    tone = sine_wave(1.0, phase) * envelope
+    
+    def render(buffer, start, length):
+        for pos in strikes.onsets(start, length) - start:
+            noise = rng.standard_normal(strike_len, dtype=render_dtype()) * envelope * 0.3
+            buffer[pos:pos+strike_len] += tone + noise
+    
+    thunder = stream_events(n_samples, block_size, strike_len, render)
+    thunder = stream_bandpass(thunder, sr, (20, 120))
+    thunder = stream_normalize(thunder, amplitude, calibration_samples(sr))
+    return stream_naturalness(thunder, sr, naturalness, nat_params, n_samples, amplitude, block_size, rng=rng)
+
+
+def stream_blog_wind(duration, sr, amplitude=0.6, naturalness=0.6, nat_params=None, block_size=BLOCK_SIZE, rng=None):
+    """sound_blog_wind akış versiyonu"""
+    rng = np.random.default_rng(rng)
+    if nat_params is None:
+        nat_params = naturalness_params
+    
+    n_samples = int(duration * sr)
+    
+    gust_frequency = 0.15
+    wind_intensity = 0.6
+    modulation_depth = 0.7
+    
+    def gust(block, t):
+        gust_lfo = (1.0 + sine_wave(gust_frequency, t)) / 2.0
+        return block * (0.5 + gust_lfo * modulation_depth * 0.5)
+    
+    wind = stream_pink_noise(duration, sr, wind_intensity, block_size, rng=rng)
+    wind = stream_bandpass(wind, sr, (100, 800))
+    wind = stream_normalize(stream_timed(wind, sr, gust), amplitude, calibration_samples(sr))
+    return stream_naturalness(wind, sr, naturalness, nat_params, n_samples, amplitude, block_size, rng=rng)
+
+
+def stream_blog_ocean(duration, sr, amplitude=0.7, naturalness=0.8, nat_params=None, block_size=BLOCK_SIZE, rng=None):
+    """sound_blog_ocean akış versiyonu"""
+    rng = np.random.default_rng(rng)
+    if nat_params is None:
+        nat_params = naturalness_params
+    
+    n_samples = int(duration * sr)
+    
+    wave_frequency = 0.12
+    wave_depth = 0.8
+    foam_amount = 0.4
+    tide_variation = 0.3
+    
+    def wave_envelope(t):
+        envelope = 0.6 + (1.0 + sine_wave(wave_frequency, t)) / 2.0 * 0.4
+        return envelope * (1.0 + sine_wave(0.02, t) * tide_variation)
+    
+    ocean = stream_brown_noise(duration, sr, wave_depth, block_size, rng=rng)
+    ocean = stream_bandpass(ocean, sr, (30, 500))
+    ocean = stream_timed(ocean, sr, lambda block, t: block * wave_envelope(t))
+    
+    if foam_amount > 0:
+        foam = stream_white_noise(duration, sr, foam_amount * 0.3, block_size, rng=rng)
+        foam = stream_bandpass(foam, sr, (800, 3000))
+        foam = stream_timed(foam, sr, lambda block, t: block * wave_envelope(t) ** 2)
+        ocean = stream_sum(ocean, foam)
+    
+    ocean = stream_normalize(ocean, amplitude, calibration_samples(sr))
+    return stream_naturalness(ocean, sr, naturalness, nat_params, n_samples, amplitude, block_size, rng=rng)
+
+
+def stream_blog_fire(duration, sr, amplitude=0.6, naturalness=0.75, nat_params=None, block_size=BLOCK_SIZE, rng=None):
+    """sound_blog_fire akış versiyonu"""
+    rng = np.random.default_rng(rng)
+    if nat_params is None:
+        nat_params = naturalness_params
+    
+    n_samples = int(duration * sr)
+    
+    crackle_density = 0.6
+    pop_intensity = 0.7
+    flame_roar = 0.4
+    
+    crackles = EventScheduler(int(crackle_density * duration * 30), n_samples, rng)
+    
+    def render(buffer, start, length):
+        onsets = crackles.onsets(start, length) - start
+        add_events(buffer, sr, onsets, *fire_crackle_params(len(onsets), sr, pop_intensity, rng))
+    
+    fire = stream_events(n_samples, block_size, int(sr * 0.06), render)
+    
+    if flame_roar > 0:
+        roar = stream_pink_noise(duration, sr, flame_roar * 0.5, block_size, rng=rng)
+        roar = stream_bandpass(roar, sr, (200, 2000))
+        fire = stream_sum(fire, roar)
+    
+    fire = stream_bandpass(fire, sr, (800, 5000))
+    fire = stream_normalize(fire, amplitude, calibration_samples(sr))
+    return stream_naturalness(fire, sr, naturalness, nat_params, n_samples, amplitude, block_size, rng=rng)
+
+
+def stream_blog_crickets(duration, sr, amplitude=0.5, naturalness=0.85, nat_params=None, block_size=BLOCK_SIZE, rng=None):
+    """sound_blog_crickets akış versiyonu"""
+    rng = np.random.default_rng(rng)
+    if nat_params is None:
+        nat_params = naturalness_params
+    
+    n_samples = int(duration * sr)
+    
+    chirp_rate = 3.0
+    cricket_count = 8
+    pitch_center = 5000
+    pitch_variation = 500
+    
+    chirp_len = int(0.05 * sr)
+    t_chirp = np.arange(chirp_len) / sr
+    envelope = np.sin(np.pi * t_chirp / (chirp_len / sr)) ** 2
+    
+    # Her cırcır böceği: (chirp tonu, zamanlayıcı)
+    crickets = []
+    for _ in range(cricket_count):
+        cricket_pitch = pitch_center + (rng.random() - 0.5) * pitch_variation * 2
+        chirp_period = sr / chirp_rate * (0.8 + rng.random() * 0.4)
+        n_chirps = int(duration * chirp_rate * (0.8 + rng.random() * 0.4))
+        chirp_tone = sine_wave(cricket_pitch, t_chirp) * envelope * 0.3
+        crickets.append((chirp_tone, EventScheduler(n_chirps, n_samples - int(chirp_period), rng)))
+    
+    def render(buffer, start, length):
+        for chirp_tone, chirps in crickets:
+            add_kernel_events(buffer, chirps.onsets(start, length) - start, chirp_tone)
+    
+    chirps = stream_events(n_samples, block_size, chirp_len, render)
+    chirps = stream_normalize(chirps, amplitude, calibration_samples(sr))
+    return stream_naturalness(chirps, sr, naturalness, nat_params, n_samples, amplitude, block_size, rng=rng)
+
+
+def stream_blog_car(duration, sr, amplitude=0.6, naturalness=0.5, nat_params=None, block_size=BLOCK_SIZE, rng=None):
+    """sound_blog_car akış versiyonu"""
+    rng = np.random.default_rng(rng)
+    if nat_params is None:
+        nat_params = naturalness_params
+    
+    n_samples = int(duration * sr)
+    
+    engine_rpm = 1500
+    harmonic_count = 5
+    vibration_amount = 0.5
+    road_noise = 0.3
+    
+    base_freq = engine_rpm / 60.0
+    
+    engine, vibration = car_engine_banks(sr, base_freq, harmonic_count, vibration_amount)
+    car = (render_modulated(engine, vibration, length) for _, length in block_ranges(n_samples, block_size))
+    
+    if road_noise > 0:
+        road = stream_pink_noise(duration, sr, road_noise * 0.4, block_size, rng=rng)
+        road = stream_bandpass(road, sr, (100, 500))
+        car = stream_sum(car, road)
+    
+    car = stream_bandpass(car, sr, (80, 400))
+    car = stream_normalize(car, amplitude, calibration_samples(sr))
+    return stream_naturalness(car, sr, naturalness, nat_params, n_samples, amplitude, block_size, rng=rng)
+
+
+def stream_blog_train(duration, sr, amplitude=0.7, naturalness=0.6, nat_params=None, block_size=BLOCK_SIZE, rng=None):
+    """sound_blog_train akış versiyonu"""
+    rng = np.random.default_rng(rng)
+    if nat_params is None:
+        nat_params = naturalness_params
+    
+    n_samples = int(duration * sr)
+    
+    wheel_rhythm = 2.5
+    rail_rumble = 0.7
+    mechanical_clank = 0.5
+    
+    click_period = sr / wheel_rhythm
+    n_clicks = int(duration * wheel_rhythm)
+    click_len = int(0.05 * sr)
+    click_pos = (np.arange(n_clicks) * click_period).astype(int)
+    
+    def render(buffer, start, length):
+        onsets = click_pos[(click_pos >= start) & (click_pos < start + length)] - start
+        add_events(buffer, sr, onsets, *train_click_params(len(onsets), sr, mechanical_clank, rng))
+    
+    train = stream_events(n_samples, block_size, click_len, render)
+    
+    if rail_rumble > 0:
+        rumble = stream_brown_noise(duration, sr, rail_rumble * 0.6, block_size, rng=rng)
+        rumble = stream_bandpass(rumble, sr, (60, 300))
+        train = stream_sum(train, rumble)
+    
+    train = stream_normalize(train, amplitude, calibration_samples(sr))
+    return stream_naturalness(train, sr, naturalness, nat_params, n_samples, amplitude, block_size, rng=rng)
+
+
+def stream_blog_vinyl(duration, sr, amplitude=0.4, naturalness=0.7, nat_params=None, block_size=BLOCK_SIZE, rng=None):
+    """sound_blog_vinyl akış versiyonu"""
+    rng = np.random.default_rng(rng)
+    if nat_params is None:
+        nat_params = naturalness_params
+    
+    n_samples = int(duration * sr)
+    
+    crackle_density = 0.5
+    pop_frequency = 1.0
+    dust_noise = 0.3
+    
+    crackles = EventScheduler(int(crackle_density * duration * 100), n_samples, rng)
+    pops = EventScheduler(int(pop_frequency * duration), n_samples, rng)
+    pop_len = int(sr * 0.01)
+    
+    def render(buffer, start, length):
+        onsets = crackles.onsets(start, length) - start
+        add_events(buffer, sr, onsets, *vinyl_crackle_params(len(onsets), sr, rng))
+        onsets = pops.onsets(start, length) - start
+        add_events(buffer, sr, onsets, *vinyl_pop_params(len(onsets), sr, rng))
+    
+    vinyl = stream_events(n_samples, block_size, max(int(sr * 0.004), pop_len), render)
+    
+    if dust_noise > 0:
+        dust = stream_pink_noise(duration, sr, dust_noise * 0.2, block_size, rng=rng)
+        vinyl = stream_sum(vinyl, dust)
+    
+    vinyl = stream_bandpass(vinyl, sr, (200, 4000))
+    vinyl = stream_normalize(vinyl, amplitude, calibration_samples(sr))
+    return stream_naturalness(vinyl, sr, naturalness, nat_params, n_samples, amplitude, block_size, rng=rng)
+
+
+STREAM_BLOGS = {
+    "rain": stream_blog_rain,
+    "thunder": stream_blog_thunder,
+    "wind": stream_blog_wind,
+    "ocean": stream_blog_ocean,
+    "fire": stream_blog_fire,
+    "crickets": stream_blog_crickets,
+    "car": stream_blog_car,
+    "train": stream_blog_train,
+    "vinyl": stream_blog_vinyl
+}
+
+
+# ─── Brainwave akışları ───────────────────────────────────────────────────
+
+# Dalga adı: (merkez frekans Hz, modülasyon hızı Hz, boost bandı Hz)
+STREAM_BRAINWAVES = {
+    "delta": (2.0, 0.1, (0.5, 4.0)),
+    "theta": (6.0, 0.15, (4.0, 8.0)),
+    "alpha": (10.0, 0.2, (8.0, 13.0)),
+    "beta": (20.0, 0.25, (13.0, 30.0)),
+    "gamma": (40.0, 0.3, (30.0, 100.0))
+}
+
+
+def stream_brainwave(wave_name, duration, sr, amplitude=0.3, mode="tone", block_size=BLOCK_SIZE, rng=None):
+    """brainwave_blog_* akış versiyonu"""
+    rng = np.random.default_rng(rng)
+    n_samples = int(duration * sr)
+    center_frequency, mod_rate, band = STREAM_BRAINWAVES[wave_name]
+    modulation_depth = 0.3
+    
+    if mode == "tone":
+        carrier, lfo = brainwave_banks(sr, center_frequency, mod_rate, modulation_depth)
+        waves = (render_modulated(carrier, lfo, length) for _, length in block_ranges(n_samples, block_size))
+        return stream_normalize(waves, amplitude, calibration_samples(sr), measured=True)
+    
+    elif mode == "boost":
+        noise = stream_noise_spectrum(["pink"], duration, sr, amplitude, block_size, rng=rng, measured=True)
+        return stream_bandpass(noise, sr, band)
+    
+    return (np.zeros(length, dtype=render_dtype()) for _, length in block_ranges(n_samples, block_size))
+
+
+# ─── Frekans işlemleri ve mix akışı ───────────────────────────────────────
+
+def stream_frequency_operations(blocks, sr, operations):
+    """
+    apply_frequency_operations akış versiyonu (filtre durumları taşınır).
+    Son normalizasyon master normalizasyonuna bırakılır.
+    """
+    eq = compile_frequency_operations(operations, sr)
+    eq_filter = eq.filter()
+    oscillators = eq.oscillators()
+    
+    for block in blocks:
+        output = block
+        if eq_filter is not None:
+            output = eq_filter.process(output)
+        if oscillators is not None:
+            output = output + as_channels(oscillators.render(len(block)), output)
+        yield output
+
+
+def stream_layer(layer, duration, sr, block_size, seed):
+    """render_layer akış versiyonu: katman işini blok üreticisine çevir"""
+    factor = multirate_factor(layer, sr)
+    blocks = _stream_stem(layer, duration, sr // factor, max(1, block_size // factor), np.random.default_rng(seed))
+    blocks = stream_upsample(blocks, factor, int(duration * sr), block_size)
+    return stream_reverb(blocks, sr, layer.get("reverb"))
+
+
+def _stream_stem(layer, duration, sr, block_size, rng):
+    """Katmanın reverb öncesi blok üreticisi (döngü ya da blog/noise/brainwave akışı)"""
+    if uses_loop(layer, duration):
+        print(f"Döngü: {layer['key']} ({layer['loop']['seconds']}s segment)")
+        loop = render_loop(layer, sr, rng)
+        return loop_blocks(loop, int(duration * sr), block_size, layer["loop"]["variation"], rng)
+    
+    if layer["kind"] == "natural":
+        blog_stream = STREAM_BLOGS[layer["name"]](duration, sr, layer["weight"], layer["naturalness"], layer["nat_params"],
+                                                  block_size, rng=rng)
+        return stream_bandpass(blog_stream, sr, layer["freq_range"])
+    
+    if layer["kind"] == "noise":
+        return stream_noise_spectrum(layer["names"], duration, sr, 0.3, block_size, rng=rng, measured=True)
+    
+    return stream_brainwave(layer["name"], duration, sr, layer["amplitude"], layer["mode"], block_size, rng=rng)
+
+
+def stream_mix_blogs(duration, sr, mix_config, noise_mix_config, brainwave_cfg, nat_params, block_size=BLOCK_SIZE, scene_seed=None,
+                     noise_type_cfg=None, channels=None):
+    """
+    mix_blogs akış versiyonu: karışımı BLOCK_SIZE frame'lik bloklar halinde üretir.
+    Bellek kullanımı DURATION'dan bağımsızdır.
+    Katman tohumları mix_blogs ile aynı anahtarlardan türetilir (natural:rain, noise:pink, ...).
+    noise_type_cfg: noise türü aktivasyonları (None: noise_types)
+    channels: çıkış kanal sayısı (None: STEREO_MODE'a göre); 2 ise (n, 2) bloklar
+              (katmanlar mix_blogs gibi stereo yerleşimle karışır)
+    
+    Seviye ön geçişlerinde (level_prepass_enabled) karışım önce katman çıkış tepeleri,
+    sonra master tepesi için yalnızca ölçülerek üretilir; MASTER_MODE="lufs" ve MASTER_LOUDNESS_TWO_PASS
+    iken master ön geçişi loudness ölçer (aynı tohum, aynı bloklar). Sabit tohumlu
+    sahnelerde ölçümler output/loudness_cache'e yazılır ve sonraki render'larda ön
+    geçişler atlanır.
+    """
+    n_samples = int(duration * sr)
+    seed_fixed = scene_seed is not None or SCENE_SEED is not None
+    scene_seed = resolve_scene_seed(scene_seed)
+    
+    print("=" * 70)
+    print(f"AKIŞ MIX BAŞLATILIYOR (blok={block_size} frame, seed={scene_seed})")
+    print("=" * 70)
+    
+    layer_specs = collect_layers(noise_mix_config, brainwave_cfg, nat_params, noise_type_cfg)
+    operations = specific_frequencies if ENABLE_FREQUENCY_FILTERS else []
+    master_reverb = reverb_spec("master")
+    channels = master_channels(channels)
+    frame_shape = (2,) if channels == 2 else ()
+    
+    def mixed_blocks():
+        streams = [stream_layer(layer, duration, sr, block_size, layer_seed(scene_seed, layer["key"]))
+                   for layer in layer_specs]
+        # Stereo yerleşim durumu (dekorelatör) katman başına bloklar arasında taşınır
+        placers = [StereoPlacer(layer, sr) for layer in layer_specs] if channels == 2 else None
+        if not streams:
+            for _, length in block_ranges(n_samples, block_size):
+                yield np.zeros((length,) + frame_shape, dtype=render_dtype())
+            return
+        for blocks in zip(*streams):
+            mixed = np.zeros((len(blocks[0]),) + frame_shape, dtype=render_dtype())
+            for index, (block, layer) in enumerate(zip(blocks, layer_specs)):
+                if placers is not None:
+                    placers[index].add_into(mixed, block)
+                else:
+                    accumulate_scaled(mixed, block, layer["weight"])
+            yield mixed
+    
+    def premaster_blocks(layer_peaks=None):
+        mixed = mixed_blocks()
+        # Frekans işlemleri uygula
+        if len(operations) > 0:
+            mixed = stream_frequency_operations(mixed, sr, operations)
+        mixed = stream_reverb(mixed, sr, master_reverb)
+        return mixed if layer_peaks is None else stream_in_levels(mixed, StreamLevels(layer_peaks))
+    
+    if len(operations) > 0:
+        print(f"Frekans işlemleri (akış): {len(operations)} işlem")
+    if master_reverb is not None:
+        print(f"Reverb (akış): wet={master_reverb['wet']:.2f}")
+    
+    # Ölçüm önbelleği anahtarı (yalnızca sabit tohumlu sahneler tekrarlanabilir)
+    prepass = level_prepass_enabled(seed_fixed)
+    key = None
+    if seed_fixed and (prepass or (MASTER_MODE == "lufs" and MASTER_LOUDNESS_TWO_PASS)):
+        placements = [stereo_spec(layer) for layer in layer_specs] if channels == 2 else None
+        settings = {"block_size": block_size, "calibration": calibration_samples(sr), "levels": prepass,
+                    "master": MASTER_MODE}
+        key = loudness_cache_key(layer_specs, duration, sr, scene_seed, operations, master_reverb, placements, settings)
+    
+    # Seviye ön geçişleri: katman çıkış tepeleri, sonra (tepe modunda) master giriş tepesi
+    layer_peaks = master_peak = None
+    if prepass:
+        cached = level_cache_load(key) if key is not None else None
+        if cached is None:
+            print("Seviye ön geçişi (katman çıkışları)...")
+            levels = StreamLevels()
+            for _ in stream_in_levels(mixed_blocks(), levels):
+                pass
+            layer_peaks = levels.measured_peaks()
+            if MASTER_MODE != "lufs":
+                print("Seviye ön geçişi (master)...")
+                master_peak = 0.0
+                for block in premaster_blocks(layer_peaks):
+                    master_peak = max(master_peak, peak_abs(block))
+            if key is not None:
+                level_cache_store(key, layer_peaks, master_peak)
+        else:
+            layer_peaks, master_peak = cached
+            print("Seviyeler önbellekten")
+    
+    # Final master: tepe normalizasyonu ya da LUFS kazancı + true-peak limiter
+    if MASTER_MODE == "lufs":
+        integrated = None
+        if MASTER_LOUDNESS_TWO_PASS:
+            integrated = loudness_cache_load(key) if key is not None else None
+            if integrated is None:
+                print("Loudness ön geçişi (ölçüm)...")
+                meter = LoudnessMeter(sr)
+                for block in premaster_blocks(layer_peaks):
+                    meter.process(block)
+                integrated = meter.integrated()
+                if key is not None:
+                    loudness_cache_store(key, integrated)
+            else:
+                print(f"Loudness önbellekten: {integrated:.1f} LUFS")
+        yield from stream_master(premaster_blocks(layer_peaks), sr, channels, integrated)
+    else:
+        yield from stream_peak_master(premaster_blocks(layer_peaks), sr, master_peak)
+    
+    print("=" * 70)
+    print(f"AKIŞ MIX TAMAMLANDI: {duration}s, {sr}Hz")
+    print("=" * 70)
+
+
+def stream_tap(blocks, store, max_samples):
+    """Akıştan geçen ilk max_samples örneği store listesine kopyala (önizleme için)"""
+    captured = 0
+    for block in blocks:
+        if captured < max_samples:
+            store.append(block[:max_samples - captured].copy())
+            captured += len(store[-1])
+        yield block
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BÖLÜM 12: GÖRSELLEŞTİRME
+# ═══════════════════════════════════════════════════════════════════════════
+
+"""
+GÖRSELLEŞTİRME
+══════════════════════════════════════════════════════════════════════════════
+Grafik veri boyutu sinyal süresinden bağımsızdır:
+  - Dalga formu: piksel sütunu başına min/max zarfı (VISUALIZER_WIDTH_PX sütun)
+  - Spektrum: sinyale eşit aralıklı en fazla VISUALIZER_MAX_SEGMENTS Hann
+    pencereli segmentin ortalama güç spektrumu (Welch/ortalama STFT),
+    VISUALIZER_SPECTRUM_BINS + 1 frekans noktası
+
+VISUALIZER_MODE | Davranış
+──────────────────────────────────────────────────────────────────────────────
+show            | Etkileşimli pencere (plt.show, bloklar)
+png / svg       | Agg ile başsız dosya çıktısı (output/, EXPORT_FILENAME_TEMPLATE);
+                | pyplot durumu kullanılmaz, sunucu ve toplu işlerde güvenli
+"""
+
+VISUALIZER_FORMATS = ("png", "svg")
+
+
+def minmax_envelope(sig, n_columns):
+    """
+    Sinyali n_columns sütuna indir: (sütun merkez indeksleri, min, max).
+    Her sütun ardışık örneklerin min/max'ıdır; kısa sinyaller olduğu gibi döner.
+    """
+    sig = np.asarray(sig)
+    if len(sig) <= 2 * n_columns:
+        index = np.arange(len(sig))
+        return index, sig, sig
+    per_column = len(sig) // n_columns
+    body = sig[:per_column * n_columns].reshape(n_columns, per_column)
+    lows, highs = body.min(axis=1), body.max(axis=1)
+    # Kalan örnekler son sütuna katılır
+    tail = sig[per_column * n_columns:]
+    if len(tail) > 0:
+        lows[-1] = min(lows[-1], tail.min())
+        highs[-1] = max(highs[-1], tail.max())
+    centers = np.arange(n_columns) * per_column + per_column // 2
+    return centers, lows, highs
+
+
+def averaged_spectrum(sig, sr, n_bins=None, max_segments=None):
+    """
+    Ortalama güç spektrumu (dB): eşit aralıklı en fazla max_segments Hann segmenti
+    (2·n_bins örnek) rfft'lenip ortalanır. Dönüş: (frekanslar, güç dB)
+    """
+    n_bins = VISUALIZER_SPECTRUM_BINS if n_bins is None else n_bins
+    max_segments = VISUALIZER_MAX_SEGMENTS if max_segments is None else max_segments
+    sig = np.asarray(sig)
+    nperseg = min(2 * n_bins, len(sig))
+    if nperseg < 2:
+        return np.zeros(1), np.full(1, -200.0)
+    
+    # %50 örtüşmeli Welch segment sayısı, max_segments ile sınırlı
+    n_segments = int(min(max_segments, max(1, (len(sig) - nperseg) // (nperseg // 2) + 1)))
+    starts = np.linspace(0, len(sig) - nperseg, n_segments).astype(np.int64)
+    window = sps.get_window("hann", nperseg)
+    frames = sig[starts[:, None] + np.arange(nperseg)].astype(np.float64)
+    frames -= frames.mean(axis=1, keepdims=True)
+    frames *= window
+    power = np.mean(np.abs(spfft.rfft(frames, axis=1)) ** 2, axis=0)
+    power /= sr * np.sum(window ** 2)
+    power[1:-1] *= 2
+    return spfft.rfftfreq(nperseg, 1 / sr), 10 * np.log10(power + 1e-20)
+
+
+@profiled("visualize")
+def visualize_signal(signal_data, sr, title="Audio Signal", mode=None, **fields):
+    """
+    Dalga formu (min/max zarfı) ve ortalama spektrum görselleştirme.
+    mode: show / png / svg (None: VISUALIZER_MODE); dosya modlarında yol döndürülür.
+    fields: dosya adı şablonu alanları (seed, duration, ...)
+    """
+    if not ENABLE_VISUALIZER:
+        return None
+    mode = VISUALIZER_MODE if mode is None else mode
+    if mode != "show" and mode not in VISUALIZER_FORMATS:
+        raise ValueError(f"Bilinmeyen görselleştirme modu: {mode} (show, {', '.join(VISUALIZER_FORMATS)})")
+    
+    signal_data = np.asarray(signal_data)
+    if signal_data.ndim == 2:
+        signal_data = signal_data.mean(axis=1)
+    
+    # Başsız modda pyplot'a dokunmadan Agg figürü (iş parçacığı güvenli)
+    if mode == "show":
+        fig = plt.figure(figsize=(8, 4))
+    else:
+        fig = Figure(figsize=(8, 4))
+        FigureCanvasAgg(fig)
+    axes = fig.subplots(2, 1)
+    
+    # Dalga formu: piksel sütunu başına min/max
+    centers, lows, highs = minmax_envelope(signal_data, VISUALIZER_WIDTH_PX)
+    time_axis = centers / sr
+    axes[0].fill_between(time_axis, lows, highs, linewidth=0.5)
+    axes[0].set_title(f"{title} - Dalga Formu")
+    axes[0].set_xlabel("Zaman (s)")
+    axes[0].set_ylabel("Genlik")
+    axes[0].grid(True, alpha=0.3)
+    
+    # Spektrum: sınırlı segmentli ortalama güç spektrumu
+    freqs, power_db = averaged_spectrum(signal_data, sr)
+    axes[1].plot(freqs, power_db, linewidth=0.5)
+    axes[1].set_title(f"{title} - Frekans Spektrumu")
+    axes[1].set_xlabel("Frekans (Hz)")
+    axes[1].set_ylabel("Güç (dB)")
+    axes[1].set_xlim([20, sr/2])
+    axes[1].grid(True, alpha=0.3)
+    
+    fig.tight_layout()
+    if mode == "show":
+        plt.show()
+        return None
+    
+    filepath = os.path.join("output", export_filename(None, mode, sr=sr, channels=1, format=mode, subtype="plot", **fields))
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    fig.savefig(filepath, format=mode, dpi=VISUALIZER_WIDTH_PX / 8)
+    print(f"Görsel kaydedildi: {filepath}")
+    return filepath
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BÖLÜM 13: DOSYA ÇIKTISI
+# ═══════════════════════════════════════════════════════════════════════════
+
+"""
+DOSYA ÇIKTISI TABLOSU
+══════════════════════════════════════════════════════════════════════════════
+Format | Alt tip (EXPORT_SUBTYPE)    | Uzantı | Not
+──────────────────────────────────────────────────────────────────────────────
+wav    | PCM_16 / PCM_24 / FLOAT     | .wav   | FLOAT: 32-bit float (varsayılan)
+flac   | PCM_16 / PCM_24             | .flac  | Kayıpsız sıkıştırma
+ogg    | VORBIS                      | .ogg   | Kayıplı; alt tip her zaman VORBIS
+
+Dosya bir kez açılır, bloklar üretildikçe eklenir (AudioWriter); bellekteki
+sinyal de BLOCK_SIZE'lık dilimlerle yazılır, stereo/float32 tam kopyası oluşmaz.
+Tamsayı çıktılarda (PCM_16/PCM_24) EXPORT_DITHER açıksa nicemlemeden önce
+±1 LSB TPDF dither eklenir.
+
+Dosya adı şablonu (EXPORT_FILENAME_TEMPLATE, uzantı formata göre eklenir):
+{timestamp} {sr} {channels} {format} {subtype} ve çağıranın verdiği alanlar
+(main: {seed} {duration}). Örnek: "scene_{seed}_{sr}hz_{timestamp}"
+"""
+
+EXPORT_FORMATS = {
+    "wav": ("WAV", ("PCM_16", "PCM_24", "FLOAT")),
+    "flac": ("FLAC", ("PCM_16", "PCM_24")),
+    "ogg": ("OGG", ("VORBIS",))
+}
+PCM_BITS = {"PCM_16": 16, "PCM_24": 24}
+
+
+def export_subtype(fmt, subtype=None):
+    """Format için geçerli alt tipi döndür (None: formatın ilki, ogg: VORBIS); geçersizse ValueError"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Bilinmeyen dosya formatı: {fmt} (desteklenen: {', '.join(EXPORT_FORMATS)})")
+    subtypes = EXPORT_FORMATS[fmt][1]
+    if fmt == "ogg" or subtype is None:
+        return subtypes[-1] if fmt == "wav" else subtypes[0]
+    if subtype not in subtypes:
+        raise ValueError(f"{fmt} için geçersiz alt tip: {subtype} (desteklenen: {', '.join(subtypes)})")
+    return subtype
+
+
+def _to_output_channels(sig, stereo):
+    """
+    Sinyali çıkış kanal düzenine getir, kırp ve float32'ye dönüştür (tek geçiş).
+    Mono blok stereo çıkışa yayınlanarak yazılır (np.stack kopyası yok).
+    """
+    if not stereo and sig.ndim == 2:
+        sig = np.mean(sig, axis=1)
+    if stereo and sig.ndim == 1:
+        sig = sig[:, None]
+    
+    out = np.empty((len(sig), 2) if stereo else len(sig), dtype=np.float32)
+    return np.clip(sig, -1.0, 1.0, out=out)
+
+
+def quantize_pcm(samples, bits, rng=None):
+    """
+    [-1, 1] float örnekleri tamsayı PCM'e nicemle (tam ölçek 2^(bits-1) - 1).
+    rng verilirse ±1 LSB TPDF dither eklenir (iki uniform farkı).
+    Dönüş: 16 bit -> int16, 24 bit -> int32 (soundfile'ın beklediği gibi üst 24 bit)
+    """
+    scale = float(2 ** (bits - 1) - 1)
+    scaled = samples.astype(np.float64) * scale
+    if rng is not None:
+        scaled += rng.random(scaled.shape)
+        scaled -= rng.random(scaled.shape)
+    np.round(scaled, out=scaled)
+    np.clip(scaled, -scale - 1, scale, out=scaled)
+    if bits == 16:
+        return scaled.astype(np.int16)
+    return scaled.astype(np.int32) << (32 - bits)
+
+
+class AudioWriter:
+    """
+    Blok blok ses dosyası yazıcı: SoundFile bir kez açılır, write() blokları ekler.
+    target bir yol ya da yazılabilir dosya nesnesi olabilir (HTTP akışı için).
+    dither: tamsayı alt tiplerde TPDF dither; rng dither tohumu (tekrarlanabilir çıktı için)
+    """
+    
+    def __init__(self, target, sr, channels, fmt="wav", subtype=None, dither=True, rng=None):
+        self.subtype = export_subtype(fmt, subtype)
+        self.stereo = channels == 2
+        self.bits = PCM_BITS.get(self.subtype)
+        self.rng = np.random.default_rng(rng) if dither and self.bits is not None else None
+        self.n_frames = 0
+        self.file = sf.SoundFile(target, 'w', samplerate=sr, channels=channels,
+                                 format=EXPORT_FORMATS[fmt][0], subtype=self.subtype)
+    
+    def write(self, block):
+        samples = _to_output_channels(np.asarray(block), self.stereo)
+        if self.bits is not None:
+            samples = quantize_pcm(samples, self.bits, self.rng)
+        self.file.write(samples)
+        self.n_frames += len(samples)
+    
+    def close(self):
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_filename(template=None, fmt="wav", **fields):
+    """Şablondan dosya adı (uzantı formata göre eklenir); bilinmeyen alan ValueError"""
+    template = EXPORT_FILENAME_TEMPLATE if template is None else template
+    fields.setdefault("timestamp", datetime.now().strftime("%Y%m%d_%H%M%S"))
+    try:
+        name = template.format(**fields)
+    except (KeyError, IndexError) as exc:
+        raise ValueError(f"Dosya adı şablonunda bilinmeyen alan: {exc} ({template})") from None
+    return f"{name}.{fmt}"
+
+
+@profiled("export")
+def export_audio(sig, sr, stereo=True, fmt=None, subtype=None, dither=None, template=None, rng=None, **fields):
+    """
+    Sesi output klasörüne EXPORT_FORMAT/EXPORT_SUBTYPE ile kaydet; dosya yolunu döndür.
+    sig bir dizi ya da blok üreticisi (akış) olabilir; ikisinde de bloklar dosyaya
+    sırayla eklenir, bellekte en fazla birkaç blok tutulur.
+    fields: dosya adı şablonu alanları (seed, duration, ...)
+    """
+    if not ENABLE_FILE_EXPORT:
+        return None
+    fmt = EXPORT_FORMAT if fmt is None else fmt
+    subtype = export_subtype(fmt, EXPORT_SUBTYPE if subtype is None else subtype)
+    dither = EXPORT_DITHER if dither is None else dither
+    channels = 2 if stereo else 1
+    
+    # Sadece output klasörü
+    output_dir = "output"
+    filename = export_filename(template, fmt, sr=sr, channels=channels, format=fmt, subtype=subtype, **fields)
+    filepath = os.path.join(output_dir, filename)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    
+    if isinstance(sig, np.ndarray):
+        # Bellekteki sinyal: BLOCK_SIZE'lık dilimler (tam stereo/float32 kopya yok)
+        blocks = (sig[start:start + length] for start, length in block_ranges(len(sig), BLOCK_SIZE))
+    else:
+        blocks = sig
+    
+    with AudioWriter(filepath, sr, channels, fmt, subtype, dither, rng) as out:
+        for block in blocks:
+            out.write(block)
+        n_frames = out.n_frames
+    
+    print(f"\n{'='*70}")
+    print(f"SES DOSYASI KAYDEDILDI: {filepath}")
+    print(f"Format: {'Stereo' if stereo else 'Mono'}, {sr}Hz, {n_frames/sr:.2f}s, {fmt} {subtype}"
+          f"{' + TPDF dither' if dither and subtype in PCM_BITS else ''}")
+    print(f"{'='*70}\n")
+    return filepath
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BÖLÜM 14: HTTP AKIŞ SUNUCUSU
+# ═══════════════════════════════════════════════════════════════════════════
+
+"""
+HTTP AKIŞ SUNUCUSU TABLOSU
+══════════════════════════════════════════════════════════════════════════════
+Uç nokta          | Açıklama                                   | Parametreler
+──────────────────────────────────────────────────────────────────────────────────────────────
+GET  /            | Sunucu bilgisi ve varsayılan sahne (JSON)  | -
+GET  /render      | Varsayılan sahneyi akıt                    | format, duration, sr, seed, stereo
+POST /render      | JSON sahne açıklamasını akıt               | Gövde: aşağıdaki alanlar
+
+Sahne alanı        | Tür   | Açıklama
+──────────────────────────────────────────────────────────────────────────────────────────────
+noise_mix          | dict  | Doğal ses ayarları; verilen alanlar varsayılanların üzerine yazılır
+noise_types        | dict  | Noise türü aktivasyonları (ör. {"pink": true, "white": false})
+brainwave_config   | dict  | Beyin dalgası ayarları
+naturalness_params | dict  | Doğallık parametreleri
+format             | str   | wav (16-bit PCM) / pcm (ham s16le) / flac
+duration, sr       | sayı  | Süre sn ve örnekleme hızı (varsayılan DURATION, SAMPLE_RATE)
+seed, stereo       | int/bool | Sahne tohumu (None: rastgele), stereo çıkış
+
+Yanıt Transfer-Encoding: chunked ile gönderilir; her akış bloğu hazır olur olmaz
+istemciye yazılır. WAV başlığı süre bilindiği için render başlamadan gönderilir,
+ilk ses bloğu SERVER_CALIBRATION_SECONDS'lık kalibrasyon sonrası gelir. Sunucu
+seviye ön geçişi yapmaz: kazançlar kalibrasyondan tahmin edilir, tahmini aşan
+tepeler true-peak limiter ile MASTER_AMPLITUDE altında tutulur.
+"""
+
+SERVER_FORMATS = {
+    "wav": "audio/wav",
+    "pcm": "audio/L16",
+    "flac": "audio/flac"
+}
+
+SERVER_MAX_DURATION = 24 * 3600
+
+# WAV başlığının RIFF/data boyutları 32 bitlik alanlardır (16-bit PCM + 36 bayt başlık)
+WAV_MAX_SIZE = 0xFFFFFFFF
+
+
+def _checked_value(default, value, name):
+    """
+    İstemci değerini varsayılanın tipine göre doğrula (bool, tamsayı, sayı, metin,
+    sayı çifti); tipi tutmayan değerde ValueError. Sayı dizileri tuple'a çevrilir.
+    """
+    if isinstance(default, bool):
+        if not isinstance(value, bool):
+            raise ValueError(f"{name} true/false olmalı")
+        return value
+    if isinstance(default, (int, float)):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not np.isfinite(value):
+            raise ValueError(f"{name} bir sayı olmalı")
+        if isinstance(default, int):
+            if value != int(value):
+                raise ValueError(f"{name} bir tamsayı olmalı")
+            return int(value)
+        return float(value)
+    if isinstance(default, str):
+        if not isinstance(value, str):
+            raise ValueError(f"{name} bir metin olmalı")
+        return value
+    if isinstance(default, (tuple, list)):
+        if not isinstance(value, (tuple, list)) or len(value) != len(default):
+            raise ValueError(f"{name} {len(default)} elemanlı bir dizi olmalı")
+        # Dizi elemanları (frekans aralıkları) tamsayı varsayılanlarda da kesirli olabilir
+        return tuple(_checked_value(float(item) if type(item) is int else item, element, f"{name}[{index}]")
+                     for index, (item, element) in enumerate(zip(default, value)))
+    return value
+
+
+def _merge_config(base, override, name):
+    """
+    override alanlarını base kopyasının üzerine iki seviyeye kadar uygula.
+    Her değer varsayılanının tipine, iç içe nesneler varsayılanın alanlarına göre
+    doğrulanır (hata sunucuda akış başlamadan 400 olarak döner).
+    """
+    if not isinstance(override, dict):
+        raise ValueError(f"{name} bir JSON nesnesi olmalı")
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if key not in merged:
+            raise ValueError(f"Bilinmeyen {name} alanı: {key}")
+        if isinstance(merged[key], dict):
+            if not isinstance(value, dict):
+                raise ValueError(f"{name}.{key} bir JSON nesnesi olmalı")
+            for field, field_value in value.items():
+                if field not in merged[key]:
+                    raise ValueError(f"Bilinmeyen {name}.{key} alanı: {field}")
+                merged[key][field] = _checked_value(merged[key][field], field_value, f"{name}.{key}.{field}")
+        else:
+            merged[key] = _checked_value(merged[key], value, f"{name}.{key}")
+    return merged
+
+
+def parse_scene(scene):
+    """
+    İstemcinin sahne açıklamasını doğrula ve varsayılan konfigürasyonların
+    kopyaları üzerine uygula (global ayarlar değişmez; istekler birbirini etkilemez).
+    Hatalı alanlarda ValueError fırlatır.
+    """
+    if not isinstance(scene, dict):
+        raise ValueError("Sahne bir JSON nesnesi olmalı")
+    
+    fmt = str(scene.get("format", "wav")).lower()
+    if fmt not in SERVER_FORMATS:
+        raise ValueError(f"Bilinmeyen format: {fmt} (desteklenen: {', '.join(SERVER_FORMATS)})")
+    
+    duration = float(scene.get("duration", DURATION))
+    sr = int(scene.get("sr", SAMPLE_RATE))
+    if not 0 < duration <= SERVER_MAX_DURATION:
+        raise ValueError(f"duration 0-{SERVER_MAX_DURATION} sn aralığında olmalı")
+    if not 8000 <= sr <= 192000:
+        raise ValueError("sr 8000-192000 Hz aralığında olmalı")
+    
+    seed = scene.get("seed", SCENE_SEED)
+    stereo = scene.get("stereo", STEREO_MODE)
+    if isinstance(stereo, str):
+        stereo = stereo.lower() in ("1", "true", "yes")
+    
+    # Sınır aşılırsa başlık akış başladıktan sonra yazılamaz; 400 olarak önceden reddedilir
+    channels = 2 if stereo else 1
+    if fmt == "wav" and 36 + int(duration * sr) * channels * 2 > WAV_MAX_SIZE:
+        max_duration = (WAV_MAX_SIZE - 36) // (channels * 2) / sr
+        raise ValueError(f"WAV 4 GB sınırını aşıyor: bu sr/kanalda en fazla {max_duration:.0f} sn "
+                         f"(daha uzun sahneler için format=flac ya da pcm)")
+    
+    return {
+        "format": fmt,
+        "duration": duration,
+        "sr": sr,
+        "seed": None if seed is None else int(seed),
+        "stereo": bool(stereo),
+        "noise_mix": _merge_config(noise_mix, scene.get("noise_mix", {}), "noise_mix"),
+        "noise_types": _merge_config(noise_types, scene.get("noise_types", {}), "noise_types"),
+        "brainwave_config": _merge_config(brainwave_config, scene.get("brainwave_config", {}), "brainwave_config"),
+        "naturalness_params": _merge_config(naturalness_params, scene.get("naturalness_params", {}), "naturalness_params")
+    }
+
+
+def to_pcm16(block, stereo):
+    """Akış bloğunu küçük-endian 16-bit PCM örneklerine dönüştür (tüm formatlar aynı örnekleri taşır)"""
+    return quantize_pcm(_to_output_channels(block, stereo), 16).astype('<i2', copy=False)
+
+
+def wav_header(n_frames, sr, channels):
+    """Uzunluğu bilinen 16-bit PCM WAV başlığı (44 bayt)"""
+    block_align = channels * 2
+    data_size = n_frames * block_align
+    return struct.pack('<4sI4s4sIHHIIHH4sI', b'RIFF', 36 + data_size, b'WAVE', b'fmt ', 16, 1, channels,
+                       sr, sr * block_align, block_align, 16, b'data', data_size)
+
+
+class _ForwardWriter:
+    """
+    soundfile için yalnızca ileri yazılabilen sanal dosya: eklenen baytlar
+    kuyruğa alınır, akışa çoktan gönderilmiş bölgeye geri dönük yazımlar
+    (kapanışta başlık güncellemesi) yok sayılır.
+    """
+    
+    def __init__(self):
+        self.pending = []
+        self.position = 0
+        self.size = 0
+    
+    def write(self, data):
+        data = bytes(data)
+        if self.position == self.size:
+            self.pending.append(data)
+            self.size += len(data)
+        self.position += len(data)
+        return len(data)
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        self.position = offset
+        return self.position
+    
+    def tell(self):
+        return self.position
+    
+    def read(self, size=-1):
+        return b""
+    
+    def drain(self):
+        data = b"".join(self.pending)
+        self.pending = []
+        return data
+
+
+# FLAC başlığı: "fLaC" + blok başlığı (4) + STREAMINFO; toplam örnek sayısı 36 bit,
+# 21. baytın alt 4 biti ve 22-25. baytlar (büyük-endian)
+FLAC_STREAMINFO_END = 42
+
+
+def flac_with_total_samples(data, n_frames):
+    """FLAC akışının başındaki STREAMINFO toplam örnek alanını n_frames ile doldur"""
+    if len(data) < FLAC_STREAMINFO_END or data[:4] != b"fLaC":
+        return data
+    patched = bytearray(data)
+    patched[21] = (patched[21] & 0xF0) | ((n_frames >> 32) & 0x0F)
+    patched[22:26] = (n_frames & 0xFFFFFFFF).to_bytes(4, "big")
+    return bytes(patched)
+
+
+def scene_audio_chunks(scene, block_size=BLOCK_SIZE):
+    """
+    parse_scene çıktısından kodlanmış ses parçaları üret (bytes).
+    WAV/PCM her blok için bir parça verir; FLAC kodlayıcının o ana kadar ürettiği baytları.
+    FLAC akışında kapanıştaki başlık güncellemesi gönderilemediğinden STREAMINFO
+    toplam örnek sayısı (önceden bilinir) ilk parçaya yazılır.
+    """
+    duration, sr, stereo = scene["duration"], scene["sr"], scene["stereo"]
+    channels = 2 if stereo else 1
+    blocks = scene_blocks(scene, block_size)
+    
+    if scene["format"] == "flac":
+        writer = _ForwardWriter()
+        head = b""
+        with AudioWriter(writer, sr, channels, "flac", "PCM_16", dither=False) as out:
+            for block in blocks:
+                out.write(block)
+                data = writer.drain()
+                if head is not None:
+                    head += data
+                    if len(head) < FLAC_STREAMINFO_END:
+                        continue
+                    data, head = flac_with_total_samples(head, int(duration * sr)), None
+                if data:
+                    yield data
+        data = writer.drain()
+        if head is not None:
+            data = flac_with_total_samples(head + data, int(duration * sr))
+        if data:
+            yield data
+        return
+    
+    if scene["format"] == "wav":
+        yield wav_header(int(duration * sr), sr, channels)
+    for block in blocks:
+        yield to_pcm16(block, stereo).tobytes()
+
+
+class SceneStreamHandler(BaseHTTPRequestHandler):
+    """Sahne isteklerini chunked ses akışı olarak yanıtlayan istek işleyici"""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/":
+            self._send_json(200, {
+                "endpoints": ["GET /", "GET /render", "POST /render"],
+                "formats": list(SERVER_FORMATS),
+                "defaults": {
+                    "duration": DURATION,
+                    "sr": SAMPLE_RATE,
+                    "stereo": STEREO_MODE,
+                    "seed": SCENE_SEED,
+                    "noise_mix": noise_mix,
+                    "noise_types": noise_types,
+                    "brainwave_config": brainwave_config,
+                    "naturalness_params": naturalness_params
+                }
+            })
+        elif url.path == "/render":
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            self._stream_scene(query)
+        else:
+            self._send_json(404, {"error": f"Bilinmeyen yol: {url.path}"})
+    
+    def do_POST(self):
+        if urlparse(self.path).path != "/render":
+            self._send_json(404, {"error": f"Bilinmeyen yol: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            scene = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send_json(400, {"error": f"Geçersiz JSON: {e}"})
+            return
+        self._stream_scene(scene)
+    
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False, default=list).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _stream_scene(self, request):
+        try:
+            scene = parse_scene(request)
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        
+        self.send_response(200)
+        self.send_header("Content-Type", SERVER_FORMATS[scene["format"]])
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("X-Sample-Rate", str(scene["sr"]))
+        self.send_header("X-Channels", "2" if scene["stereo"] else "1")
+        self.end_headers()
+        
+        start = time.perf_counter()
+        first_byte_ms = first_audio_ms = None
+        sent = 0
+        # İlk ses baytı beklemesin: ön geçiş yok, seviyeler kalibrasyondan tahmin edilir
+        _stream_local.calibration_seconds = SERVER_CALIBRATION_SECONDS
+        _stream_local.level_prepass = False
+        try:
+            for chunk in scene_audio_chunks(scene):
+                self.wfile.write(b"%X\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+                sent += len(chunk)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if first_byte_ms is None:
+                    first_byte_ms = elapsed_ms
+                if first_audio_ms is None and sent > 44:
+                    first_audio_ms = elapsed_ms
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            print(f"HTTP akış: istemci bağlantıyı kapattı ({sent} bayt gönderildi)")
+            self.close_connection = True
+        finally:
+            _stream_local.calibration_seconds = None
+            _stream_local.level_prepass = None
+        
+        total_ms = (time.perf_counter() - start) * 1000
+        print(f"HTTP akış: {scene['format']}, {scene['duration']}s, {scene['sr']}Hz, "
+              f"ilk bayt {first_byte_ms or 0:.1f} ms, ilk ses {first_audio_ms or 0:.1f} ms, "
+              f"toplam {total_ms:.0f} ms, {sent} bayt")
+    
+    def log_message(self, format, *args):
+        print(f"HTTP {self.address_string()} - {format % args}")
+
+
+def serve_scenes(host=SERVER_HOST, port=SERVER_PORT):
+    """Yerel HTTP akış sunucusunu başlat (Ctrl+C ile durdurulur)"""
+    server = ThreadingHTTPServer((host, port), SceneStreamHandler)
+    server.daemon_threads = True
+    print("=" * 70)
+    print(f"HTTP AKIŞ SUNUCUSU: http://{host}:{port}/render")
+    print(f"Formatlar: {', '.join(SERVER_FORMATS)} | kalibrasyon: {SERVER_CALIBRATION_SECONDS}s")
+    print("=" * 70)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nSunucu durduruluyor...")
+    finally:
+        server.server_close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BÖLÜM 15: TOPLU RENDER
+# ═══════════════════════════════════════════════════════════════════════════
+
+"""
+TOPLU RENDER TABLOSU
+══════════════════════════════════════════════════════════════════════════════
+Girdi: her satırı bir sahne olan JSONL dosyası (alanlar HTTP AKIŞ SUNUCUSU
+tablosundakilerle aynıdır) ve isteğe bağlı "name" alanı (çıktı dosya adı).
+
+    python sampler.py batch scenes.jsonl [işçi_sayısı]
+
+Çıktı                      | Açıklama
+──────────────────────────────────────────────────────────────────────────────────────────────
+BATCH_OUTPUT_DIR/<name>.*  | Sahne başına ses dosyası (wav / flac / raw 16-bit PCM)
+BATCH_OUTPUT_DIR/manifest.jsonl | İş başına kayıt: durum, süre, tepe bellek, çıktı yolu, hata
+
+Her iş kendi sürecinde çalışır (süreç başına tek iş: tepe bellek işe özeldir);
+kuyrukta en fazla 2 × işçi sayısı iş bekler, hatalı satır ya da iş kaydedilip atlanır.
+"""
+
+BATCH_FILE_EXTENSIONS = {
+    "wav": "wav",
+    "flac": "flac",
+    "pcm": "raw"
+}
+
+
+def scene_blocks(scene, block_size=BLOCK_SIZE):
+    """parse_scene çıktısının karışım bloklarını üret (stereo ise (n, 2) bloklar)"""
+    return stream_mix_blogs(
+        scene["duration"],
+        scene["sr"],
+        mix_blog_config,
+        scene["noise_mix"],
+        scene["brainwave_config"],
+        scene["naturalness_params"],
+        block_size,
+        scene_seed=scene["seed"],
+        noise_type_cfg=scene["noise_types"],
+        channels=2 if scene["stereo"] else 1
+    )
+
+
+def render_scene_file(scene, filepath, block_size=BLOCK_SIZE):
+    """Sahneyi akış olarak dosyaya yaz (bellek süreden bağımsız); yazılan frame sayısını döndür"""
+    n_frames = 0
+    if scene["format"] == "pcm":
+        with open(filepath, "wb") as out:
+            for block in scene_blocks(scene, block_size):
+                out.write(to_pcm16(block, scene["stereo"]).tobytes())
+                n_frames += len(block)
+        return n_frames
+    
+    # Sunucu akışıyla aynı kodlama: 16 bit, dither yok
+    with AudioWriter(filepath, scene["sr"], 2 if scene["stereo"] else 1, scene["format"], "PCM_16", dither=False) as out:
+        for block in scene_blocks(scene, block_size):
+            out.write(block)
+    return out.n_frames
+
+
+def _batch_job_name(index, request):
+    """Çıktı dosyası için güvenli iş adı"""
+    name = request.get("name") if isinstance(request, dict) else None
+    if not name:
+        return f"job_{index:04d}"
+    return "".join(char if char.isalnum() or char in "-_." else "_" for char in str(name))
+
+
+def run_batch_job(index, request, output_dir):
+    """
+    Tek toplu işi çalıştır ve manifest kaydı döndür.
+    Hatalar yakalanıp kayda yazılır; iş hiçbir zaman istisna fırlatmaz.
+    """
+    import resource
+    
+    start = time.perf_counter()
+    record = {"index": index, "name": _batch_job_name(index, request), "status": "ok", "output": None}
+    try:
+        scene = parse_scene(request)
+        filepath = os.path.join(output_dir, f"{record['name']}.{BATCH_FILE_EXTENSIONS[scene['format']]}")
+        n_frames = render_scene_file(scene, filepath)
+        record.update(output=filepath, frames=n_frames, audio_seconds=n_frames / scene["sr"])
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    record["peak_mem_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return record
+
+
+def read_batch_requests(path):
+    """JSONL sahne dosyasını satır satır oku: (index, sahne) ya da (index, ValueError)"""
+    with open(path, encoding="utf-8") as source:
+        index = 0
+        for line in source:
+            if not line.strip():
+                continue
+            try:
+                yield index, json.loads(line)
+            except ValueError as e:
+                yield index, ValueError(f"Geçersiz JSON satırı: {e}")
+            index += 1
+
+
+def run_batch(path, workers=None, output_dir=None):
+    """
+    JSONL sahne dosyasını sınırlı iş kuyruğuyla eşzamanlı render et.
+    Her tamamlanan iş manifest.jsonl'e hemen eklenir; manifest kayıtları döndürülür.
+    """
+    from concurrent.futures import wait, FIRST_COMPLETED
+    
+    workers = max(1, workers or BATCH_WORKERS)
+    output_dir = output_dir or BATCH_OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, "manifest.jsonl")
+    
+    print("=" * 70)
+    print(f"TOPLU RENDER: {path} → {output_dir} (işçi={workers})")
+    print("=" * 70)
+    
+    records = []
+    start = time.perf_counter()
+    with open(manifest_path, "w", encoding="utf-8") as manifest, \
+            ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1,
+                                initializer=_init_render_worker, initargs=(RENDER_DTYPE,)) as pool:
+        
+        def record_result(record):
+            records.append(record)
+            manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+            manifest.flush()
+            status = "✓" if record["status"] == "ok" else "✗"
+            print(f"{status} [{record['index']}] {record['name']}: {record['seconds']}s, "
+                  f"{record.get('peak_mem_mb', 0)} MB {record.get('error', '')}")
+        
+        pending = {}
+        for index, request in read_batch_requests(path):
+            # Hatalı satır ve sahneler süreç başlatılmadan kaydedilir
+            error = request if isinstance(request, Exception) else None
+            if error is None:
+                try:
+                    parse_scene(request)
+                except (ValueError, TypeError) as e:
+                    error = e
+            if error is not None:
+                record_result({"index": index, "name": _batch_job_name(index, request), "status": "error",
+                               "output": None, "error": f"{type(error).__name__}: {error}", "seconds": 0.0})
+                continue
+            while len(pending) >= 2 * workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _collect_batch_future(future, pending.pop(future), record_result)
+            pending[pool.submit(run_batch_job, index, request, output_dir)] = (index, request)
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                _collect_batch_future(future, pending.pop(future), record_result)
+    
+    failed = sum(1 for record in records if record["status"] != "ok")
+    print("=" * 70)
+    print(f"TOPLU RENDER TAMAMLANDI: {len(records) - failed}/{len(records)} başarılı, "
+          f"{time.perf_counter() - start:.1f}s, manifest: {manifest_path}")
+    print("=" * 70)
+    return sorted(records, key=lambda record: record["index"])
+
+
+def _collect_batch_future(future, job, record_result):
+    """Tamamlanan işin kaydını al; süreç çökmesi de hatalı iş olarak kaydedilir"""
+    index, request = job
+    try:
+        record = future.result()
+    except Exception as e:
+        record = {"index": index, "name": _batch_job_name(index, request), "status": "error",
+                  "output": None, "error": f"{type(e).__name__}: {e}", "seconds": None}
+    record_result(record)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BÖLÜM 16: PERFORMANS ÖLÇÜMÜ
+# ═══════════════════════════════════════════════════════════════════════════
+
+"""
+PERFORMANS ÖLÇÜMÜ TABLOSU
+══════════════════════════════════════════════════════════════════════════════
+    python sampler.py bench [--quick] [--durations 1,60] [--rates 44100] [--only rain]
+                            [--out sonuç.json] [--compare baseline.json]
+
+Hedef                         | Ölçülen çağrı
+──────────────────────────────────────────────────────────────────────────────────────────────
+generate_<tür>_noise          | Her noise türü (noise_types anahtarları)
+sound_blog_<ad>               | Her doğal ses blogu (NATURAL_BLOGS)
+brainwave_blog_<ad>           | Her beyin dalgası blogu (BRAINWAVE_BLOGS)
+apply_naturalness             | Beyaz gürültü üzerinde, naturalness=0.7
+apply_naturalness_<seviye>    | BENCH_NATURALNESS_LEVELS: 0.5 (Perlin/tane yok), 0.9 (Perlin yolu)
+apply_frequency_operations    | Beyaz gürültü üzerinde specific_frequencies
+mix_blogs                     | BENCH_SCENE sahnesi (katman önbelleği kapalı)
+export_audio                  | Stereo dosya yazımı, EXPORT_FORMAT (geçici klasöre)
+visualize_signal              | Başsız PNG görseli (geçici klasöre)
+apply_reverb                  | Beyaz gürültü üzerinde REVERB_* ayarlarıyla konvolüsyon reverb
+oscillator_bank               | 50 harmonikli osilatör bankası
+render_layer_multirate        | thunder katmanı, MULTIRATE_MODE açık: iç hız + polifaz yukarı örnekleme
+
+Metrik            | Açıklama
+──────────────────────────────────────────────────────────────────────────────────────────────
+seconds           | Çağrı süresi (kısa çağrılarda BENCH_REPEAT tekrarın en iyisi)
+realtime_factor   | Ses süresi / render süresi (>1: gerçek zamandan hızlı)
+samples_per_sec   | Saniyede üretilen örnek
+peak_rss_mb       | Süreç tepe bellek (her ölçüm ayrı süreçte: yalnızca o ölçüme aittir)
+peak_delta_mb     | Tepe bellek − çağrı öncesi bellek (girdi hazırlığı hariç)
+
+--compare: aynı (hedef, süre, sr) ölçümleri taban çizgisiyle karşılaştırılır; süre ya da
+bellek artışı BENCH_REGRESSION_TOLERANCE oranını aşarsa gerileme işaretlenir ve çıkış kodu 1 olur.
+"""
+
+BENCH_DURATIONS = [1, 10, 60, 600, 3600]
+BENCH_SAMPLE_RATES = [22050, 44100, 48000, 96000]
+BENCH_QUICK = {"durations": [1, 10], "sample_rates": [44100]}
+BENCH_REPEAT = 3
+BENCH_REGRESSION_TOLERANCE = 0.15
+BENCH_MIN_DELTA_SECONDS = 0.01
+BENCH_MIN_DELTA_MB = 8.0
+# apply_naturalness (0.7) yanında ölçülen ek seviyeler: Perlin'siz ve Perlin'li yollar ayrı izlenir
+BENCH_NATURALNESS_LEVELS = [0.5, 0.9]
+BENCH_SCENE = {
+    "seed": 0,
+    "stereo": True,
+    "noise_types": {"white": False, "pink": True, "brown": False, "gray": False},
+    "noise_mix": {"rain": {"enabled": True}, "wind": {"enabled": True}},
+    "brainwave_config": {"alpha": {"enabled": True}}
+}
+
+
+def bench_targets():
+    """
+    Ölçüm hedefleri: ad → hazırlık(duration, sr, rng).
+    Hazırlık girdileri üretir ve ölçülecek argümansız çağrıyı döndürür.
+    """
+    targets = {}
+    for noise_type in noise_types:
+        targets[f"generate_{noise_type}_noise"] = \
+            lambda duration, sr, rng, noise_type=noise_type: lambda: generate_noise(noise_type, duration, sr, rng=rng)
+    for blog in NATURAL_BLOGS.values():
+        targets[blog.__name__] = \
+            lambda duration, sr, rng, blog=blog: lambda: blog(duration, sr, nat_params=naturalness_params, rng=rng)
+    for blog in BRAINWAVE_BLOGS.values():
+        targets[blog.__name__] = lambda duration, sr, rng, blog=blog: lambda: blog(duration, sr, rng=rng)
+    
+    def naturalness(duration, sr, rng, level=0.7):
+        sig = generate_white_noise(duration, sr, rng=rng)
+        return lambda: apply_naturalness(sig, sr, level, naturalness_params, rng=rng)
+    
+    def frequency_operations(duration, sr, rng):
+        sig = generate_white_noise(duration, sr, rng=rng)
+        return lambda: apply_frequency_operations(sig, sr, specific_frequencies)
+    
+    def mix(duration, sr, rng):
+        scene = parse_scene(BENCH_SCENE)
+        return lambda: mix_blogs(duration, sr, mix_blog_config, scene["noise_mix"], scene["brainwave_config"],
+                                 scene["naturalness_params"], scene_seed=scene["seed"],
+                                 noise_type_cfg=scene["noise_types"])
+    
+    def export(duration, sr, rng):
+        sig = generate_white_noise(duration, sr, rng=rng)
+        return lambda: export_audio(sig, sr, stereo=True)
+    
+    def visualize(duration, sr, rng):
+        sig = generate_white_noise(duration, sr, rng=rng)
+        return lambda: visualize_signal(sig, sr, mode="png")
+    
+    def reverb(duration, sr, rng):
+        sig = generate_white_noise(duration, sr, rng=rng)
+        spec = {"ir": REVERB_IR_FILE, "decay": REVERB_DECAY_SECONDS, "wet": REVERB_WET, "partition": REVERB_PARTITION}
+        return lambda: apply_reverb(sig, sr, spec)
+    
+    def oscillator_bank(duration, sr, rng):
+        harmonics = np.arange(1, 51)  # 50 harmonikli motor
+        return lambda: OscillatorBank(sr, 25.0 * harmonics, 1.0 / harmonics).render(int(duration * sr))
+    
+    def multirate_layer(duration, sr, rng):
+        global MULTIRATE_MODE
+        MULTIRATE_MODE = True  # her ölçüm ayrı süreçte: ayar yalnızca bu ölçümü etkiler
+        config = noise_mix["thunder"]
+        layer = {"key": "natural:thunder", "kind": "natural", "name": "thunder", "weight": config["weight"],
+                 "naturalness": config["naturalness"], "freq_range": config["freq_range"],
+                 "nat_params": naturalness_params, "loop": None, "reverb": None}
+        return lambda: render_layer(layer, duration, sr, rng)
+    
+    targets["apply_naturalness"] = naturalness
+    for level in BENCH_NATURALNESS_LEVELS:
+        targets[f"apply_naturalness_{level}"] = functools.partial(naturalness, level=level)
+    targets["apply_frequency_operations"] = frequency_operations
+    targets["mix_blogs"] = mix
+    targets["export_audio"] = export
+    targets["visualize_signal"] = visualize
+    targets["apply_reverb"] = reverb
+    targets["oscillator_bank"] = oscillator_bank
+    targets["render_layer_multirate"] = multirate_layer
+    return targets
+
+
+def _current_rss_mb():
+    """Sürecin şu anki yerleşik belleği MB (Linux /proc; yoksa tepe değer)"""
+    import resource
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_bench_case(name, duration, sr, render_dtype_name):
+    """
+    Tek ölçüm: ayrı süreçte çalıştırılır (tepe bellek yalnızca bu ölçüme aittir).
+    Çıktı dosyaları geçici klasöre yazılır, program çıktısı bastırılır.
+    """
+    import io
+    import resource
+    import tempfile
+    global LAYER_CACHE, ENABLE_FILE_EXPORT
+    
+    _init_render_worker(render_dtype_name)
+    LAYER_CACHE = False
+    ENABLE_FILE_EXPORT = True
+    
+    record = {"name": name, "duration": duration, "sr": sr, "dtype": render_dtype_name, "status": "ok"}
+    cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as workdir, contextlib.redirect_stdout(io.StringIO()):
+            os.chdir(workdir)
+            call = bench_targets()[name](duration, sr, np.random.default_rng(0))
+            base_rss = _current_rss_mb()
+            timings = []
+            while len(timings) < BENCH_REPEAT and sum(timings) < 1.0:
+                start = time.perf_counter()
+                call()
+                timings.append(time.perf_counter() - start)
+            os.chdir(cwd)
+    except Exception as e:
+        os.chdir(cwd)
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+        return record
+    
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    seconds = min(timings)
+    n_samples = int(duration * sr)
+    record.update(
+        seconds=round(seconds, 6),
+        runs=len(timings),
+        realtime_factor=round(duration / seconds, 2) if seconds > 0 else None,
+        samples_per_sec=round(n_samples / seconds) if seconds > 0 else None,
+        peak_rss_mb=round(peak_rss, 1),
+        peak_delta_mb=round(max(0.0, peak_rss - base_rss), 1)
+    )
+    return record
+
+
+def run_benchmarks(durations=None, sample_rates=None, only=None):
+    """
+    Tüm hedefleri süre × örnekleme hızı taramasında sırayla ölç (ölçümler birbirini etkilemesin diye seri).
+    Çöken (ör. bellek yetmeyen) ölçümler hata olarak kaydedilir, tarama devam eder.
+    """
+    durations = durations or BENCH_DURATIONS
+    sample_rates = sample_rates or BENCH_SAMPLE_RATES
+    names = [name for name in bench_targets() if not only or any(part in name for part in only)]
+    
+    print("=" * 70)
+    print(f"PERFORMANS ÖLÇÜMÜ: {len(names)} hedef × {len(durations)} süre × {len(sample_rates)} sr "
+          f"(dtype={RENDER_DTYPE})")
+    print("=" * 70)
+    print(f"{'Hedef':<28} {'Süre':>6} {'sr':>6} {'sn':>9} {'RTF':>9} {'örnek/sn':>12} {'tepe MB':>8}")
+    
+    results = []
+    for name in names:
+        for sr in sample_rates:
+            for duration in durations:
+                try:
+                    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+                        record = pool.submit(run_bench_case, name, duration, sr, RENDER_DTYPE).result()
+                except Exception as e:
+                    record = {"name": name, "duration": duration, "sr": sr, "dtype": RENDER_DTYPE,
+                              "status": "error", "error": f"{type(e).__name__}: {e}"}
+                results.append(record)
+                if record["status"] == "ok":
+                    print(f"{name:<28} {duration:>6} {sr:>6} {record['seconds']:>9.4f} "
+                          f"{record['realtime_factor']:>9.1f} {record['samples_per_sec']:>12,} "
+                          f"{record['peak_rss_mb']:>8.1f}")
+                else:
+                    print(f"{name:<28} {duration:>6} {sr:>6}  ✗ {record['error']}")
+    
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "code_version": code_version(),
+            "render_dtype": RENDER_DTYPE,
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count()
+        },
+        "results": results
+    }
+
+
+def compare_benchmarks(current, baseline, tolerance=BENCH_REGRESSION_TOLERANCE):
+    """
+    Ölçümleri taban çizgisiyle karşılaştır; gerileme kayıtlarını döndür.
+    Çok kısa süreler ve küçük bellek farkları gürültü sayılır (BENCH_MIN_DELTA_*).
+    """
+    base = {(r["name"], r["duration"], r["sr"]): r for r in baseline["results"] if r["status"] == "ok"}
+    regressions = []
+    print("=" * 70)
+    print(f"TABAN ÇİZGİSİ KARŞILAŞTIRMASI (tolerans %{tolerance * 100:.0f})")
+    print("=" * 70)
+    
+    for record in current["results"]:
+        before = base.get((record["name"], record["duration"], record["sr"]))
+        if before is None or record["status"] != "ok":
+            continue
+        time_ratio = record["seconds"] / before["seconds"] if before["seconds"] > 0 else 1.0
+        mem_delta = record["peak_delta_mb"] - before["peak_delta_mb"]
+        slower = (time_ratio > 1 + tolerance
+                  and record["seconds"] - before["seconds"] > BENCH_MIN_DELTA_SECONDS)
+        heavier = (mem_delta > BENCH_MIN_DELTA_MB
+                   and record["peak_delta_mb"] > before["peak_delta_mb"] * (1 + tolerance))
+        marker = "✗ GERİLEME" if slower or heavier else "✓"
+        print(f"{marker:<11} {record['name']:<28} {record['duration']:>6}s {record['sr']:>6}Hz "
+              f"süre ×{time_ratio:.2f}, bellek {mem_delta:+.1f} MB")
+        if slower or heavier:
+            regressions.append({
+                "name": record["name"],
+                "duration": record["duration"],
+                "sr": record["sr"],
+                "time_ratio": round(time_ratio, 3),
+                "mem_delta_mb": round(mem_delta, 1),
+                "slower": slower,
+                "heavier": heavier
+            })
+    
+    print(f"\n{len(regressions)} gerileme bulundu")
+    return regressions
+
+
+def bench_cli(argv):
+    """bench komutu: ölç, JSON olarak kaydet, istenirse taban çizgisiyle karşılaştır (gerilemede 1 döndürür)"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog="sampler.py bench", description="Generator ve pipeline performans ölçümü")
+    parser.add_argument("--quick", action="store_true", help="Kısa tarama (1 ve 10 sn, 44100 Hz)")
+    parser.add_argument("--durations", help="Virgülle ayrılmış süreler (sn)")
+    parser.add_argument("--rates", help="Virgülle ayrılmış örnekleme hızları (Hz)")
+    parser.add_argument("--only", help="Virgülle ayrılmış hedef adı parçaları")
+    parser.add_argument("--out", help="Sonuç JSON dosyası (varsayılan output/benchmarks/bench_<zaman>.json)")
+    parser.add_argument("--compare", help="Karşılaştırılacak taban çizgisi JSON dosyası")
+    args = parser.parse_args(argv)
+    
+    durations = BENCH_QUICK["durations"] if args.quick else None
+    sample_rates = BENCH_QUICK["sample_rates"] if args.quick else None
+    if args.durations:
+        durations = [float(value) for value in args.durations.split(",")]
+    if args.rates:
+        sample_rates = [int(value) for value in args.rates.split(",")]
+    only = args.only.split(",") if args.only else None
+    
+    results = run_benchmarks(durations, sample_rates, only)
+    
+    out_path = args.out or os.path.join("output", "benchmarks",
+                                        f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as out:
+        json.dump(results, out, indent=2, ensure_ascii=False)
+    print(f"\nSonuçlar kaydedildi: {out_path}")
+    
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as source:
+            baseline = json.load(source)
+        if compare_benchmarks(results, baseline):
+            return 1
+    return 0
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BÖLÜM 17: ANA PROGRAM
+# ═══════════════════════════════════════════════════════════════════════════
+
+def main():
+    """Ana üretim fonksiyonu"""
+    print("\n" + "=" * 70)
+    print("ADVANCED AUDIO DSP & AI-ASSISTED SOUND GENERATOR")
+    print("=" * 70)
+    print(f"Yapılandırma:")
+    print(f"  - Süre: {DURATION}s")
+    print(f"  - Örnekleme Hızı: {SAMPLE_RATE}Hz")
+    print(f"  - Stereo: {STEREO_MODE}")
+    print(f"  - Master Amplitude: {MASTER_AMPLITUDE}")
+    print(f"  - Noise Generator: {ENABLE_NOISE_GENERATOR}")
+    print(f"  - Natural Sounds: {ENABLE_NATURAL_SOUNDS}")
+    print(f"  - Mixing System: {ENABLE_MIXING_SYSTEM}")
+    print(f"  - Frequency Filters: {ENABLE_FREQUENCY_FILTERS}")
+    print(f"  - Visualizer: {ENABLE_VISUALIZER}")
+    print(f"  - File Export: {ENABLE_FILE_EXPORT}")
+    print(f"  - Streaming: {STREAMING_MODE} (blok={BLOCK_SIZE})")
+    print("=" * 70 + "\n")
+    
+    if SERVER_MODE:
+        serve_scenes(SERVER_HOST, SERVER_PORT)
+        return None
+    
+    if BATCH_FILE:
+        run_batch(BATCH_FILE, BATCH_WORKERS, BATCH_OUTPUT_DIR)
+        return None
+    
+    if PROFILE_MODE:
+        profile_begin()
+    
+    if STREAMING_MODE:
+        final_signal, output_signal = _render_streaming()
+    else:
+        final_signal, output_signal = _render_in_memory()
+    
+    # Görselleştirme
+    if ENABLE_VISUALIZER:
+        print("\nGörselleştirme oluşturuluyor...")
+        visualize_signal(final_signal, SAMPLE_RATE, "Final Mixed Output", seed=SCENE_SEED, duration=DURATION)
     
     # Dosya çıktısı
+    if ENABLE_FILE_EXPORT and not STREAMING_MODE:
+        export_audio(output_signal, SAMPLE_RATE, STEREO_MODE, rng=SCENE_SEED, seed=SCENE_SEED, duration=DURATION)
+    
+    if PROFILE_MODE:
+        profile_end()
+    
+    _print_summary(int(DURATION * SAMPLE_RATE))
+    
+    return output_signal
+
+
+def _render_streaming():
+    """Akış modu: karışımı bloklar halinde üret ve doğrudan dosyaya yaz"""
+    if ENABLE_MIXING_SYSTEM:
+        blocks = stream_mix_blogs(
+            DURATION,
+            SAMPLE_RATE,
+            mix_blog_config,
+            noise_mix,
+            brainwave_config,
+            naturalness_params,
+            BLOCK_SIZE,
+            scene_seed=SCENE_SEED
+        )
+    else:
+        print("Mix sistemi devre dışı, test sinyali üretiliyor...")
+        blocks = stream_pink_noise(DURATION, SAMPLE_RATE, MASTER_AMPLITUDE, BLOCK_SIZE, rng=SCENE_SEED)
+    
+    # Görselleştirme için ilk 5 saniyelik önizleme
+    preview = []
+    blocks = stream_tap(blocks, preview, SAMPLE_RATE * 5)
+    
     if ENABLE_FILE_EXPORT:
-        export_audio(output_signal, SAMPLE_RATE, STEREO_MODE)
+        export_audio(blocks, SAMPLE_RATE, STEREO_MODE, rng=SCENE_SEED, seed=SCENE_SEED, duration=DURATION)
+    else:
+        for _ in blocks:
+            pass
+    
+    final_signal = np.concatenate(preview) if preview else np.zeros(0)
+    return final_signal, None
+
+
+def _render_in_memory():
+    """Tek seferlik mod: tüm sinyali bellekte üret"""
+    # Ana karışık sinyal üret
+    if ENABLE_MIXING_SYSTEM:
+        final_signal = mix_blogs(
+            DURATION,
+            SAMPLE_RATE,
+            mix_blog_config,
+            noise_mix,
+            brainwave_config,
+            naturalness_params,
+            scene_seed=SCENE_SEED
+        )
+    else:
+        # Sadece tek bir test sinyali üret
+        print("Mix sistemi devre dışı, test sinyali üretiliyor...")
+        final_signal = generate_pink_noise(DURATION, SAMPLE_RATE, MASTER_AMPLITUDE, rng=SCENE_SEED)
     
+    # Stereo: mix_blogs katmanları doğrudan (n, 2) karışıma yerleştirir; mono test
+    # sinyali dosyaya blok blok iki kanal olarak yazılır (tam kopya yok)
+    return final_signal, final_signal
+
+
+def _print_summary(n_frames):
+    """Üretim özeti ve kullanım kılavuzu"""
     # Özet rapor
     print("\n" + "=" * 70)
     print("ÜRETIM TAMAMLANDI")
@@ -1720,11 +6056,23 @@ def main():
     
     print(f"\nToplam Aktif Katman: {layer_count}")
     print(f"Toplam Süre: {DURATION}s")
-    print(f"Toplam Örnek: {len(final_signal):,}")
+    print(f"Toplam Örnek: {n_frames:,}")
     print(f"Örnekleme Hızı: {SAMPLE_RATE}Hz")
-    print(f"Bit Derinliği: 32-bit float")
+    subtype = export_subtype(EXPORT_FORMAT, EXPORT_SUBTYPE)
+    if subtype in PCM_BITS:
+        bit_depth = f"{PCM_BITS[subtype]}-bit PCM"
+    else:
+        bit_depth = "32-bit float" if subtype == "FLOAT" else "kayıplı"
+    print(f"Dosya Formatı: {EXPORT_FORMAT.upper()} / {subtype} ({bit_depth})")
     print(f"Kanal: {'Stereo (2ch)' if STEREO_MODE else 'Mono (1ch)'}")
     
+    cache = filter_cache_stats()
+    print(f"Filtre Önbelleği: {cache['hits']} isabet, {cache['misses']} ıska, {cache['size']}/{cache['maxsize']} kayıt")
+    
+    if LAYER_CACHE:
+        layer_cache = layer_cache_stats()
+        print(f"Katman Önbelleği: {layer_cache['files']} stem, {layer_cache['size_mb']:.1f}/{LAYER_CACHE_MAX_MB} MB")
+    
     if ENABLE_FREQUENCY_FILTERS and len(specific_frequencies) > 0:
         print(f"\nFrekans İşlemleri: {len(specific_frequencies)} işlem uygulandı")
         for idx, op in enumerate(specific_frequencies, 1):
@@ -1766,9 +6114,9 @@ def main():
    - mode: "tone" (ton üretir) veya "boost" (bandı güçlendirir)
 
 6. STEREO GENİŞLİK AYARLAMA:
-   - main() fonksiyonunda stereo shift miktarını değiştirin:
-     right_channel = np.roll(final_signal, int(SAMPLE_RATE * 0.001))
-   - 0.001 değerini artırarak daha geniş stereo elde edin
+   - STEREO_WIDTH: tüm katmanların varsayılan genişliği (0: mono merkez, 1: tamamen dekorele)
+   - STEREO_LAYERS: katman başına pan/genişlik, ör.
+     STEREO_LAYERS = {"natural:rain": {"pan": -0.3, "width": 0.9}}
 
 7. ÇIKTI AYARLARI:
    - DURATION: Toplam süreyi saniye olarak ayarlayın
@@ -1810,7 +6158,42 @@ def main():
 10. PERFORMANS İPUÇLARI:
     - Uzun süreler için (>60s) DURATION'ı artırın
     - Daha hızlı işlem için SAMPLE_RATE'i düşürün (22050)
-    - ENABLE_VISUALIZER'ı False yaparak render hızını artırın
+    - ENABLE_VISUALIZER'ı False yaparak render hızını artırın; VISUALIZER_MODE="png"
+      pencere açmadan output/'a görsel yazar (saatlik render için de < 1 s)
+    - Saatlik renderlar için STREAMING_MODE=True yapın (bellek DURATION'dan bağımsız);
+      varsayılan tek geçişte kalibrasyon tahmini + limiter kullanılır; SCENE_SEED sabitken
+      seviyeler iki ön geçişle kesinleşir (ilk render ~3x, sonra önbellekten),
+      STREAM_LEVEL_PREPASS=True rastgele tohumda da ön geçiş yapar
+    - Çok katmanlı sahnelerde PARALLEL_WORKERS'ı çekirdek sayısına çıkarın
+      (SCENE_SEED sabitse çıktı işçi sayısından bağımsız olarak aynıdır)
+    - RENDER_DTYPE="float32" bellek ve bant genişliğini yarıya indirir
+      (WAV zaten float32 yazılır; faz/zaman eksenleri float64 kalır)
+    - SCENE_SEED sabitken LAYER_CACHE tekrar eden katmanları output/layer_cache'ten okur
+      (kod ya da parametre değişince ilgili kayıt kendiliğinden geçersiz olur)
+    - LOOP_MODE=True: rüzgar, okyanus ve teknik gürültüler LOOP_SECONDS'lık tek bir
+      dikişsiz segmentten döşenir (LOOP_VARIATION tekrarları yavaşça değiştirir)
+    - DURATION=LOOP_SECONDS ve yalnızca döngülenebilir katmanlarla (LOOP_VARIATION=0)
+      üretilen dosya, oynatıcılarda kesintisiz tekrar edilebilen bir döngü varlığıdır
+    - Birden çok noise türü tek beyaz gürültü ve tek ileri FFT'yi paylaşır;
+      FFT_WORKERS=-1 uzun FFT'leri tüm çekirdeklere dağıtır
+    - SERVER_MODE=True: sahneler http://127.0.0.1:8765/render üzerinden chunked
+      WAV/PCM/FLAC olarak akıtılır; ilk ses SERVER_CALIBRATION_SECONDS sonra gelir
+      (ör. curl -d '{"noise_types": {"pink": true}, "format": "wav"}' .../render > a.wav)
+    - Katalog varyantları için: python sampler.py batch scenes.jsonl 4
+      (her satır bir sahne; çıktılar ve manifest.jsonl BATCH_OUTPUT_DIR'a yazılır)
+    - Yavaş render'ın nedeni için PROFILE_MODE=True: katman ve aşama (synthesis,
+      bandpass, naturalness alt adımları, frekans işlemleri, normalize, export)
+      başına süre/CPU/bellek output/profiles'a yazılır; .trace.json dosyası
+      chrome://tracing ya da ui.perfetto.dev ile zaman çizelgesi olarak açılır
+    - Performans ölçümü: python sampler.py bench --quick --out baseline.json,
+      değişiklikten sonra python sampler.py bench --quick --compare baseline.json
+    - Saatlik arşiv kayıtları için EXPORT_FORMAT="flac", EXPORT_SUBTYPE="PCM_24"
+      (STREAMING_MODE ile dosyaya blok blok eklenir; bellek birkaç blok kadardır);
+      dosya adları EXPORT_FILENAME_TEMPLATE ile, ör. "scene_{seed}_{sr}hz_{timestamp}"
+    - Katalog genelinde tutarlı algılanan seviye için MASTER_MODE="lufs":
+      sahneler MASTER_TARGET_LUFS'a çekilir, true-peak limiter tepeleri
+      MASTER_TRUE_PEAK_DB altında tutar; akışta MASTER_LOUDNESS_TWO_PASS=True
+      kesin ölçüm yapar (sabit tohumda output/loudness_cache'ten tekrar kullanılır)
     - Çok fazla katman karıştırıyorsanız MASTER_AMPLITUDE'u azaltın
 
 11. TEKNİK NOISE FARKLARI:
@@ -1843,8 +6226,6 @@ NOTLAR:
 - Extreme değerler beklenmeyen sonuçlar üretebilir
 """)
     print("=" * 70 + "\n")
-    
-    return output_signal
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -1852,6 +6233,18 @@ NOTLAR:
 # ═══════════════════════════════════════════════════════════════════════════
 
 if __name__ == "__main__":
+    import sys
+    
+    # Performans ölçümü: python sampler.py bench [--quick] [--compare baseline.json]
+    if len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        sys.exit(bench_cli(sys.argv[2:]))
+    
+    # Toplu render komutu: python sampler.py batch scenes.jsonl [işçi_sayısı]
+    if len(sys.argv) >= 3 and sys.argv[1] == "batch":
+        BATCH_FILE = sys.argv[2]
+        if len(sys.argv) >= 4:
+            BATCH_WORKERS = int(sys.argv[3])
+    
     try:
         final_audio = main()
         print("\n✓ Program başarıyla tamamlandı!\n")
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sampler  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(monkeypatch, tmp_path):
+    """Testler output/ altındaki önbelleklere dokunmaz"""
+    monkeypatch.setattr(sampler, "LAYER_CACHE", False)
+    monkeypatch.setattr(sampler, "LOUDNESS_CACHE_DIR", str(tmp_path / "loudness_cache"))
@@ -0,0 +1,46 @@
+import contextlib
+import io
+import json
+import os
+
+import soundfile as sf
+
+import sampler
+
+
+def test_batch_records_failures_and_continues(tmp_path, monkeypatch):
+    # İşçiler yeni süreçte başlar (conftest ayarları geçmez): göreli önbellek yolları tmp altında kalır
+    monkeypatch.chdir(tmp_path)
+    output_dir = tmp_path / "batch"
+    # Çıktı yolunu işgal eden klasör: sahne geçerli, yazım işçide hata verir
+    (output_dir / "taken.wav").mkdir(parents=True)
+    scene = {"duration": 1, "sr": 8000, "seed": 3, "stereo": False}
+    lines = [
+        json.dumps({**scene, "name": "first"}),
+        "{bozuk json",
+        json.dumps({**scene, "format": "mp3"}),
+        json.dumps({**scene, "name": "taken"}),
+        "",
+        json.dumps({**scene, "name": "last", "format": "flac"}),
+    ]
+    requests = tmp_path / "scenes.jsonl"
+    requests.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        records = sampler.run_batch(str(requests), workers=2, output_dir=str(output_dir))
+    
+    # Boş satır iş sayılmaz; her iş manifest'e tam bir kez yazılır
+    with open(output_dir / "manifest.jsonl", encoding="utf-8") as manifest:
+        manifest_records = sorted((json.loads(line) for line in manifest), key=lambda record: record["index"])
+    assert manifest_records == records
+    assert [record["index"] for record in records] == [0, 1, 2, 3, 4]
+    assert [record["status"] for record in records] == ["ok", "error", "error", "error", "ok"]
+    assert "JSON" in records[1]["error"]
+    assert "mp3" in records[2]["error"]
+    assert records[3]["output"] is None
+    
+    for record in (records[0], records[4]):
+        audio, sr = sf.read(record["output"])
+        assert sr == 8000
+        assert len(audio) == record["frames"] == 8000
+    assert os.path.basename(records[4]["output"]) == "last.flac"
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+import sampler
+
+
+def damped_sine(t, p):
+    return np.sin(2 * np.pi * p["freq"] * t) * np.exp(-t * p["decay"])
+
+
+def per_event_loop(buffer, sr, onsets, lengths, waveform, params):
+    """Olay başına Python döngüsüyle aynı dalgaları ekleyen referans"""
+    for i, (onset, length) in enumerate(zip(onsets, lengths)):
+        t = (np.arange(length) / sr).astype(np.float32)[None, :]
+        wave = waveform(t, {name: value[i:i+1, None].astype(np.float32) for name, value in params.items()})[0]
+        end = min(len(buffer), onset + length)
+        buffer[onset:end] += wave[:end - onset]
+    return buffer
+
+
+@pytest.mark.parametrize("batch_samples", [1 << 20, 4000])
+def test_add_events_matches_per_event_loop(monkeypatch, batch_samples):
+    # Küçük parti sınırı olayları birden çok partiye böler
+    monkeypatch.setattr(sampler, "EVENT_BATCH_SAMPLES", batch_samples)
+    rng = np.random.default_rng(3)
+    sr, n_samples, n_events = 8000, 20000, 300
+    
+    # Sırasız, üst üste binen ve buffer sonunu aşan olaylar
+    onsets = rng.integers(0, n_samples, n_events)
+    onsets[:3] = [n_samples - 1, n_samples - 50, 0]
+    lengths = rng.integers(1, 400, n_events)
+    params = {"freq": 200 + rng.random(n_events) * 2000, "decay": 10 + rng.random(n_events) * 100}
+    
+    expected = per_event_loop(np.zeros(n_samples), sr, onsets, lengths, damped_sine, params)
+    result = sampler.add_events(np.zeros(n_samples), sr, onsets, lengths, damped_sine, params)
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("n_events", [20, 2000])
+def test_add_kernel_events_matches_per_event_loop(n_events):
+    # 20 olay seyrek scatter yolunu, 2000 olay FFT konvolüsyon yolunu kullanır
+    rng = np.random.default_rng(4)
+    n_samples = 10000
+    kernel = np.hanning(300) * np.sin(np.arange(300) * 0.3)
+    onsets = rng.integers(0, n_samples, n_events)
+    gains = rng.random(n_events)
+    
+    expected = np.zeros(n_samples)
+    for onset, gain in zip(onsets, gains):
+        end = min(n_samples, onset + len(kernel))
+        expected[onset:end] += kernel[:end - onset] * gain
+    
+    result = sampler.add_kernel_events(np.zeros(n_samples), onsets, kernel, gains)
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-6)
+
+
+def test_add_events_without_events_leaves_buffer():
+    buffer = np.ones(100)
+    sampler.add_events(buffer, 8000, [], 10, damped_sine, {"freq": [], "decay": []})
+    np.testing.assert_array_equal(buffer, np.ones(100))
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+import sampler
+
+
+def read(path, dtype):
+    return sf.read(path, dtype=dtype)[0]
+
+
+def write_blocks(path, sig, fmt, subtype, dither, rng=0):
+    """sig'i düzensiz bloklar halinde AudioWriter ile yaz"""
+    channels = 2 if sig.ndim == 2 else 1
+    with sampler.AudioWriter(str(path), 22050, channels, fmt, subtype, dither=dither, rng=rng) as writer:
+        for start, end in [(0, 1), (1, 1000), (1000, 1000), (1000, len(sig))]:
+            writer.write(sig[start:end])
+    assert writer.n_frames == len(sig)
+    return writer
+
+
+def sample_signal(channels=2):
+    """Tam ölçeğe yakın düzgün dağılımlı sinyal"""
+    rng = np.random.default_rng(0)
+    sig = rng.uniform(-1, 1, (5000, channels)) * 0.9
+    # Tam ölçek dışı örnekler kırpılır
+    sig[10] = 1.5
+    sig[11] = -1.5
+    return sig
+
+
+@pytest.mark.parametrize("fmt, subtype", [("wav", "PCM_16"), ("wav", "PCM_24"), ("flac", "PCM_16"), ("flac", "PCM_24")])
+def test_integer_round_trip_without_dither(tmp_path, fmt, subtype):
+    sig = sample_signal()
+    bits = sampler.PCM_BITS[subtype]
+    path = tmp_path / f"out.{fmt}"
+    
+    write_blocks(path, sig, fmt, subtype, dither=False)
+    data, sr = sf.read(path, dtype="int16" if bits == 16 else "int32")
+    assert sr == 22050
+    np.testing.assert_array_equal(data, sampler.quantize_pcm(np.clip(sig, -1, 1).astype(np.float32), bits))
+
+
+@pytest.mark.parametrize("fmt, subtype", [("wav", "PCM_16"), ("flac", "PCM_24")])
+def test_integer_round_trip_with_dither(tmp_path, fmt, subtype):
+    sig = sample_signal()
+    scale = 2 ** (sampler.PCM_BITS[subtype] - 1) - 1
+    path = tmp_path / f"out.{fmt}"
+    
+    writer = write_blocks(path, sig, fmt, subtype, dither=True)
+    assert writer.rng is not None
+    write_blocks(tmp_path / f"plain.{fmt}", sig, fmt, subtype, dither=False)
+    data = read(path, "float64")
+    assert not np.array_equal(data, read(tmp_path / f"plain.{fmt}", "float64"))
+    
+    # TPDF dither ±1 LSB + yuvarlama ½ LSB (yazıcının float32 girdisine göre); hata ortalaması sıfır
+    error = data * (scale + 1) - np.clip(sig, -1, 1).astype(np.float32) * scale
+    assert np.abs(error).max() <= 1.5
+    assert abs(error.mean()) < 0.05
+
+
+def test_float_round_trip_is_exact_and_never_dithered(tmp_path):
+    sig = sample_signal(channels=1)[:, 0]
+    path = tmp_path / "out.wav"
+    
+    writer = write_blocks(path, sig, "wav", "FLOAT", dither=True)
+    assert writer.bits is None
+    assert writer.rng is None
+    data = read(path, "float32")
+    np.testing.assert_array_equal(data, np.clip(sig, -1, 1).astype(np.float32))
+
+
+def test_dither_seed_makes_output_reproducible(tmp_path):
+    sig = sample_signal()
+    
+    for name, seed in (("a", 5), ("b", 5), ("c", 6)):
+        write_blocks(tmp_path / f"{name}.wav", sig, "wav", "PCM_16", dither=True, rng=seed)
+    np.testing.assert_array_equal(read(tmp_path / "a.wav", "int16"), read(tmp_path / "b.wav", "int16"))
+    assert not np.array_equal(read(tmp_path / "a.wav", "int16"), read(tmp_path / "c.wav", "int16"))
+
+
+def test_export_subtype_validation():
+    assert sampler.export_subtype("wav") == "FLOAT"
+    assert sampler.export_subtype("flac") == "PCM_16"
+    assert sampler.export_subtype("ogg", "PCM_24") == "VORBIS"
+    with pytest.raises(ValueError):
+        sampler.export_subtype("flac", "FLOAT")
+    with pytest.raises(ValueError):
+        sampler.export_subtype("mp3")
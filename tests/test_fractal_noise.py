@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+import sampler
+
+
+# Düzensiz bölünme: sıfır boylu, tek örnekli ve kafes hücresi sınırını aşan bloklar
+SIZES = [0, 1, 7, 1000, 0, 4096, 3, 2889]
+
+
+@pytest.mark.parametrize("base_spacing", [1, 3, 64])
+def test_fractal_noise_independent_of_chunking(base_spacing):
+    # 1 ve 3: ince oktavlar GEMM yolunda, 64: yalnızca kaba oktav yolu
+    noise = sampler.FractalNoise(octaves=6, rng=7, base_spacing=base_spacing)
+    
+    expected = noise.render(0, sum(SIZES))
+    offsets = np.cumsum([0] + SIZES[:-1])
+    result = np.concatenate([noise.render(start, length) for start, length in zip(offsets, SIZES)])
+    # Aynı konum her bölünmede aynı değeri verir (hizalı GEMM yolu ve kırpılan yol)
+    np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("peak", [0.5, 1.0])
+def test_fractal_noise_stays_within_peak(peak):
+    noise = sampler.FractalNoise(octaves=8, rng=3, peak=peak)
+    values = noise.render(12345, 200000)
+    
+    assert np.abs(values).max() <= peak
+    # Sınır gevşek değil: tepe değerin anlamlı bir kısmına ulaşılır
+    assert np.abs(values).max() > 0.5 * peak
+
+
+def test_stream_perlin_noise_matches_generate():
+    n_samples = 50000
+    
+    expected = sampler.generate_perlin_noise(n_samples, octaves=5, rng=9)
+    result = np.concatenate(list(sampler.stream_perlin_noise(n_samples, 44100, octaves=5, block_size=4099, rng=9)))
+    np.testing.assert_array_equal(result, expected)
@@ -0,0 +1,89 @@
+import contextlib
+import copy
+import io
+import os
+
+import numpy as np
+import pytest
+
+import sampler
+
+
+@pytest.fixture
+def layer_cache(monkeypatch, tmp_path):
+    """Katman önbelleği açık, geçici dizinde"""
+    monkeypatch.setattr(sampler, "LAYER_CACHE", True)
+    monkeypatch.setattr(sampler, "LAYER_CACHE_DIR", str(tmp_path / "layer_cache"))
+    return tmp_path / "layer_cache"
+
+
+def scene_args(duration=2, sr=22050):
+    noise_mix = copy.deepcopy(sampler.noise_mix)
+    for name, config in noise_mix.items():
+        config["enabled"] = name in ("rain", "wind")
+    brainwaves = copy.deepcopy(sampler.brainwave_config)
+    for config in brainwaves.values():
+        config["enabled"] = False
+    noise_types = {name: name == "pink" for name in sampler.noise_types}
+    return (duration, sr, None, noise_mix, brainwaves, sampler.naturalness_params), noise_types
+
+
+def test_layer_cache_hit_skips_render(layer_cache, monkeypatch):
+    args, noise_types = scene_args()
+    rendered = []
+    render_layer = sampler.render_layer
+    
+    def counting(layer, *a, **kw):
+        rendered.append(layer["key"])
+        return render_layer(layer, *a, **kw)
+    
+    monkeypatch.setattr(sampler, "render_layer", counting)
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = sampler.mix_blogs(*args, scene_seed=5, workers=1, noise_type_cfg=noise_types)
+        n_first = len(rendered)
+        second = sampler.mix_blogs(*args, scene_seed=5, workers=1, noise_type_cfg=noise_types)
+    
+    # İkinci render hiçbir katmanı yeniden üretmez
+    assert n_first == 3
+    assert len(rendered) == n_first
+    assert sampler.layer_cache_stats()["files"] == 3
+    assert first.tobytes() == second.tobytes()
+
+
+def test_random_seed_scene_is_not_cached(layer_cache, monkeypatch):
+    monkeypatch.setattr(sampler, "SCENE_SEED", None)
+    args, noise_types = scene_args()
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        sampler.mix_blogs(*args, workers=1, noise_type_cfg=noise_types)
+    assert sampler.layer_cache_stats()["files"] == 0
+
+
+def test_layer_cache_key_invalidation(monkeypatch):
+    args, noise_types = scene_args()
+    layer = sampler.collect_layers(*args[3:6], noise_types)[0]
+    key = sampler.layer_cache_key(layer, 2, 22050, 5)
+    
+    assert sampler.layer_cache_key(copy.deepcopy(layer), 2, 22050, 5) == key
+    changed = copy.deepcopy(layer)
+    changed["naturalness"] = layer["naturalness"] / 2
+    assert sampler.layer_cache_key(changed, 2, 22050, 5) != key
+    assert sampler.layer_cache_key(layer, 3, 22050, 5) != key
+    assert sampler.layer_cache_key(layer, 2, 44100, 5) != key
+    assert sampler.layer_cache_key(layer, 2, 22050, 6) != key
+    # Sentez kodu değişince eski kayıtlar kullanılmaz
+    monkeypatch.setattr(sampler, "code_version", lambda: "0" * 16)
+    assert sampler.layer_cache_key(layer, 2, 22050, 5) != key
+
+
+def test_evict_layer_cache_removes_least_recently_used(layer_cache):
+    stem = np.zeros(128 * 1024)  # 1 MB
+    for age, key in enumerate(("a", "b", "c")):
+        sampler.layer_cache_store(key, stem)
+        os.utime(layer_cache / f"{key}.npy", (1000 + age, 1000 + age))
+    
+    # Okunan kayıt en yeni olur: en eski kullanılan artık "b"
+    assert sampler.layer_cache_load("a") is not None
+    assert sampler.evict_layer_cache(max_mb=2.5) == 1
+    assert sorted(os.listdir(layer_cache)) == ["a.npy", "c.npy"]
+    assert sampler.layer_cache_load("b") is None
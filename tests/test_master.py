@@ -0,0 +1,92 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+import scipy.signal as sps
+
+import sampler
+
+
+def limited(limiter, sig, sizes):
+    """sig'i sizes boylarında parçalar halinde limiter'dan geçir, kalanını flush et"""
+    edges = np.cumsum([0] + list(sizes))
+    blocks = [limiter.process(sig[start:end]) for start, end in zip(edges[:-1], edges[1:])]
+    return np.concatenate(blocks + [limiter.flush()])
+
+
+def loud_signal(n_samples, channels, sr=48000):
+    """Tavanın çok üstünde tepeler: gürültü + ani sinüs patlamaları"""
+    rng = np.random.default_rng(0)
+    shape = (n_samples,) if channels == 1 else (n_samples, channels)
+    sig = rng.standard_normal(shape) * 0.5
+    t = np.arange(n_samples) / sr
+    burst = np.sin(2 * np.pi * 11000 * t) * 4.0 * (np.sin(2 * np.pi * 1.5 * t) > 0.9)
+    return sig + (burst if channels == 1 else burst[:, None])
+
+
+def true_peak_db(sig, oversample=None):
+    """
+    True-peak (dBTP): oversample verilmezse BS.1770 4x/48 tap interpolatörüyle
+    (limiter'ın ölçtüğü tanım), verilirse bağımsız resample_poly aşırı örneklemesiyle
+    """
+    if oversample is None:
+        columns = sig.T if sig.ndim == 2 else sig[None]
+        peak = max(np.abs(np.convolve(column, taps)).max() for taps in sampler.true_peak_phases() for column in columns)
+    else:
+        peak = np.abs(sps.resample_poly(sig, oversample, 1, axis=0)).max()
+    return 20 * np.log10(max(peak, np.abs(sig).max()))
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_limiter_output_stays_under_ceiling(channels):
+    sr, ceiling_db = 48000, -1.0
+    sig = loud_signal(sr * 2, channels)
+    
+    out = limited(sampler.TruePeakLimiter(sr, ceiling_db), sig, [1, 100, 4096, 30000, 17, sr * 2 - 34214])
+    assert out.shape == sig.shape
+    # Kazanç interpolatör penceresi içinde değiştiği için ara tepeler ~1e-4 dB aşabilir
+    assert true_peak_db(out) <= ceiling_db + 1e-3
+
+
+def test_limiter_true_peak_with_independent_oversampling():
+    sr, ceiling_db = 48000, -1.0
+    # 16 kHz altı içerik: 48 tap interpolatör bu bantta tepeyi en fazla ~0.1 dB eksik okur
+    sig = sps.sosfilt(sps.butter(8, 16000 / (sr / 2), output='sos'), loud_signal(sr * 2, 1))
+    
+    out = limited(sampler.TruePeakLimiter(sr, ceiling_db), sig, [sr * 2])
+    assert true_peak_db(out, oversample=16) <= ceiling_db + 0.15
+
+
+def test_limiter_passes_quiet_signal_unchanged():
+    sr = 48000
+    sig = np.random.default_rng(1).standard_normal(sr) * 0.05
+    limiter = sampler.TruePeakLimiter(sr)
+    
+    out = limited(limiter, sig, [5000, sr - 5000])
+    # Tavanın altında kalan sinyal yalnızca gecikmeyle değişmeden geçer (float32 çıktı)
+    np.testing.assert_allclose(out, sig, rtol=0, atol=1e-7)
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_master_process_hits_target_loudness(channels):
+    sr = 48000
+    rng = np.random.default_rng(2)
+    shape = (sr * 10,) if channels == 1 else (sr * 10, channels)
+    sig = sps.lfilter([1.0], [1.0, -0.9], rng.standard_normal(shape), axis=0) * 0.01
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        out = sampler.master_process(sig, sr, channels)
+    assert sampler.measure_loudness(out, sr) == pytest.approx(sampler.MASTER_TARGET_LUFS, abs=0.5)
+    assert np.abs(out).max() <= 10 ** (sampler.MASTER_TRUE_PEAK_DB / 20) * (1 + 1e-9)
+
+
+def test_master_process_duplicated_mono_counts_both_channels():
+    sr = 48000
+    sig = np.random.default_rng(3).standard_normal(sr * 5) * 0.01
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        out = sampler.master_process(sig, sr, channels=2)
+    # Mono karışım stereo çıkışa çoğaltılınca iki kanalın loudness'ı hedefte olur
+    stereo = np.stack([out, out], axis=1)
+    assert sampler.measure_loudness(stereo, sr) == pytest.approx(sampler.MASTER_TARGET_LUFS, abs=0.5)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import scipy.signal as sps
+
+import sampler
+
+
+@pytest.mark.parametrize("factor", [2, 4, 21])
+@pytest.mark.parametrize("extra", [-5, 0, 37])
+def test_stream_upsample_matches_upsample_stem(factor, extra):
+    # extra < 0: son blok kırpılır, > 0: çıkış sıfırla doldurulur
+    stem = np.random.default_rng(0).standard_normal(4001)
+    n_samples = len(stem) * factor + extra
+    block_size = 2048
+    
+    expected = sampler.upsample_stem(stem, factor, n_samples)
+    blocks = (stem[start:start + length] for start, length in sampler.block_ranges(len(stem), 1500))
+    result = list(sampler.stream_upsample(blocks, factor, n_samples, block_size))
+    assert [len(block) for block in result] == [length for _, length in sampler.block_ranges(n_samples, block_size)]
+    np.testing.assert_allclose(np.concatenate(result), expected, rtol=0, atol=1e-9)
+
+
+def test_upsample_stem_matches_resample_poly():
+    stem = np.random.default_rng(1).standard_normal(1000)
+    
+    np.testing.assert_allclose(sampler.upsample_stem(stem, 5, 5000), sps.resample_poly(stem, 5, 1), rtol=0, atol=1e-12)
+    assert sampler.upsample_stem(stem, 1, 1000) is stem
+
+
+def test_multirate_factor(monkeypatch):
+    layers = {layer["key"]: layer for layer in sampler.collect_layers(
+        {name: {**config, "enabled": True} for name, config in sampler.noise_mix.items()},
+        {name: {**config, "enabled": True} for name, config in sampler.brainwave_config.items()},
+        sampler.naturalness_params)}
+    thunder = layers["natural:thunder"]
+    
+    monkeypatch.setattr(sampler, "MULTIRATE_MODE", False)
+    assert sampler.multirate_factor(thunder, 44100) == 1
+    
+    monkeypatch.setattr(sampler, "MULTIRATE_MODE", True)
+    factor = sampler.multirate_factor(thunder, 44100)
+    # sr'yi tam böler, iç hız bandın MULTIRATE_OVERSAMPLE katından düşük değil
+    assert factor > 1
+    assert 44100 % factor == 0
+    assert 44100 // factor >= sampler.MULTIRATE_OVERSAMPLE * thunder["freq_range"][1]
+    # Listede olmayan ve geniş bantlı katmanlar tam hızda kalır
+    assert all(sampler.multirate_factor(layer, 44100) == 1
+               for key, layer in layers.items() if key not in sampler.MULTIRATE_LAYERS)
+
+
+def test_sub_audio_bandpass_is_designed_at_full_rate():
+    sr = 44100
+    sos = sampler.bandpass_sos(sr, (0.5, 4.0))
+    
+    # Bölüm yanıtlarının çarpımı doğrudan (freqz küçük pay katsayılarında uyarı verir)
+    z = np.exp(-2j * np.pi * np.array([0.05, 2.0, 40.0]) / sr)
+    response = np.prod([np.polyval(section[2::-1], z) / np.polyval(section[:2:-1], z) for section in sos], axis=0)
+    gain_db = 20 * np.log10(np.abs(response))
+    assert gain_db[1] == pytest.approx(0.0, abs=0.5)
+    assert gain_db[0] < -20
+    assert gain_db[2] < -20
+    
+    # float32 blok, kutbu birim çembere yakın filtrede float64'te filtrelenir (kararlı)
+    sig = np.sin(2 * np.pi * 2.0 * np.arange(sr * 4) / sr)
+    expected = sps.sosfilt(sos, sig)
+    result = sampler.StatefulFilter(sos).process(sig.astype(np.float32))
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-5)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+import scipy.signal as sps
+
+import sampler
+
+
+@pytest.mark.parametrize("naturalness", [0.5, 0.9])
+def test_naturalness_stage_independent_of_chunking(naturalness):
+    sr, n_samples = 22050, 150000
+    sig = np.random.default_rng(0).standard_normal(n_samples)
+    
+    whole = sampler.NaturalnessStage(sr, naturalness, sampler.naturalness_params, n_samples, np.random.default_rng(5))
+    expected = whole.process(sig.copy())
+    
+    # Sayfa sınırını aşan, tek örnekli ve kaynaktan kopyalanan parçalar
+    chunked = sampler.NaturalnessStage(sr, naturalness, sampler.naturalness_params, n_samples, np.random.default_rng(5))
+    result = np.empty(n_samples)
+    edges = [0, 1, 8, 8192, 70000, 70003, n_samples]
+    for start, end in zip(edges[:-1], edges[1:]):
+        chunked.process(result[start:end], sig[start:end], 1.0)
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_normal_draws_are_standard_normal():
+    stage = sampler.NaturalnessStage(44100, 0.5, sampler.naturalness_params, 10, np.random.default_rng(1))
+    draws = stage._draw_normals(np.empty(1_000_000, dtype=np.float32))
+    
+    assert abs(draws.mean()) < 0.005
+    assert abs(draws.std() - 1.0) < 0.005
+    # İki taraflı 3σ kuyruğu ≈ %0.27
+    assert np.mean(np.abs(draws) > 3) == pytest.approx(0.0027, abs=0.0005)
+
+
+@pytest.mark.parametrize("sr", [22050, 44100, 96000])
+def test_spectral_tilt_sos_matches_separate_mix(sr):
+    sig = np.random.default_rng(2).standard_normal(sr * 5)
+    band = sampler.design_sos(4, (100 / (sr / 2), 0.95), 'band')
+    tilt_factor = -3.0 / 12.0 * 0.8
+    
+    expected = sig * (1 - abs(tilt_factor) * 0.3) + sps.sosfilt(band, sig) * tilt_factor * 0.3
+    result = sps.sosfilt(sampler.spectral_tilt_sos(sr, tilt_factor), sig)
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-7)
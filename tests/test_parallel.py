@@ -0,0 +1,46 @@
+import contextlib
+import copy
+import io
+
+import pytest
+
+import sampler
+
+
+def scene_args(names, duration=5, sr=22050):
+    """Yalnızca names doğal katmanları ve pembe gürültü açık mix_blogs argümanları"""
+    noise_mix = copy.deepcopy(sampler.noise_mix)
+    for name, config in noise_mix.items():
+        config["enabled"] = name in names
+    brainwaves = copy.deepcopy(sampler.brainwave_config)
+    for config in brainwaves.values():
+        config["enabled"] = False
+    noise_types = {name: name == "pink" for name in sampler.noise_types}
+    return (duration, sr, None, noise_mix, brainwaves, sampler.naturalness_params), noise_types
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_parallel_workers_do_not_change_bytes(channels):
+    args, noise_types = scene_args(("rain", "wind", "fire"))
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        serial = sampler.mix_blogs(*args, scene_seed=11, workers=1, noise_type_cfg=noise_types, channels=channels)
+        parallel = sampler.mix_blogs(*args, scene_seed=11, workers=2, noise_type_cfg=noise_types, channels=channels)
+    assert serial.tobytes() == parallel.tobytes()
+
+
+def test_parallel_shared_memory_is_one_row_per_worker(monkeypatch):
+    args, noise_types = scene_args(("rain", "wind", "fire", "crickets"), duration=2)
+    sizes = []
+    create = sampler.shared_memory.SharedMemory
+    
+    def recording(*a, **kw):
+        if kw.get("create"):
+            sizes.append(kw["size"])
+        return create(*a, **kw)
+    
+    monkeypatch.setattr(sampler.shared_memory, "SharedMemory", recording)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sampler.mix_blogs(*args, scene_seed=11, workers=2, noise_type_cfg=noise_types)
+    # Beş katman (dört doğal + pembe), iki işçi: yalnızca iki katman satırı
+    assert sizes == [2 * 2 * 22050 * sampler.render_dtype().itemsize]
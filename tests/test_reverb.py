@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+import scipy.signal as sps
+
+import sampler
+
+
+def chunked(process, sig, sizes):
+    """sig'i sırayla sizes boylarında parçalara bölüp process'ten geçir"""
+    edges = np.cumsum([0] + list(sizes))
+    assert edges[-1] == len(sig)
+    return np.concatenate([process(sig[start:end]) for start, end in zip(edges[:-1], edges[1:])])
+
+
+# Düzensiz bölünme: sıfır boylu, tek örnekli ve bölüm sınırını aşan bloklar
+SIZES = [0, 1, 7, 1000, 0, 4096, 3, 2889]
+
+
+@pytest.mark.parametrize("ir_length", [100, 512, 3000])
+@pytest.mark.parametrize("channels", [1, 2])
+def test_partitioned_convolver_matches_oneshot(ir_length, channels):
+    # 100: tek eksik bölüm, 512: tam bir bölüm, 3000: çok bölümlü gecikme hattı
+    rng = np.random.default_rng(1)
+    ir = rng.standard_normal(ir_length) * np.exp(-np.arange(ir_length) / 500)
+    shape = (sum(SIZES),) if channels == 1 else (sum(SIZES), channels)
+    sig = rng.standard_normal(shape)
+    
+    expected = sps.fftconvolve(sig, ir[:, None] if channels == 2 else ir, axes=0)[:len(sig)]
+    result = chunked(sampler.PartitionedConvolver(ir, partition=512).process, sig, SIZES)
+    assert result.shape == sig.shape
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-9)
+
+
+def test_partitioned_convolver_keeps_float32():
+    rng = np.random.default_rng(2)
+    ir = rng.standard_normal(2000) * np.exp(-np.arange(2000) / 300)
+    sig = rng.standard_normal(sum(SIZES)).astype(np.float32)
+    
+    expected = sps.fftconvolve(sig.astype(np.float64), ir)[:len(sig)]
+    result = chunked(sampler.PartitionedConvolver(ir, partition=256).process, sig, SIZES)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-4)
+
+
+def test_stream_reverb_matches_apply_reverb():
+    sr = 22050
+    spec = {"ir": None, "decay": 0.5, "wet": 0.3, "partition": 1024}
+    sig = np.random.default_rng(3).standard_normal(sr * 2)
+    
+    expected = sampler.apply_reverb(sig, sr, spec)
+    blocks = (sig[start:start + length] for start, length in sampler.block_ranges(len(sig), 5000))
+    result = np.concatenate(list(sampler.stream_reverb(blocks, sr, spec)))
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-9)
+    # Kapalı reverb sinyale dokunmaz
+    assert sampler.apply_reverb(sig, sr, None) is sig
+
+
+def test_procedural_ir_has_unit_energy_and_rt60_decay():
+    sr, decay = 22050, 0.8
+    ir = sampler.reverb_ir(None, decay, sr)
+    
+    assert len(ir) == int(decay * sr)
+    assert np.sum(ir ** 2) == pytest.approx(1.0)
+    # İlk ve son 50 ms pencereleri arasında (decay - 50 ms) sürede RT60 eğimiyle düşüş
+    window = int(0.05 * sr)
+    drop_db = 10 * np.log10(np.mean(ir[:window] ** 2) / np.mean(ir[-window:] ** 2))
+    assert drop_db == pytest.approx(60 * (decay - 0.05) / decay, abs=2)
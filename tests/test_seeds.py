@@ -0,0 +1,50 @@
+import contextlib
+import copy
+import io
+
+import numpy as np
+
+import sampler
+
+
+def scene_args(duration=3, sr=22050):
+    """Birkaç doğal katman, bir beyin dalgası ve pembe gürültü açık mix_blogs argümanları"""
+    noise_mix = copy.deepcopy(sampler.noise_mix)
+    for name, config in noise_mix.items():
+        config["enabled"] = name in ("rain", "wind", "fire")
+    brainwaves = copy.deepcopy(sampler.brainwave_config)
+    for name, config in brainwaves.items():
+        config["enabled"] = name == "alpha"
+    noise_types = {name: name == "pink" for name in sampler.noise_types}
+    return (duration, sr, None, noise_mix, brainwaves, sampler.naturalness_params), noise_types
+
+
+def test_same_scene_seed_gives_identical_bytes():
+    args, noise_types = scene_args()
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = sampler.mix_blogs(*args, scene_seed=42, workers=1, noise_type_cfg=noise_types)
+        second = sampler.mix_blogs(*args, scene_seed=42, workers=1, noise_type_cfg=noise_types)
+        other = sampler.mix_blogs(*args, scene_seed=43, workers=1, noise_type_cfg=noise_types)
+    assert first.tobytes() == second.tobytes()
+    assert first.tobytes() != other.tobytes()
+
+
+def test_same_scene_seed_gives_identical_stream_bytes():
+    args, noise_types = scene_args()
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        first, second = (np.concatenate(list(sampler.stream_mix_blogs(*args, 4096, scene_seed=42, noise_type_cfg=noise_types)))
+                         for _ in range(2))
+    assert first.tobytes() == second.tobytes()
+
+
+def draw(seed):
+    return np.random.default_rng(seed).random(4)
+
+
+def test_layer_seed_depends_only_on_scene_seed_and_layer():
+    # Katmanın akışı diğer katmanlardan bağımsızdır: yalnızca (sahne tohumu, katman anahtarı)
+    np.testing.assert_array_equal(draw(sampler.layer_seed(42, "rain")), draw(sampler.layer_seed(42, "rain")))
+    assert not np.array_equal(draw(sampler.layer_seed(42, "rain")), draw(sampler.layer_seed(42, "wind")))
+    assert not np.array_equal(draw(sampler.layer_seed(42, "rain")), draw(sampler.layer_seed(43, "rain")))
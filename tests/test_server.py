@@ -0,0 +1,83 @@
+import contextlib
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import sampler
+
+
+def test_parse_scene_rejects_wav_over_header_limit():
+    # 44.1 kHz stereo 16-bit: ~6.76 saatte RIFF boyutu 32 biti aşar
+    limit = (sampler.WAV_MAX_SIZE - 36) // 4 / 44100
+    
+    sampler.parse_scene({"format": "wav", "duration": int(limit), "sr": 44100, "stereo": True})
+    with pytest.raises(ValueError, match="WAV"):
+        sampler.parse_scene({"format": "wav", "duration": int(limit) + 1, "sr": 44100, "stereo": True})
+    
+    # Yalnızca WAV sınırlı: aynı süre mono WAV, FLAC ve PCM'de kabul edilir
+    sampler.parse_scene({"format": "wav", "duration": int(limit) + 1, "sr": 44100, "stereo": False})
+    for fmt in ("flac", "pcm"):
+        sampler.parse_scene({"format": fmt, "duration": sampler.SERVER_MAX_DURATION, "sr": 48000, "stereo": True})
+
+
+def test_wav_header_at_limit_packs():
+    n_frames = (sampler.WAV_MAX_SIZE - 36) // 4
+    header = sampler.wav_header(n_frames, 44100, 2)
+    
+    assert len(header) == 44
+    assert int.from_bytes(header[4:8], "little") == 36 + n_frames * 4
+
+
+@pytest.mark.parametrize("scene", [
+    [],
+    {"format": "mp3"},
+    {"duration": 0},
+    {"duration": sampler.SERVER_MAX_DURATION + 1},
+    {"duration": "uzun"},
+    {"sr": 4000},
+    {"seed": "abc"},
+    {"noise_mix": []},
+    {"noise_mix": {"lava": {"enabled": True}}},
+    {"noise_mix": {"rain": {"volume": 0.5}}},
+    {"noise_mix": {"rain": True}},
+    {"noise_mix": {"rain": {"enabled": "yes"}}},
+    {"noise_mix": {"rain": {"weight": "x"}}},
+    {"noise_mix": {"rain": {"freq_range": [100]}}},
+    {"noise_types": {"pink": 1}},
+])
+def test_parse_scene_rejects_bad_input(scene):
+    with pytest.raises(ValueError):
+        sampler.parse_scene(scene)
+
+
+def test_parse_scene_does_not_touch_defaults():
+    enabled = sampler.noise_mix["rain"]["enabled"]
+    scene = sampler.parse_scene({"noise_mix": {"rain": {"enabled": not enabled, "freq_range": [100, 9000]}}})
+    
+    assert scene["noise_mix"]["rain"]["enabled"] is (not enabled)
+    assert scene["noise_mix"]["rain"]["freq_range"] == (100.0, 9000.0)
+    assert sampler.noise_mix["rain"]["enabled"] is enabled
+
+
+@pytest.fixture
+def server():
+    httpd = sampler.ThreadingHTTPServer(("127.0.0.1", 0), sampler.SceneStreamHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.parametrize("body", [b"{bozuk", json.dumps({"format": "mp3"}).encode()])
+def test_bad_request_returns_400_before_streaming(server, body):
+    request = urllib.request.Request(f"{server}/render", data=body, method="POST")
+    with contextlib.redirect_stdout(io.StringIO()), pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request, timeout=10)
+    
+    assert error.value.code == 400
+    assert "error" in json.loads(error.value.read())
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+import scipy.signal as sps
+
+import sampler
+
+
+def chunked(process, sig, sizes):
+    """sig'i sırayla sizes boylarında parçalara bölüp process'ten geçir"""
+    edges = np.cumsum([0] + list(sizes))
+    assert edges[-1] == len(sig)
+    return np.concatenate([process(sig[start:end]) for start, end in zip(edges[:-1], edges[1:])])
+
+
+# Düzensiz bölünme: sıfır boylu, tek örnekli ve parça sınırını aşan bloklar
+SIZES = [0, 1, 7, 1000, 0, 4096, 3, 2889]
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_stateful_filter_chunked_matches_oneshot(channels):
+    shape = (sum(SIZES),) if channels == 1 else (sum(SIZES), channels)
+    sig = np.random.default_rng(0).standard_normal(shape)
+    sos = sampler.bandpass_sos(22050, (200, 2000))
+    
+    expected = sps.sosfilt(sos, sig, axis=0)
+    result = chunked(sampler.StatefulFilter(sos).process, sig, SIZES)
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-12)
+
+
+def test_stateful_filter_parallel_gain_chunked_matches_oneshot():
+    sig = np.random.default_rng(1).standard_normal(sum(SIZES))
+    sos = sampler.bandpass_sos(22050, (400, 800))
+    
+    expected = sig + sps.sosfilt(sos, sig) * 0.5
+    result = chunked(sampler.StatefulFilter(sos, parallel_gain=0.5).process, sig, SIZES)
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-12)
@@ -0,0 +1,72 @@
+import contextlib
+import copy
+import io
+
+import numpy as np
+import pytest
+
+import sampler
+
+
+def scene(names, seed, duration=120, sr=22050):
+    """Yalnızca names doğal katmanlarıyla (stream, tek seferlik) karışım çifti"""
+    noise_mix = copy.deepcopy(sampler.noise_mix)
+    for name, config in noise_mix.items():
+        config["enabled"] = name in names
+    brainwaves = copy.deepcopy(sampler.brainwave_config)
+    for config in brainwaves.values():
+        config["enabled"] = False
+    noise_types = {name: False for name in sampler.noise_types}
+    args = (duration, sr, None, noise_mix, brainwaves, sampler.naturalness_params)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        stream = np.concatenate(list(sampler.stream_mix_blogs(*args, 8192, scene_seed=seed, noise_type_cfg=noise_types)))
+        oneshot = sampler.mix_blogs(*args, scene_seed=seed, workers=1, noise_type_cfg=noise_types)
+    return stream, oneshot
+
+
+def rms_db(sig):
+    return 20 * np.log10(np.sqrt(np.mean(np.square(sig))))
+
+
+@pytest.mark.parametrize("names, seed", [(("thunder",), 2), (("thunder", "rain", "wind"), 3)])
+def test_stream_level_matches_oneshot(names, seed):
+    # Seyrek olaylı katman: ilk kalibrasyon penceresi sessiz kalır (seed 2)
+    stream, oneshot = scene(names, seed)
+    
+    assert stream.shape == oneshot.shape
+    assert np.abs(stream).max() == pytest.approx(sampler.MASTER_AMPLITUDE)
+    # Aynı kazançlar; kalan fark rastgele gerçekleşmeden (tek seferlik ile akış farklı çeker)
+    assert abs(rms_db(stream) - rms_db(oneshot)) < 3.0
+
+
+def test_single_pass_stream_limits_instead_of_clipping(monkeypatch):
+    # Sunucu yolu: ön geçiş yok, tahmin aşılırsa limiter devreye girer
+    monkeypatch.setattr(sampler, "STREAM_LEVEL_PREPASS", False)
+    stream, _ = scene(("thunder",), 2)
+    
+    ceiling = sampler.MASTER_AMPLITUDE
+    assert np.abs(stream).max() <= ceiling + 1e-9
+    assert np.mean(np.abs(stream) >= ceiling * 0.999) < 1e-3
+
+
+
+@pytest.mark.parametrize("seed, passes", [(None, 1), (4, 3)])
+def test_prepass_default_only_for_fixed_seed(monkeypatch, seed, passes):
+    # Varsayılan (None): rastgele tohumda tek geçiş, sabit tohumda iki ön geçiş + final
+    monkeypatch.setattr(sampler, "SCENE_SEED", None)
+    calls = []
+    stream_layer = sampler.stream_layer
+    monkeypatch.setattr(sampler, "stream_layer", lambda layer, *args: calls.append(layer["key"]) or stream_layer(layer, *args))
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        stream, _ = scene(("rain",), seed, duration=2, sr=8000)
+    assert calls.count("natural:rain") == passes
+    
+    # Önbellekten: aynı sabit tohum bir daha ön geçiş yapmaz
+    if seed is not None:
+        calls.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            again, _ = scene(("rain",), seed, duration=2, sr=8000)
+        assert calls.count("natural:rain") == 1
+        np.testing.assert_array_equal(again, stream)